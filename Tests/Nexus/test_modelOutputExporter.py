@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2 import btk
+from pyCGM2.Tools import btkTools
+from pyCGM2.Model import frame, model
+from pyCGM2.Nexus import nexusTools, nexusRecorder
+
+
+class _Segment(object):
+    def __init__(self,nFrames,length):
+        self.m_bsp = {"length":length}
+        self.anatomicalFrame = model.AnatomicalReferential()
+        random = np.random.RandomState(0)
+        for i in range(0,nFrames):
+            motion = frame.Frame()
+            motion.update(np.linalg.qr(random.randn(3,3))[0],random.randn(3))
+            self.anatomicalFrame.addMotionFrame(motion)
+
+def _acquisition(nFrames, firstFrame):
+    random = np.random.RandomState(0)
+    acq = btk.btkAcquisition()
+    acq.Init(0,nFrames)
+    acq.SetPointFrequency(100.0)
+    acq.SetFirstFrame(firstFrame)
+    btkTools.smartAppendPoint(acq,"LHJC",random.randn(nFrames,3))
+    btkTools.smartAppendPoint(acq,"LHipAngles",random.randn(nFrames,3),PointType=btk.btkPoint.Angle)
+    btkTools.smartAppendPoint(acq,"LHipMoment",random.randn(nFrames,3),PointType=btk.btkPoint.Moment)
+    return acq
+
+
+class modelOutputExporterTests():
+
+    @classmethod
+    def emptyAcquisition(cls):
+        """ points are appended to an acquisition initialized without points
+        """
+        acq = btk.btkAcquisition()
+        acq.Init(0,20)
+        assert not btkTools.isPointExist(acq,"LHJC")
+
+        btkTools.smartAppendPoint(acq,"LHJC",np.ones((20,3)))
+        assert btkTools.isPointExist(acq,"LHJC")
+        assert not btkTools.isPointExist(acq,"RHJC")
+        assert acq.GetPointNumber() == 1
+
+    @classmethod
+    def trialRange(cls):
+        """ outputs of a cropped acquisition are exported in the frame range of the Nexus trial
+        """
+        acq = _acquisition(50,11)
+        NEXUS = nexusRecorder.ViconNexusRecorder(frameCount=100)
+
+        exporter = nexusTools.ModelOutputExporter(NEXUS,"subject",acq)
+        exporter.appendModelledMarker("LHJC")
+        exporter.appendAngle("LHipAngles")
+        exporter.appendMoment("LHipMoment")
+        assert exporter.export() == 3
+
+        for label in ["LHJC","LHipAngles","LHipMoment"]:
+            data,exists = NEXUS.getModelOutputArrays("subject",label)
+            np.testing.assert_equal(np.where(exists)[0],np.arange(10,60))
+            np.testing.assert_almost_equal(data[:,10:60].T,acq.GetPoint(label).GetValues())
+            np.testing.assert_equal(data[:,~exists],0.0)
+
+        assert NEXUS.m_outputs["subject"]["LHipMoment"]["Types"] == ["Torque","Torque","Torque"]
+        assert NEXUS.getCallNumber("GetModelOutputNames") == 1
+        assert NEXUS.getCallNumber("SetModelOutput") == 3
+
+    @classmethod
+    def existingOutputs(cls):
+        """ existing outputs are not created again
+        """
+        acq = _acquisition(50,1)
+        NEXUS = nexusRecorder.ViconNexusRecorder(frameCount=50)
+
+        nexusTools.appendAngleFromAcq(NEXUS,"subject","LHipAngles",acq)
+
+        exporter = nexusTools.ModelOutputExporter(NEXUS,"subject",acq)
+        exporter.appendAngle("LHipAngles")
+        exporter.appendModelledMarker("LHJC")
+        exporter.export()
+
+        assert NEXUS.getCallNumber("CreateModelOutput") == 1
+        assert NEXUS.getCallNumber("CreateModeledMarker") == 1
+        assert NEXUS.getCallNumber("SetModelOutput") == 3
+
+    @classmethod
+    def bones(cls):
+        """ bones match the frame by frame angle-axis and translation
+        """
+        acq = _acquisition(50,1)
+        segment = _Segment(50,400.0)
+        NEXUS = nexusRecorder.ViconNexusRecorder(frameCount=50)
+
+        exporter = nexusTools.ModelOutputExporter(NEXUS,"subject",acq)
+        exporter.appendBones("LFEMUR",segment)
+        exporter.appendBones("LTOES",segment,OriginValues = acq.GetPoint("LHJC").GetValues(),manualScale = 100.0)
+        exporter.export()
+
+        data,exists = NEXUS.getModelOutputArrays("subject","LFEMUR")
+        assert exists.all()
+        for i in [0,25,49]:
+            motion = segment.anatomicalFrame.motion[i]
+            np.testing.assert_almost_equal(data[0:3,i],motion.getAngleAxis())
+            np.testing.assert_almost_equal(data[3:6,i],motion.getTranslation())
+        np.testing.assert_equal(data[6:9,:],400.0)
+
+        data,exists = NEXUS.getModelOutputArrays("subject","LTOES")
+        np.testing.assert_almost_equal(data[3:6,:].T,acq.GetPoint("LHJC").GetValues())
+        np.testing.assert_equal(data[6:9,:],100.0)
+
+
+if __name__ == "__main__":
+
+    modelOutputExporterTests.emptyAcquisition()
+    modelOutputExporterTests.trialRange()
+    modelOutputExporterTests.existingOutputs()
+    modelOutputExporterTests.bones()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Start-up benchmark of the pyCGM2 Apps.
+
+Each App is a fresh process in Nexus. This script replays the module-level imports
+of every App entry point in a new interpreter and reports the start-up time.
+With python >= 3.7, the `-X importtime` report is parsed to list the costliest modules.
+An import failure stops the benchmark : Apps importing ViconNexus need the Nexus python environment.
+
+usage ::
+
+    python importTimeBenchmark.py [--repeat 5] [--apps Apps\\CGM1] [--json output.json]
+
+"""
+import os
+import sys
+import ast
+import json
+import time
+import argparse
+import subprocess
+
+
+MAIN_PATH = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+
+
+def getAppFiles(appPaths):
+    appFiles = list()
+    for appPath in appPaths:
+        for root,dirs,files in os.walk(appPath):
+            for file in sorted(files):
+                if file[-3:] ==".py":
+                    appFiles.append(os.path.join(root, file))
+    return appFiles
+
+def getModuleImports(filename):
+    """ return the source code of the module-level import statements of a script
+    """
+    source = open(filename).read()
+    tree = ast.parse(source)
+    lines = source.splitlines()
+
+    statements = list()
+    for node in tree.body:
+        if isinstance(node,(ast.Import,ast.ImportFrom)):
+            statements.append(lines[node.lineno-1].strip())
+    return statements
+
+def _importCode(statements):
+    code = ["import time","t0=time.time()"]
+    code.extend(statements)
+    code.append("print(time.time()-t0)")
+    return "\n".join(code)
+
+def _run(command, filename, env):
+    process = subprocess.Popen(command,stdout=subprocess.PIPE,stderr=subprocess.PIPE,env=env)
+    stdout,stderr = process.communicate()
+    if process.returncode != 0:
+        raise Exception("[pyCGM2] imports of the App (%s) failed :\n%s" %(filename,stderr.decode("utf-8","replace")))
+    return stdout,stderr
+
+def _importTimeSupported():
+    return sys.version_info >= (3,7)
+
+def _parseImportTime(stderr, nModules=5):
+    """ return the costliest top-level modules of a -X importtime report ( cumulative time in s)
+    """
+    modules = list()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        name = fields[2].rstrip()
+        if name.startswith(" ") and not name.startswith("  "):
+            modules.append((name.strip(),int(fields[1])*1e-6))
+    modules.sort(key=lambda item: item[1],reverse=True)
+    return modules[0:nModules]
+
+def benchmarkApp(filename, repeat=5):
+    """ return the best start-up time (s) over `repeat` fresh interpreters
+    """
+    code = _importCode(getModuleImports(filename))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = MAIN_PATH + os.pathsep + env.get("PYTHONPATH","")
+
+    times = list()
+    for i in range(0,repeat):
+        t0 = time.time()
+        _run([sys.executable,"-c",code],filename,env)
+        times.append(time.time()-t0)
+
+    out = {"startup": min(times), "modules": []}
+
+    if _importTimeSupported():
+        stdout,stderr = _run([sys.executable,"-X","importtime","-c",code],filename,env)
+        out["modules"] = _parseImportTime(stderr.decode("utf-8","replace"))
+
+    return out
+
+
+def main(args):
+    appPaths = args.apps if args.apps else [MAIN_PATH+os.sep+"Apps"]
+
+    results = dict()
+    for filename in getAppFiles(appPaths):
+        appName = os.path.relpath(filename,MAIN_PATH)
+        results[appName] = benchmarkApp(filename,repeat=args.repeat)
+
+        print("%-60s %8.3f s"%(appName,results[appName]["startup"]))
+        for module,cumulative in results[appName]["modules"]:
+            print("      %-54s %8.3f s"%(module,cumulative))
+
+    if args.json is not None:
+        with open(args.json,"w") as outfile:
+            json.dump(results,outfile,indent=4)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='pyCGM2 Apps start-up benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters per App')
+    parser.add_argument('--apps', nargs='*', help='folders of Apps to benchmark')
+    parser.add_argument('--json', type=str, help='output json file')
+    args = parser.parse_args()
+
+    main(args)
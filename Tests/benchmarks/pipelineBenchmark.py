@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the CGM1 processing pipeline on synthetic trials.
+
+Marker trajectories are generated in memory (see syntheticTrials) with a configurable
+number of frames. Each stage is timed on its own, prerequisites are computed outside the timing:
+calibration, ModelMotionFilter, ModelJCSFilter, InverseDynamicFilter, JointPowerFilter,
+Nexus export ( in-memory recorder of the ViconNexus client), cycle building, analysis statistics and xls export.
+
+.. note:: openma trials are read from c3d. The cycle, analysis and export stages use a trial written once
+    in a temporary folder.
+
+usage with pytest-benchmark ::
+
+    PYCGM2_BENCHMARK_FRAMES=1000 pytest pipelineBenchmark.py --benchmark-autosave --benchmark-compare --benchmark-compare-fail=median:20%
+
+standalone usage ( baselines are stored as json, the script exits with 1 if a stage regresses) ::
+
+    python pipelineBenchmark.py --save              # store the baseline of the machine
+    python pipelineBenchmark.py [--frames 1000] [--repeat 5] [--tolerance 0.2] [--stages motion jcs]
+
+"""
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+import numpy as np
+
+import pyCGM2
+from pyCGM2 import enums
+from pyCGM2.Tools import btkTools,trialTools
+from pyCGM2.Model import modelFilters,bodySegmentParameters
+from pyCGM2.Model.CGM2 import cgm
+from pyCGM2.Processing import cycle,analysis,exporter
+from pyCGM2.Nexus import nexusRecorder
+from pyCGM2.Utils.timer import Timer
+
+import syntheticTrials
+
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)),"baselines","pipelineBenchmark.json")
+NFRAMES = int(os.environ.get("PYCGM2_BENCHMARK_FRAMES",1000))
+ROUNDS = 5
+
+KINEMATIC_LABELS ={ 'Left': ["LHipAngles","LKneeAngles","LAnkleAngles"],
+                    'Right': ["RHipAngles","RKneeAngles","RAnkleAngles"] }
+
+KINETIC_LABELS ={ 'Left': ["LHipMoment","LKneeMoment","LAnkleMoment", "LHipPower","LKneePower","LAnklePower"],
+                  'Right': ["RHipMoment","RKneeMoment","RAnkleMoment", "RHipPower","RKneePower","RAnklePower"]}
+
+# processed trials ( openma) and their temporary folders, by number of frames
+_PROCESSED_TRIALS = dict()
+
+
+# ---- pipeline stages ----
+
+def calibrate(acqStatic):
+    model=cgm.CGM1()
+    model.configure(bodyPart=enums.BodyPart.LowerLimb)
+    model.addAnthropoInputParameters(syntheticTrials.MP)
+
+    scp=modelFilters.StaticCalibrationProcedure(model)
+    modelFilters.ModelCalibrationFilter(scp,acqStatic,model).compute()
+    return model
+
+def motion(model,acqGait):
+    scp=modelFilters.StaticCalibrationProcedure(model)
+    modelFilters.ModelMotionFilter(scp,acqGait,model,enums.motionMethod.Determinist).compute()
+
+def jointAngles(model,acqGait):
+    modelFilters.ModelJCSFilter(model,acqGait).compute(description="vectoriel")
+
+def inverseDynamics(model,acqGait):
+    idp = modelFilters.CGMLowerlimbInverseDynamicProcedure()
+    modelFilters.InverseDynamicFilter(model,acqGait,
+                                      procedure = idp,
+                                      projection = enums.MomentProjection.Distal).compute()
+
+def jointPower(model,acqGait):
+    modelFilters.JointPowerFilter(model,acqGait).compute()
+
+def viconExport(model,acqGait):
+    NEXUS = nexusRecorder.ViconNexusRecorder(frameCount=acqGait.GetPointFrameNumber())
+    model.viconExport(NEXUS,acqGait,"benchmark",None,False)
+
+def buildCycles(trial):
+    cycleBuilder = cycle.GaitCyclesBuilder(spatioTemporalTrials=[trial],
+                                           kinematicTrials = [trial],
+                                           kineticTrials = [trial],
+                                           emgTrials=None)
+    cyclefilter = cycle.CyclesFilter()
+    cyclefilter.setBuilder(cycleBuilder)
+    return cyclefilter.build()
+
+def buildAnalysis(cycles):
+    analysisBuilder = analysis.GaitAnalysisBuilder(cycles,
+                                                   kinematicLabelsDict = KINEMATIC_LABELS,
+                                                   kineticLabelsDict = KINETIC_LABELS)
+    analysisFilter = analysis.AnalysisFilter()
+    analysisFilter.setBuilder(analysisBuilder)
+    analysisFilter.build()
+    return analysisFilter.analysis
+
+def export(analysisInstance,path):
+    xlsExport = exporter.XlsAnalysisExportFilter()
+    xlsExport.setAnalysisInstance(analysisInstance)
+    xlsExport.export("pipelineBenchmark", path=path, mode="Advanced")
+
+
+# ---- prerequisites ( not timed) ----
+
+def _modelledGait(nFrames, stages):
+    model = calibrate(syntheticTrials.staticAcquisition())
+    acqGait = syntheticTrials.gaitAcquisition(nFrames)
+
+    if "motion" in stages:
+        motion(model,acqGait)
+    if "jcs" in stages:
+        jointAngles(model,acqGait)
+    if "kinetics" in stages:
+        bodySegmentParameters.Bsp(model).compute()
+        syntheticTrials.connectFootWrenchs(model,acqGait)
+    if "inverseDynamics" in stages:
+        inverseDynamics(model,acqGait)
+    if "jointPower" in stages:
+        jointPower(model,acqGait)
+
+    return model,acqGait
+
+def processedTrial(nFrames):
+    """ openma trial of a fully processed synthetic gait trial
+    """
+    if nFrames not in _PROCESSED_TRIALS:
+        model,acqGait = _modelledGait(nFrames,["motion","jcs","kinetics","inverseDynamics","jointPower"])
+        path = tempfile.mkdtemp(prefix="pyCGM2-benchmark-")
+        btkTools.smartWriter(acqGait,str(os.path.join(path,"gait.c3d")))
+        _PROCESSED_TRIALS[nFrames] = (trialTools.smartTrialReader(None,str(os.path.join(path,"gait.c3d"))),path)
+
+    return _PROCESSED_TRIALS[nFrames][0]
+
+def clearProcessedTrials():
+    for trial,path in _PROCESSED_TRIALS.values():
+        shutil.rmtree(path,ignore_errors=True)
+    _PROCESSED_TRIALS.clear()
+
+def _setupCalibration(nFrames):
+    return (syntheticTrials.staticAcquisition(),)
+
+def _setupMotion(nFrames):
+    return _modelledGait(nFrames,[])
+
+def _setupJointAngles(nFrames):
+    return _modelledGait(nFrames,["motion"])
+
+def _setupInverseDynamics(nFrames):
+    return _modelledGait(nFrames,["motion","kinetics"])
+
+def _setupJointPower(nFrames):
+    return _modelledGait(nFrames,["motion","kinetics","inverseDynamics"])
+
+def _setupViconExport(nFrames):
+    return _modelledGait(nFrames,["motion","jcs","kinetics","inverseDynamics","jointPower"])
+
+def _setupCycles(nFrames):
+    return (processedTrial(nFrames),)
+
+def _setupAnalysis(nFrames):
+    return (buildCycles(processedTrial(nFrames)),)
+
+def _setupExport(nFrames):
+    return (buildAnalysis(buildCycles(processedTrial(nFrames))),
+            _PROCESSED_TRIALS[nFrames][1])
+
+STAGES = [
+    ("calibration", _setupCalibration, calibrate),
+    ("motion", _setupMotion, motion),
+    ("jcs", _setupJointAngles, jointAngles),
+    ("inverseDynamics", _setupInverseDynamics, inverseDynamics),
+    ("jointPower", _setupJointPower, jointPower),
+    ("viconExport", _setupViconExport, viconExport),
+    ("cycles", _setupCycles, buildCycles),
+    ("analysis", _setupAnalysis, buildAnalysis),
+    ("export", _setupExport, export),
+    ]
+
+
+# ---- pytest-benchmark ----
+
+def _pedantic(benchmark,stageLabel):
+    setup,function = [(it[1],it[2]) for it in STAGES if it[0]==stageLabel][0]
+    benchmark.extra_info["frames"] = NFRAMES
+    benchmark.pedantic(function, setup=lambda: (setup(NFRAMES),{}), rounds=ROUNDS)
+
+def test_calibration(benchmark):
+    _pedantic(benchmark,"calibration")
+
+def test_motion(benchmark):
+    _pedantic(benchmark,"motion")
+
+def test_jcs(benchmark):
+    _pedantic(benchmark,"jcs")
+
+def test_inverseDynamics(benchmark):
+    _pedantic(benchmark,"inverseDynamics")
+
+def test_jointPower(benchmark):
+    _pedantic(benchmark,"jointPower")
+
+def test_viconExport(benchmark):
+    _pedantic(benchmark,"viconExport")
+
+def test_cycles(benchmark):
+    _pedantic(benchmark,"cycles")
+
+def test_analysis(benchmark):
+    _pedantic(benchmark,"analysis")
+
+def test_export(benchmark):
+    _pedantic(benchmark,"export")
+
+
+# ---- standalone runner ----
+
+def timeStage(stageLabel, nFrames, repeat=ROUNDS):
+    """ median elapsed time (s) of a stage
+    """
+    setup,function = [(it[1],it[2]) for it in STAGES if it[0]==stageLabel][0]
+    elapsed = list()
+    for i in range(0,repeat):
+        args = setup(nFrames)
+        with Timer(verbose=False) as t:
+            function(*args)
+        elapsed.append(t.elapsed)
+    return np.median(elapsed)
+
+def loadBaselines(filename):
+    if os.path.isfile(filename):
+        with open(filename) as f:
+            return json.load(f)
+    return dict()
+
+def compareToBaselines(results, baselines, tolerance):
+    """ return the list of regressions as (key, elapsed, baseline)
+    """
+    regressions = list()
+    for key,elapsed in sorted(results.items()):
+        if key in baselines and elapsed > baselines[key]*(1.0+tolerance):
+            regressions.append((key,elapsed,baselines[key]))
+    return regressions
+
+def main(args):
+    stages = args.stages if args.stages is not None else [it[0] for it in STAGES]
+
+    results = dict()
+    try:
+        for stageLabel in stages:
+            key = "%s-%i" %(stageLabel,args.frames)
+            results[key] = timeStage(stageLabel,args.frames,repeat=args.repeat)
+            print("%-30s %.4f s" %(key,results[key]))
+    finally:
+        clearProcessedTrials()
+
+    baselines = loadBaselines(args.baseline)
+    if args.save:
+        baselines.update(results)
+        if not os.path.isdir(os.path.dirname(args.baseline)):
+            os.makedirs(os.path.dirname(args.baseline))
+        with open(args.baseline,"w") as f:
+            json.dump(baselines,f,indent=2,sort_keys=True)
+        logging.info("[pyCGM2] baselines saved in %s" %(args.baseline))
+        return 0
+
+    if baselines == dict():
+        logging.warning("[pyCGM2] no baseline found (%s). Run with --save first" %(args.baseline))
+        return 0
+
+    regressions = compareToBaselines(results,baselines,args.tolerance)
+    for key,elapsed,baseline in regressions:
+        logging.error("[pyCGM2] regression of %s : %.4f s (baseline %.4f s)" %(key,elapsed,baseline))
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='pyCGM2 pipeline benchmark')
+    parser.add_argument('--frames', type=int, default=NFRAMES, help='number of frames of the synthetic gait trial')
+    parser.add_argument('--repeat', type=int, default=ROUNDS, help='number of runs of each stage')
+    parser.add_argument('--stages', nargs='+', help='stages to benchmark')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='accepted slowdown ratio before failure')
+    parser.add_argument('--baseline', type=str, default=BASELINE_FILENAME, help='json file of the baselines')
+    parser.add_argument('--save', action='store_true', help='store the results as baselines')
+    args = parser.parse_args()
+
+    sys.exit(main(args))
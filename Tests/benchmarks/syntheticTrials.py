@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory synthetic CGM1 trials for benchmarking.
+
+Marker trajectories are generated from a planar lower limb chain (hip, knee and ankle
+flexion about the medio-lateral axis) carried by a pelvis walking along the global X axis.
+Trials have a configurable number of frames, gait events and  force plate general events.
+Ground reaction wrenches are built at the point rate and can be connected directly to
+the foot segments ( no force plate metadata needed).
+
+"""
+import numpy as np
+
+from pyCGM2 import btk
+
+
+POINT_FREQUENCY = 100.0
+GAIT_CYCLE_DURATION = 1.1 # s
+STANCE_RATIO = 0.6
+WALKING_SPEED = 1200.0 # mm/s
+
+MP={
+    'Bodymass'   : 71.0,
+    'LeftLegLength' : 860.0,
+    'RightLegLength' : 860.0 ,
+    'LeftKneeWidth' : 100.0,
+    'RightKneeWidth' : 100.0,
+    'LeftAnkleWidth' : 70.0,
+    'RightAnkleWidth' : 70.0,
+    'LeftSoleDelta' : 0,
+    'RightSoleDelta' : 0,
+    }
+
+# standing posture (mm) - X forward, Y left, Z up. Right side is the mirror of the left side
+LEFT_STANDING_MARKERS = {
+    "LASI" : [0.0, 120.0, 950.0],
+    "LPSI" : [-160.0, 50.0, 980.0],
+    "LTHI" : [30.0, 150.0, 680.0],
+    "LKNE" : [0.0, 140.0, 480.0],
+    "LTIB" : [30.0, 140.0, 290.0],
+    "LANK" : [0.0, 135.0, 90.0],
+    "LHEE" : [-70.0, 95.0, 45.0],
+    "LTOE" : [140.0, 100.0, 40.0],
+    }
+
+LEFT_JOINT_CENTRES = {
+    "Hip" : [-40.0, 85.0, 880.0],
+    "Knee" : [0.0, 90.0, 480.0],
+    "Ankle" : [0.0, 95.0, 90.0],
+    }
+
+SEGMENT_MARKERS = {
+    "Thigh" : ["THI","KNE"],
+    "Shank" : ["TIB","ANK"],
+    "Foot" : ["HEE","TOE"],
+    }
+
+
+def _mirror(position):
+    return [position[0],-position[1],position[2]]
+
+def standingMarkers():
+    """ return the standing posture as a dictionnary  label : numpy.array(3,)
+    """
+    markers = dict()
+    for label,position in LEFT_STANDING_MARKERS.items():
+        markers[label] = np.array(position)
+        markers["R"+label[1:]] = np.array(_mirror(position))
+    return markers
+
+def _rotationY(angles):
+    """ stacked rotations about the Y axis ( angles in radians) - numpy.array(n,3,3)
+    """
+    c = np.cos(angles)
+    s = np.sin(angles)
+    R = np.zeros((angles.shape[0],3,3))
+    R[:,0,0] = c
+    R[:,0,2] = s
+    R[:,1,1] = 1.0
+    R[:,2,0] = -s
+    R[:,2,2] = c
+    return R
+
+def _rotateAbout(trajectories, centre, angles):
+    R = _rotationY(angles)
+    return np.einsum("nij,nj->ni",R,trajectories-centre)+centre
+
+def jointAngles(nFrames, pointFrequency=POINT_FREQUENCY, phaseShift=0.0):
+    """ hip, knee and ankle flexion (deg) of one side
+    """
+    time = np.arange(nFrames)/pointFrequency
+    phi = 2.0*np.pi*time/GAIT_CYCLE_DURATION + phaseShift
+
+    hip = 10.0 + 25.0*np.cos(phi)
+    knee = 30.0 - 25.0*np.cos(phi-0.6)
+    ankle = 5.0*np.sin(phi)
+    return hip,knee,ankle
+
+def gaitMarkers(nFrames, pointFrequency=POINT_FREQUENCY):
+    """ marker trajectories of a walking trial - dictionnary label : numpy.array(nFrames,3)
+    """
+    standing = standingMarkers()
+    time = np.arange(nFrames)/pointFrequency
+    phi = 2.0*np.pi*time/GAIT_CYCLE_DURATION
+
+    pelvis = np.zeros((nFrames,3))
+    pelvis[:,0] = WALKING_SPEED*time
+    pelvis[:,2] = 10.0*np.cos(2.0*phi)
+
+    markers = dict()
+    for side,prefix,shift in [("Left","L",0.0),("Right","R",np.pi)]:
+        hip,knee,ankle = [np.deg2rad(it) for it in jointAngles(nFrames,pointFrequency=pointFrequency,phaseShift=shift)]
+        centres = dict()
+        for label,position in LEFT_JOINT_CENTRES.items():
+            centres[label] = np.array(position) if side=="Left" else np.array(_mirror(position))
+
+        trajectories = dict()
+        for segment in ["Thigh","Shank","Foot"]:
+            for suffix in SEGMENT_MARKERS[segment]:
+                trajectories[prefix+suffix] = np.tile(standing[prefix+suffix],(nFrames,1))
+
+        # distal to proximal rotations about the static joint centres
+        for label in [prefix+it for it in SEGMENT_MARKERS["Foot"]]:
+            trajectories[label] = _rotateAbout(trajectories[label],centres["Ankle"],-ankle)
+        for label in [prefix+it for it in SEGMENT_MARKERS["Foot"]+SEGMENT_MARKERS["Shank"]]:
+            trajectories[label] = _rotateAbout(trajectories[label],centres["Knee"],knee)
+        for label in [prefix+it for it in SEGMENT_MARKERS["Foot"]+SEGMENT_MARKERS["Shank"]+SEGMENT_MARKERS["Thigh"]]:
+            trajectories[label] = _rotateAbout(trajectories[label],centres["Hip"],-hip)
+
+        for label in ["ASI","PSI"]:
+            trajectories[prefix+label] = np.tile(standing[prefix+label],(nFrames,1))
+
+        for label in trajectories.keys():
+            markers[label] = trajectories[label] + pelvis
+
+    return markers
+
+def gaitEvents(nFrames, pointFrequency=POINT_FREQUENCY):
+    """ foot strike, foot off and force plate general events as a list of (label, context, time)
+    """
+    duration = nFrames/pointFrequency
+    events = list()
+    for context,offset in [("Left",0.0),("Right",0.5*GAIT_CYCLE_DURATION)]:
+        strike = offset
+        while strike < duration:
+            events.append(("Foot Strike",context,strike))
+            if strike+STANCE_RATIO*GAIT_CYCLE_DURATION < duration:
+                events.append(("Foot Off",context,strike+STANCE_RATIO*GAIT_CYCLE_DURATION))
+            if strike+0.5*STANCE_RATIO*GAIT_CYCLE_DURATION < duration:
+                events.append((context+"-FP","General",strike+0.5*STANCE_RATIO*GAIT_CYCLE_DURATION))
+            strike+=GAIT_CYCLE_DURATION
+    return events
+
+def buildAcquisition(markers, pointFrequency=POINT_FREQUENCY, events=None):
+    """ construct a btk acquisition from a marker dictionnary
+    """
+    nFrames = markers.values()[0].shape[0]
+
+    labels = sorted(markers.keys())
+    acq = btk.btkAcquisition()
+    acq.Init(len(labels),nFrames)
+    acq.SetPointFrequency(pointFrequency)
+
+    for i,label in enumerate(labels):
+        point = acq.GetPoint(i)
+        point.SetLabel(label)
+        point.SetValues(markers[label])
+        point.SetResiduals(np.zeros(nFrames))
+
+    if events is not None:
+        for label,context,time in events:
+            if context == "General":
+                ev = btk.btkEvent(label, time, context, btk.btkEvent.Automatic, '', 'event from Force plate assignment')
+            else:
+                ev = btk.btkEvent(label, time, context, btk.btkEvent.Manual, '', 'synthetic')
+                ev.SetId(1 if label == "Foot Strike" else 2)
+            acq.AppendEvent(ev)
+
+    return acq
+
+def staticAcquisition(nFrames=50, noise=0.1, seed=0):
+    """ static trial - standing posture with a small deterministic noise
+    """
+    random = np.random.RandomState(seed)
+    markers = dict()
+    standing = standingMarkers()
+    for label in sorted(standing.keys()):
+        markers[label] = standing[label] + noise*random.randn(nFrames,3)
+    return buildAcquisition(markers)
+
+def gaitAcquisition(nFrames=1000, pointFrequency=POINT_FREQUENCY):
+    """ walking trial with gait and force plate events
+    """
+    return buildAcquisition(gaitMarkers(nFrames,pointFrequency=pointFrequency),
+                            pointFrequency=pointFrequency,
+                            events=gaitEvents(nFrames,pointFrequency=pointFrequency))
+
+def footWrenchs(acq, bodymass=MP["Bodymass"]):
+    """ ground reaction force, moment and centre of pressure of both feet at the point rate
+
+        :Return:
+            - `wrenchs` (dict) - context : (force, moment, position) numpy.array(n,3)
+    """
+    nFrames = acq.GetPointFrameNumber()
+    pf = acq.GetPointFrequency()
+    time = np.arange(nFrames)/pf
+
+    wrenchs = dict()
+    for context,prefix,offset in [("Left","L",0.0),("Right","R",0.5*GAIT_CYCLE_DURATION)]:
+        cycleTime = np.mod(time-offset,GAIT_CYCLE_DURATION)
+        stance = np.logical_and(time>=offset, cycleTime<=STANCE_RATIO*GAIT_CYCLE_DURATION)
+        ratio = cycleTime/(STANCE_RATIO*GAIT_CYCLE_DURATION)
+
+        force = np.zeros((nFrames,3))
+        force[:,2] = bodymass*9.81*(np.sin(np.pi*ratio) + 0.15*np.sin(3.0*np.pi*ratio))
+        force[:,0] = 0.2*bodymass*9.81*np.sin(2.0*np.pi*ratio)
+        force[~stance,:] = 0.0
+
+        heel = acq.GetPoint(prefix+"HEE").GetValues()
+        toe = acq.GetPoint(prefix+"TOE").GetValues()
+        position = heel + (toe-heel)*ratio.reshape(nFrames,1)
+        position[:,2] = 0.0
+        position[~stance,:] = 0.0
+
+        wrenchs[context] = (force,np.zeros((nFrames,3)),position)
+
+    return wrenchs
+
+def connectFootWrenchs(model, acq, leftSegmentLabel="Left Foot", rightSegmentLabel="Right Foot"):
+    """ connect the synthetic ground reaction wrenchs to the foot segments of a model
+    """
+    nFrames = acq.GetPointFrameNumber()
+    wrenchs = footWrenchs(acq,bodymass=model.mp["Bodymass"])
+    for context,segmentLabel in [("Left",leftSegmentLabel),("Right",rightSegmentLabel)]:
+        force,moment,position = wrenchs[context]
+
+        wrench = btk.btkWrench()
+        for values,setter in [(force,wrench.SetForce),(moment,wrench.SetMoment),(position,wrench.SetPosition)]:
+            point = btk.btkPoint(nFrames)
+            point.SetValues(values)
+            setter(point)
+
+        model.getSegment(segmentLabel).zeroingExternalDevice()
+        model.getSegment(segmentLabel).addExternalDeviceWrench(wrench)
@@ -2,6 +2,7 @@
 
 
 import logging
+import numpy as np
 import matplotlib.pyplot as plt
 
 import pyCGM2
@@ -12,6 +13,7 @@ from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
 from pyCGM2.Tools import  btkTools
 from pyCGM2.ForcePlates import forceplates
 from pyCGM2.Events import events
+from pyCGM2.Signal import detect_peaks
 
 
 
@@ -33,8 +35,79 @@ class test_Zeni():
 
         btkTools.smartWriter("testEvent0.c3d", acq)
 
+    @classmethod
+    def stackedPeaks(cls):
+        """ stacked peak detection matches detect_peaks on each signal
+        """
+        random = np.random.RandomState(0)
+        signals = random.randn(500,4)
+        signals[50:60,1] = np.nan
+        signals[100:103,3] = 1.0
+
+        indexes = events.detectStackedPeaks(signals)
+        for i in range(0,4):
+            np.testing.assert_equal(indexes[i],detect_peaks.detect_peaks(signals[:,i]))
+
+    @classmethod
+    def batchDetection(cls):
+        """ batch detection in worker processes matches the detection of each acquisition
+        """
+        MAIN_PATH = pyCGM2.TEST_DATA_PATH + "operations\\event detection\\events\\"
+        gaitFilename="gait-noEvents.c3d"
+
+        acqs = [btkTools.smartReader(str(MAIN_PATH +  gaitFilename)) for i in range(0,4)]
+
+        evp = events.ZeniProcedure()
+        eventIndexes = events.BatchEventFilter(evp,acqs).detect(nProcesses=2)
+
+        acq = btkTools.smartReader(str(MAIN_PATH +  gaitFilename))
+        expected = evp.detect(acq)
+        for i in range(0,4):
+            for it,ref in zip(eventIndexes[i],expected):
+                np.testing.assert_equal(it,ref)
+            assert acqs[i].GetEventNumber() == sum([len(it) for it in expected])
+
+
+class test_ForcePlateEvents():
+
+    @classmethod
+    def hysteresis(cls):
+        """ loaded states switch at the high threshold and release at the low threshold
+        """
+        values = np.array([[0,15,25,15,12,8,15,30,5],
+                           [30,30,15,5,5,25,25,9,9]],dtype=float)
+
+        states = forceplates.hysteresisStates(values,20.0,10.0)
+        np.testing.assert_array_equal(states[0],[0,0,1,1,1,0,0,1,0])
+        np.testing.assert_array_equal(states[1],[1,1,1,0,0,1,1,0,0])
+
+    @classmethod
+    def detection(cls):
+        """ foot strikes and foot offs on three force plates ( right, left, right)
+        """
+        MAIN_PATH = pyCGM2.TEST_DATA_PATH + "operations\\forceplates\\detectFoot\\"
+        gaitFilename="walking_Y_3pf.c3d"
+        acq = btkTools.smartReader(str(MAIN_PATH +  gaitFilename))
+        acq.ClearEvents()
+
+        evp = events.ForcePlateEventProcedure()
+        indexes_fs_left,indexes_fo_left,indexes_fs_right,indexes_fo_right = evp.detect(acq)
+
+        np.testing.assert_equal(len(indexes_fs_left),1)
+        np.testing.assert_equal(len(indexes_fs_right),2)
+        np.testing.assert_equal(np.all(indexes_fo_right>indexes_fs_right[0]),True)
+
+        evf = events.EventFilter(evp,acq)
+        evf.detect()
+        np.testing.assert_equal(acq.GetEventNumber(),len(indexes_fs_left)+len(indexes_fo_left)+len(indexes_fs_right)+len(indexes_fo_right))
+
 
 if __name__ == "__main__":
     plt.close("all")
 
     test_Zeni.detection()
+    test_Zeni.stackedPeaks()
+    test_Zeni.batchDetection()
+
+    test_ForcePlateEvents.hysteresis()
+    test_ForcePlateEvents.detection()
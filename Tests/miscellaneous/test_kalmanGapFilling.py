@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2 import btk
+from pyCGM2.Tools import btkTools
+from pyCGM2.Signal import gapFilling
+
+
+def _trajectories(nFrames=1000,nMarkers=12):
+    # markers of a rigid chain : low dimensional trajectories
+    random = np.random.RandomState(0)
+    time = np.arange(0,nFrames)/100.0
+    sources = np.array([np.sin(2*np.pi*time),np.cos(2*np.pi*time),np.sin(4*np.pi*time),time]).T
+    mixing = random.randn(4,3*nMarkers)*100.0
+    return np.dot(sources,mixing) + random.randn(nFrames,3*nMarkers)*0.1
+
+def _gaps(values):
+    raw = np.copy(values)
+    raw[300:340,0:3] = np.nan
+    raw[600:620,9:12] = np.nan
+    raw[610:650,15:18] = np.nan
+    return raw
+
+
+class kalmanGapFillingTests():
+
+    @classmethod
+    def smooth(cls):
+        """ gaps are filled, measured values are kept
+        """
+        truth = _trajectories()
+        raw = _gaps(truth)
+        gaps = np.isnan(raw)
+
+        filled = gapFilling.smooth(raw,tol=1e-3)
+
+        assert not np.isnan(filled).any()
+        np.testing.assert_equal(filled[~gaps],raw[~gaps])
+        assert np.abs(filled-truth)[gaps].max() < 5.0
+
+        # deterministic
+        np.testing.assert_equal(gapFilling.smooth(raw,tol=1e-3),filled)
+
+    @classmethod
+    def windowed(cls):
+        """ smoothing around the gaps only matches the smoothing of the whole trial
+        """
+        truth = _trajectories()
+        raw = _gaps(truth)
+        gaps = np.isnan(raw)
+
+        np.testing.assert_equal(gapFilling.getGapRuns(raw),[[300,340],[600,650]])
+
+        filled = gapFilling.smooth(raw,tol=1e-3)
+        windowed = gapFilling.smooth(raw,tol=1e-3,window=50)
+        np.testing.assert_almost_equal(windowed[gaps],filled[gaps],decimal=3)
+        np.testing.assert_equal(windowed[0:250],raw[0:250])
+
+    @classmethod
+    def acquisition(cls):
+        """ filled markers get null residuals
+        """
+        truth = _trajectories(nMarkers=6)
+        raw = _gaps(truth)
+
+        labels = ["M%i"%(i) for i in range(0,6)]
+        acq = btk.btkAcquisition()
+        acq.Init(len(labels),raw.shape[0])
+        acq.SetPointFrequency(100.0)
+        for i,label in enumerate(labels):
+            values = raw[:,3*i:3*i+3]
+            point = acq.GetPoint(i)
+            point.SetLabel(label)
+            point.SetValues(np.nan_to_num(values))
+            point.SetResiduals(np.where(np.isnan(values).any(axis=1),-1.0,0.0))
+
+        filledLabels = gapFilling.fillAcquisitionGaps(acq,labels+["NOTEXIST"],tol=1e-3)
+
+        assert filledLabels == ["M0","M3","M5"]
+        assert btkTools.getValidFrameMask(acq,labels).all()
+        np.testing.assert_almost_equal(acq.GetPoint("M1").GetValues(),truth[:,3:6])
+        assert np.abs(acq.GetPoint("M0").GetValues()[300:340]-truth[300:340,0:3]).max() < 5.0
+
+
+if __name__ == "__main__":
+
+    kalmanGapFillingTests.smooth()
+    kalmanGapFillingTests.windowed()
+    kalmanGapFillingTests.acquisition()
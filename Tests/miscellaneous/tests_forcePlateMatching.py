@@ -13,7 +13,7 @@ from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
 
 # pyCGM2
 from pyCGM2.Tools import  btkTools
-from pyCGM2.ForcePlates import forceplates
+from pyCGM2.ForcePlates import forceplates,groundReactionWrenchs
 
 import numpy as np
 
@@ -183,6 +183,80 @@ class test_manualAssigment():
         assignedMappedForcePlate4 = forceplates.matchingFootSideOnForceplate(acqGait,mfpa="AXAXXX")
         np.testing.assert_string_equal(assignedMappedForcePlate4,"RXR")
 
+class test_groundReactionWrenchs():
+    @classmethod
+    def cache(cls):
+
+        MAIN_PATH = pyCGM2.TEST_DATA_PATH + "operations\\forceplates\\detectFoot\\"
+
+        gaitFilename="walking_Y_3pf.c3d"
+        acqGait = btkTools.smartReader(str(MAIN_PATH +  gaitFilename))
+
+        grws = groundReactionWrenchs.getGroundReactionWrenchs(acqGait)
+        np.testing.assert_equal(grws is groundReactionWrenchs.getGroundReactionWrenchs(acqGait),True)
+        np.testing.assert_equal(grws.getNumberOfForcePlates(),3)
+
+        appf = acqGait.GetNumberAnalogSamplePerFrame()
+        for i in range(0,grws.getNumberOfForcePlates()):
+            force,moment,position = grws.getPointWrench(i)
+            np.testing.assert_equal(force.shape[0],acqGait.GetPointFrameNumber())
+
+            analogForce = grws.getAnalogWrench(i)[0]
+            np.testing.assert_array_almost_equal(position,grws.getAnalogWrench(i)[2][::appf])
+            np.testing.assert_allclose(force[:,2].max(),analogForce[::appf,2].max(),rtol=0.05)
+
+        mappedForcePlate = forceplates.matchingFootSideOnForceplate(acqGait)
+        np.testing.assert_equal(grws is groundReactionWrenchs.getGroundReactionWrenchs(acqGait),True)
+
+        groundReactionWrenchs.clearGroundReactionWrenchs(acqGait)
+        np.testing.assert_equal(grws is groundReactionWrenchs.getGroundReactionWrenchs(acqGait),False)
+
+    @classmethod
+    def decimation(cls):
+        """ decimation keeps the wrench equivalent and matches the sampled wrench for a slow signal
+        """
+        appf = 10
+        time = np.arange(0,2000)/1000.0
+        force = np.array([10.0*np.sin(2*np.pi*time), 5.0*np.cos(2*np.pi*time), 700.0+50.0*np.sin(4*np.pi*time)]).T
+        position = np.array([100.0+200.0*time, 300.0+np.zeros(time.shape[0]), np.zeros(time.shape[0])]).T
+        moment = np.zeros((time.shape[0],3))
+        moment[:,2] = 2000.0*np.sin(2*np.pi*time)
+
+        force_ds,moment_ds,position_ds = groundReactionWrenchs.decimateWrench(force,moment,position,appf,numberOfFrames=200)
+
+        np.testing.assert_equal(force_ds.shape,(200,3))
+        np.testing.assert_array_almost_equal(position_ds,position[::appf])
+        np.testing.assert_allclose(force_ds[10:-10],force[::appf][10:-10],atol=0.01)
+        np.testing.assert_allclose(moment_ds[10:-10],moment[::appf][10:-10],atol=0.5)
+
+class test_contacts():
+    @classmethod
+    def threePF(cls):
+
+        MAIN_PATH = pyCGM2.TEST_DATA_PATH + "operations\\forceplates\\detectFoot\\"
+
+        gaitFilename="walking_Y_3pf.c3d"
+        acqGait = btkTools.smartReader(str(MAIN_PATH +  gaitFilename))
+
+        contacts = forceplates.detectForcePlateContacts(acqGait)
+        np.testing.assert_equal(len(contacts),3)
+
+        for contact,side in zip(contacts,["Right","Left","Right"]):
+            np.testing.assert_equal(contact["Intervals"].shape[0]>0,True)
+            np.testing.assert_equal(np.all(contact[side]),True)
+
+    @classmethod
+    def engine(cls):
+
+        intervals = forceplates.runIntervals(np.array([0,1,1,0,0,1,0,1,1,1],dtype=bool))
+        np.testing.assert_array_equal(intervals,[[1,2],[5,5],[7,9]])
+        np.testing.assert_equal(forceplates.runIntervals(np.zeros(5,dtype=bool)).shape,(0,2))
+
+        corners = np.array([[0.0,0.0,0.0],[0.0,600.0,0.0],[400.0,600.0,0.0],[400.0,0.0,0.0]])
+        points = np.array([[200.0,300.0],[-10.0,300.0],[200.0,610.0],[399.0,1.0]])
+        np.testing.assert_array_equal(forceplates.pointsInQuadrilateral(points,corners),[True,False,False,True])
+        np.testing.assert_array_equal(forceplates.pointsInQuadrilateral(points,corners[::-1]),[True,False,False,True])
+
 
 if __name__ == "__main__":
     plt.close("all")
@@ -200,3 +274,11 @@ if __name__ == "__main__":
     test_manualAssigment.threePF_wrongAssigmenent()
     test_manualAssigment.threePF_assigmenentCases()
     test_manualAssigment.threePF_mfpaSupNumberForcePlates()
+
+    logging.info("######## WRENCH CACHE ######")
+    test_groundReactionWrenchs.cache()
+    test_groundReactionWrenchs.decimation()
+
+    logging.info("######## CONTACTS ######")
+    test_contacts.threePF()
+    test_contacts.engine()
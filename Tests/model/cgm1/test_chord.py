@@ -37,8 +37,35 @@ class chordTests():
         import ipdb
         ipdb.set_trace()
 
+    @classmethod
+    def trajectory_test(cls):
+        """ the chord of a trajectory matches the frame by frame chord
+        """
+        offset = 67.0
+        beta = -8.006
+
+        random = np.random.RandomState(0)
+        pt1 = random.randn(500,3)*20.0 + [0.0,100.0,480.0]
+        pt2 = random.randn(500,3)*20.0 + [0.0,90.0,880.0]
+        pt3 = random.randn(500,3)*20.0 + [30.0,250.0,680.0]
+
+        with timer.Timer("trajectory"):
+            values = modelDecorator.chord (offset,pt1,pt2,pt3,beta=beta)
+
+        for i in [0,250,499]:
+            np.testing.assert_almost_equal( values[i,:],
+                                            modelDecorator.chord (offset,pt1[i,:],pt2[i,:],pt3[i,:],beta=beta),
+                                            decimal = 8)
+
+        # static top point
+        values = modelDecorator.chord (offset,pt1,pt2.mean(axis=0),pt3,beta=0.0)
+        np.testing.assert_almost_equal( values[10,:],
+                                        modelDecorator.chord (offset,pt1[10,:],pt2.mean(axis=0),pt3[10,:],beta=0.0),
+                                        decimal = 8)
+
 
 if __name__ == "__main__":
     chordTests.test0()
+    chordTests.trajectory_test()
 
     #FraserAcq.test1()
@@ -17,6 +17,7 @@ from pyCGM2 import enums
 from pyCGM2.Math import numeric
 from pyCGM2.Model.Opensim import opensimFilters
 import json
+import tempfile
 from collections import OrderedDict
 
 class CGM2_3_Tests():
@@ -248,8 +249,106 @@ class CGM2_3_Tests():
 
         btkTools.smartWriter(acqIK,"cgm23_fullIK_Motion.c3d")
 
+    @classmethod
+    def batch_IK(cls):
+
+        MAIN_PATH = pyCGM2.TEST_DATA_PATH + "CGM2\\cgm2.3\\fullBody\\"
+        staticFilename = "PN01OP01S01STAT.c3d"
+        gaitFilename= "PN01OP01S01SS01.c3d"
+
+        markerDiameter=14
+        mp={
+        'Bodymass'   : 83.0,
+        'LeftLegLength' : 874.0,
+        'RightLegLength' : 876.0 ,
+        'LeftKneeWidth' : 106.0,
+        'RightKneeWidth' : 103.0,
+        'LeftAnkleWidth' : 74.0,
+        'RightAnkleWidth' : 72.0,
+        'LeftSoleDelta' : 0,
+        'RightSoleDelta' : 0,
+        }
+
+
+        # --- Calibration ---
+        acqStatic = btkTools.smartReader(str(MAIN_PATH +  staticFilename))
+        translators = files.getTranslators(MAIN_PATH,"CGM2_3.translators")
+        acqStatic =  btkTools.applyTranslators(acqStatic,translators)
+
+        model=cgm2.CGM2_3()()
+        model.configure()
+
+        model.addAnthropoInputParameters(mp)
+
+        # ---- Calibration ----
+
+        scp=modelFilters.StaticCalibrationProcedure(model)
+        modelFilters.ModelCalibrationFilter(scp,acqStatic,model).compute()
+
+        # cgm decorator
+        modelDecorator.HipJointCenterDecorator(model).hara()
+        modelDecorator.KneeCalibrationDecorator(model).midCondyles(acqStatic, markerDiameter=markerDiameter, side="both")
+        modelDecorator.AnkleCalibrationDecorator(model).midMaleolus(acqStatic, markerDiameter=markerDiameter, side="both")
+
+        # final
+        modelFilters.ModelCalibrationFilter(scp,acqStatic,model,
+                           markerDiameter=markerDiameter).compute()
+
+
+        # ------ Fitting -------
+        acqGait = btkTools.smartReader(str(MAIN_PATH +  gaitFilename))
+        acqGait =  btkTools.applyTranslators(acqGait,translators)
+
+
+        # Motion FILTER
+        modMotion=modelFilters.ModelMotionFilter(scp,acqGait,model,enums.motionMethod.Sodervisk)
+        modMotion.compute()
+
+
+        # ------- OPENSIM IK --------------------------------------
+        # --- osim builder ---
+        cgmCalibrationprocedure = opensimFilters.CgmOpensimCalibrationProcedures(model)
+        markersetFile = pyCGM2.OPENSIM_PREBUILD_MODEL_PATH + "models\\settings\\cgm2_3\\cgm2_3-markerset.xml"
+
+        osimfile = pyCGM2.OPENSIM_PREBUILD_MODEL_PATH + "models\\osim\\lowerLimb_ballsJoints.osim"
+
+
+        oscf = opensimFilters.opensimCalibrationFilter(osimfile,
+                                                model,
+                                                cgmCalibrationprocedure,
+                                                MAIN_PATH)
+        oscf.addMarkerSet(markersetFile)
+        scalingOsim = oscf.build(exportOsim=True)
+
+        # --- fitting ---
+        #procedure
+        cgmFittingProcedure = opensimFilters.CgmOpensimFittingProcedure(model)
+
+        iksetupFile = pyCGM2.OPENSIM_PREBUILD_MODEL_PATH + "models\\settings\\cgm2_3\\cgm2_3-ikSetUp_template.xml"
+
+        osrf = opensimFilters.opensimFittingFilter(iksetupFile,
+                                                          scalingOsim,
+                                                          cgmFittingProcedure,
+                                                          MAIN_PATH,
+                                                          stagingDir = tempfile.gettempdir())
+        acqIK = osrf.run(acqGait,str(MAIN_PATH + gaitFilename ),exportSetUp=False)
+
+        # same trial twice in two worker processes
+        osbf = opensimFilters.opensimBatchFittingFilter(iksetupFile,
+                                                          scalingOsim,
+                                                          cgmFittingProcedure,
+                                                          MAIN_PATH,
+                                                          stagingDir = tempfile.gettempdir())
+        acqIKs = osbf.run([acqGait,acqGait],[str(MAIN_PATH + gaitFilename),str(MAIN_PATH + gaitFilename)],nProcesses=2)
+
+        for acqBatch in acqIKs:
+            for marker in cgmFittingProcedure.ikTags.keys():
+                if cgmFittingProcedure.ikTags[marker] != 0:
+                    np.testing.assert_almost_equal(acqBatch.GetPoint(marker).GetValues(),acqIK.GetPoint(marker).GetValues(),decimal=5)
+
 if __name__ == "__main__":
 
     #CGM2_3_Tests.noIK_determinist()
     CGM2_3_Tests.noIK_6dof()
     #CGM2_3_Tests.full_IK()
+    #CGM2_3_Tests.batch_IK()
@@ -276,6 +276,70 @@ class CGM2_Knee_test():
         print model.mp_computed["LeftKneeFuncCalibrationOffset"]
         print model.mp_computed["RightKneeFuncCalibrationOffset"]
 
+    @classmethod
+    def Calibration2Dof_synthetic_test(cls):
+        """ known offset about the Z-axis of the thigh referential """
+        from pyCGM2.Math import euler
+        from pyCGM2.Model import frame
+
+        def rotZ(angle):
+            return np.array([[np.cos(angle),-np.sin(angle),0],[np.sin(angle),np.cos(angle),0],[0,0,1]])
+
+        def rotY(angle):
+            return np.array([[np.cos(angle),0,np.sin(angle)],[0,1,0],[-np.sin(angle),0,np.cos(angle)]])
+
+        offset = 12.0
+        proxMotion=list()
+        distMotion=list()
+        for i in range(0,1000):
+            Rprox = rotZ(0.1*np.sin(i/50.0))
+            Rdist = np.dot(np.dot(Rprox,rotZ(np.deg2rad(offset))),rotY(np.deg2rad(30+30*np.sin(i/20.0))))
+
+            for motion,R in zip([proxMotion,distMotion],[Rprox,Rdist]):
+                fr = frame.Frame()
+                fr.setRotation(R)
+                motion.append(fr)
+
+        longRot = modelDecorator.calibration2Dof(proxMotion,distMotion,None,None,None)
+        np.testing.assert_almost_equal(longRot,offset,decimal=3)
+
+        M = np.array([fr.getRotation() for fr in distMotion])
+        np.testing.assert_almost_equal(euler.euler_stack(M,"YXZ"),
+                                       np.array([euler.euler_yxz(R) for R in M]),decimal=10)
+
+    @classmethod
+    def Sara_synthetic_test(cls):
+        """ known centre of rotation ( svd, normal equations and angular subsampling) """
+        from pyCGM2.Model import frame
+
+        def rotX(angle):
+            return np.array([[1,0,0],[0,np.cos(angle),-np.sin(angle)],[0,np.sin(angle),np.cos(angle)]])
+
+        proxCentre = np.array([10.0,20.0,-400.0])
+        distCentre = np.array([5.0,-3.0,30.0])
+
+        proxMotion=list()
+        distMotion=list()
+        for i in range(0,2000):
+            Rprox = rotX(0.1*np.cos(i/70.0))
+            tprox = np.array([i*0.5,0,900])
+            flexion = 0.0 if i>1500 else 0.8*np.sin(i/30.0) # static end
+            Rdist = np.dot(Rprox,rotX(flexion))
+            tdist = tprox + np.dot(Rprox,proxCentre) - np.dot(Rdist,distCentre)
+
+            for motion,R,t in zip([proxMotion,distMotion],[Rprox,Rdist],[tprox,tdist]):
+                fr = frame.Frame()
+                fr.setRotation(R)
+                fr.setTranslation(t)
+                motion.append(fr)
+
+        for method in ["1","2"]:
+            for angularStep in [None,2.0]:
+                prox_ori,prox_axisLim,dist_ori,dist_axisLim,axis_prox,axis_dist,quality = modelDecorator.saraCalibration(proxMotion,distMotion,None,None,
+                                                                                                                         method=method,angularStep=angularStep)
+                np.testing.assert_almost_equal(np.abs(axis_prox),[1,0,0],decimal=6)
+                np.testing.assert_almost_equal(((prox_ori+prox_axisLim)/2.0)[1:],proxCentre[1:],decimal=3)
+
 
 
 
@@ -383,6 +447,8 @@ if __name__ == "__main__":
 
     CGM2_Knee_test.CGM2_4_SARA_test()
     CGM2_Knee_test.CGM2_4_Calibration2Dof_test()
+    CGM2_Knee_test.Calibration2Dof_synthetic_test()
+    CGM2_Knee_test.Sara_synthetic_test()
 
     # coreApps tests
     CGM2_Knee_coreApp_tests.CGM2_4_CoreApps_Calibration2Dof_test()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2.Model import frame
+
+
+def _rotations(n):
+    random = np.random.RandomState(0)
+    rotations = list()
+    for i in range(0,n):
+        R = np.linalg.qr(random.randn(3,3))[0]
+        rotations.append(R if np.linalg.det(R)>0 else -R)
+
+    # null rotation and half turns ( null trace, each Shoemake branch)
+    rotations = rotations + [np.eye(3), np.diag([1.0,-1.0,-1.0]), np.diag([-1.0,1.0,-1.0]), np.diag([-1.0,-1.0,1.0])]
+    return np.array(rotations)
+
+
+class angleAxisTests():
+
+    @classmethod
+    def quaternions(cls):
+        """ batched quaternions match the matrix by matrix conversion
+        """
+        rotations = _rotations(500)
+
+        values = frame.getQuaternionsFromMatrices(rotations)
+        for i in range(0,rotations.shape[0]):
+            np.testing.assert_almost_equal(values[i,:],frame.getQuaternionFromMatrix(rotations[i]),decimal=10)
+
+    @classmethod
+    def angleAxis(cls):
+        """ batched angle-axis match the matrix by matrix conversion
+        """
+        rotations = _rotations(500)
+
+        values = frame.angleAxisFromMatrices(rotations)
+        for i in range(0,rotations.shape[0]):
+            expected = frame.angleAxisFromQuaternion(frame.getQuaternionFromMatrix(rotations[i]))
+            np.testing.assert_almost_equal(values[i,:],expected,decimal=8)
+
+
+if __name__ == "__main__":
+
+    angleAxisTests.quaternions()
+    angleAxisTests.angleAxis()
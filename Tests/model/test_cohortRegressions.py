@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2 import enums
+from pyCGM2.Model import modelDecorator,bodySegmentParameters
+
+
+TABLE = {"LeftLegLength" : np.array([820.0,700.0,910.0]),
+         "RightLegLength" : np.array([830.0,705.0,900.0]),
+         "MeanlegLength" : np.array([825.0,702.5,905.0]),
+         "PelvisDepth" : np.array([150.0,120.0,170.0]),
+         "InterAsisDistance" : np.array([240.0,200.0,270.0]),
+         "LeftAsisTrocanterDistance" : np.array([80.0,70.0,90.0]),
+         "RightAsisTrocanterDistance" : np.array([82.0,71.0,88.0]),
+         "Bodymass" : np.array([65.0,40.0,90.0])}
+
+
+def _subject(index):
+    return dict((label,values[index]) for label,values in TABLE.items())
+
+
+class cohortRegressionTests():
+
+    @classmethod
+    def hipJointCentres(cls):
+        """ cohort regressions match the single-subject regressions
+        """
+        cohorts = [ modelDecorator.cohortHaraRegression(TABLE),
+                    modelDecorator.cohortDavisRegression(TABLE),
+                    modelDecorator.cohortBellRegression(TABLE),
+                    modelDecorator.cohortHarringtonRegression(TABLE,enums.HarringtonPredictor.Native)]
+
+        for index in range(0,3):
+            mp = _subject(index)
+            singles = [ modelDecorator.haraRegression(mp,mp),
+                        modelDecorator.davisRegression(mp,mp),
+                        modelDecorator.bellRegression(mp,mp),
+                        modelDecorator.harringtonRegression(mp,mp,enums.HarringtonPredictor.Native)]
+
+            for cohort,single in zip(cohorts,singles):
+                np.testing.assert_almost_equal(cohort[0][index],single[0])
+                np.testing.assert_almost_equal(cohort[1][index],single[1])
+
+    @classmethod
+    def bodySegmentParameters(cls):
+
+        bsp = bodySegmentParameters.Bsp.computeCohort(TABLE["Bodymass"],{"Left Thigh": np.array([400.0,350.0,450.0])})
+
+        for index in range(0,3):
+            (mass,com,Ixx,Iyy,Izz) = bodySegmentParameters.Bsp.setParameters("Thigh",[400.0,350.0,450.0][index],TABLE["Bodymass"][index])
+            np.testing.assert_almost_equal(bsp["Left Thigh"]["mass"][index],mass)
+            np.testing.assert_almost_equal(bsp["Left Thigh"]["com"][index],com)
+            np.testing.assert_almost_equal(np.diag(bsp["Left Thigh"]["inertia"][index]),[Ixx,Iyy,Izz])
+
+
+if __name__ == "__main__":
+
+    cohortRegressionTests.hipJointCentres()
+    cohortRegressionTests.bodySegmentParameters()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+import pickle
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2.Model import frame, model
+
+
+def _frame():
+    random = np.random.RandomState(0)
+    static = frame.Frame()
+    static.update(np.linalg.qr(random.randn(3,3))[0],random.randn(3)*100.0)
+    for label in ["LASI","RASI","LPSI","RPSI"]:
+        static.addNode(label,random.randn(3)*100.0,positionType="Global",desc="marker")
+    return static
+
+
+class frameNodesTests():
+
+    @classmethod
+    def index(cls):
+        """ node index keeps the order of insertion
+        """
+        static = _frame()
+
+        assert static.getNodeLabels(display=False) == ["LASI","RASI","LPSI","RPSI"]
+        assert static.getNodeIndex("LPSI") == 2
+        assert static.isNodeExist("RPSI")
+        assert not static.isNodeExist("SACR")
+        assert static.getNode_byLabel("SACR") is False
+        assert static.getNode_byLabel("RASI") is static.getNode_byIndex(1)
+
+        # update of an existing node
+        static.addNode("RASI",np.array([1.0,2.0,3.0]),positionType="Local")
+        assert len(static.getNodes()) == 4
+        np.testing.assert_equal(static.getNode_byLabel("RASI").m_local,[1.0,2.0,3.0])
+
+        static.copyNode("SACR","LPSI")
+        assert static.getNodeIndex("SACR") == 4
+        np.testing.assert_almost_equal(static.getNode_byLabel("SACR").m_local,static.getNode_byLabel("LPSI").m_local)
+
+        static.eraseNodes()
+        assert static.getNodeLabels(display=False) == []
+
+    @classmethod
+    def pickledFrame(cls):
+        """ index is rebuilt for frames pickled without node index
+        """
+        static = _frame()
+        state = static.__dict__.copy()
+        del state["_nodeIndex"]
+
+        restored = frame.Frame.__new__(frame.Frame)
+        restored.__setstate__(state)
+        assert restored.getNodeIndex("RPSI") == 3
+
+        restored = pickle.loads(pickle.dumps(static))
+        assert restored.getNodeLabels(display=False) == ["LASI","RASI","LPSI","RPSI"]
+
+    @classmethod
+    def trajectories(cls):
+        """ multi-node trajectories match the node by node trajectories
+        """
+        random = np.random.RandomState(0)
+        referential = model.Referential()
+        referential.setStaticFrame(_frame())
+        for i in range(0,50):
+            motion = frame.Frame()
+            motion.update(np.linalg.qr(random.randn(3,3))[0],random.randn(3)*100.0)
+            referential.addMotionFrame(motion)
+
+        local = referential.static.getLocalPositions(["RPSI","LASI"])
+        np.testing.assert_equal(local[0],referential.static.getNode_byLabel("RPSI").m_local)
+
+        trajectories = referential.getNodeTrajectories()
+        for label in ["LASI","RASI","LPSI","RPSI"]:
+            np.testing.assert_almost_equal(trajectories[label],referential.getNodeTrajectory(label),decimal=10)
+
+
+if __name__ == "__main__":
+
+    frameNodesTests.index()
+    frameNodesTests.pickledFrame()
+    frameNodesTests.trajectories()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2.Model import frame, modelDecorator
+
+
+class hipCalibrationTests():
+
+    @classmethod
+    def scoreSynthetic(cls):
+        """ known centre of rotation ( least square and normal equations) """
+
+        def rotX(angle):
+            return np.array([[1,0,0],[0,np.cos(angle),-np.sin(angle)],[0,np.sin(angle),np.cos(angle)]])
+
+        def rotY(angle):
+            return np.array([[np.cos(angle),0,np.sin(angle)],[0,1,0],[-np.sin(angle),0,np.cos(angle)]])
+
+        proxCentre = np.array([-50.0,80.0,-70.0])
+        distCentre = np.array([0.0,10.0,250.0])
+
+        proxMotion=list()
+        distMotion=list()
+        for i in range(0,2000):
+            Rprox = rotX(0.05*np.sin(i/100.0))
+            tprox = np.array([0,0,900])
+            Rdist = np.dot(np.dot(Rprox,rotY(0.6*np.sin(i/30.0))),rotX(0.4*np.cos(i/45.0)))
+            tdist = tprox + np.dot(Rprox,proxCentre) - np.dot(Rdist,distCentre)
+
+            for motion,R,t in zip([proxMotion,distMotion],[Rprox,Rdist],[tprox,tdist]):
+                fr = frame.Frame()
+                fr.setRotation(R)
+                fr.setTranslation(t)
+                motion.append(fr)
+
+        for method in ["1","2"]:
+            prox_centre,dist_centre,residuals = modelDecorator.scoreCalibration(proxMotion,distMotion,None,None,method=method)
+            np.testing.assert_almost_equal(prox_centre,proxCentre,decimal=6)
+            np.testing.assert_almost_equal(dist_centre,distCentre,decimal=6)
+            np.testing.assert_almost_equal(residuals.max(),0,decimal=6)
+
+    @classmethod
+    def angularExcursionFrames(cls):
+        """ frames selected by angular excursion match a frame by frame selection """
+
+        def rotZ(angle):
+            return np.array([[np.cos(angle),-np.sin(angle),0],[np.sin(angle),np.cos(angle),0],[0,0,1]])
+
+        random = np.random.RandomState(0)
+        angles = 0.8*np.sin(np.arange(0,3000)/60.0) + random.randn(3000)*0.002
+        angles[1000:1500] = angles[1000] + random.randn(500)*0.001 # static period
+        R = np.array([rotZ(angle) for angle in angles])
+
+        for angularStep in [0.5,2.0,10.0]:
+            expected = [0]
+            for i in range(1,R.shape[0]):
+                cosAngle = (np.trace(np.dot(R[expected[-1]].T,R[i]))-1.0)/2.0
+                if np.rad2deg(np.arccos(np.clip(cosAngle,-1.0,1.0))) > angularStep:
+                    expected.append(i)
+
+            selection = modelDecorator._angularExcursionFrames(R,angularStep)
+            np.testing.assert_equal(selection,expected)
+
+        # static period : a few frames only
+        selection = modelDecorator._angularExcursionFrames(R,0.5)
+        assert np.sum((selection>=1000) & (selection<1500)) <= 2
+
+
+if __name__ == "__main__":
+
+    hipCalibrationTests.scoreSynthetic()
+    hipCalibrationTests.angularExcursionFrames()
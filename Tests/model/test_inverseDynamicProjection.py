@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2 import btk, enums
+from pyCGM2.Model import frame, model, modelFilters
+
+
+SEQUENCES = ["XYZ","XZY","YXZ","YZX","ZXY","ZYX"]
+BODYMASS = 70.0
+
+def _wrench(force,moment):
+    wrench = btk.btkWrench()
+    for values,setter in [(force,wrench.SetForce),(moment,wrench.SetMoment)]:
+        point = btk.btkPoint(values.shape[0])
+        point.SetValues(values)
+        setter(point)
+    return wrench
+
+class _WrenchProcedure(object):
+    # proximal wrenchs given, in place of an inverse dynamic procedure
+    def __init__(self,wrenchs):
+        self.m_wrenchs = wrenchs
+
+    def compute(self,iMod,btkAcq,gravity,scaleToMeter):
+        for segmentLabel,(force,moment) in self.m_wrenchs.items():
+            iMod.getSegment(segmentLabel).m_proximalWrench = _wrench(force,moment)
+
+def _model(nFrames):
+    random = np.random.RandomState(0)
+    mod = model.Model()
+    mod.addAnthropoInputParameters({"Bodymass":BODYMASS})
+
+    wrenchs = dict()
+    for index,label in enumerate(["Pelvis"]+["Segment"+sequence for sequence in SEQUENCES]):
+        mod.addSegment(label,index,enums.SegmentSide.Central)
+        for i in range(0,nFrames):
+            rotation = np.linalg.qr(random.randn(3,3))[0]
+            if np.linalg.det(rotation) < 0: rotation = -rotation
+            motion = frame.Frame()
+            motion.update(rotation,random.randn(3))
+            mod.getSegment(label).anatomicalFrame.addMotionFrame(motion)
+        if label != "Pelvis":
+            wrenchs[label] = (random.randn(nFrames,3)*100.0,random.randn(nFrames,3)*10000.0)
+
+    for sequence in SEQUENCES:
+        mod.addJoint("Joint"+sequence,"Pelvis","Segment"+sequence,sequence,"JC"+sequence)
+
+    return mod, _WrenchProcedure(wrenchs)
+
+def _projections(mod,it,projection):
+    # frame by frame projection
+    nFrames = len(mod.getSegment(it.m_distalLabel).anatomicalFrame.motion)
+    F = (1.0 / BODYMASS) * mod.getSegment(it.m_distalLabel).m_proximalWrench.GetForce().GetValues()
+    M = (1.0 / BODYMASS) * mod.getSegment(it.m_distalLabel).m_proximalWrench.GetMoment().GetValues()
+
+    forceValues = np.zeros((nFrames,3))
+    momentValues = np.zeros((nFrames,3))
+
+    if projection in [enums.MomentProjection.Global,enums.MomentProjection.Distal,enums.MomentProjection.Proximal]:
+        for i in range(0,nFrames):
+            if projection == enums.MomentProjection.Global:
+                forceValues[i,:] = F[i,:]
+                momentValues[i,:] = M[i,:]
+            else:
+                label = it.m_distalLabel if projection == enums.MomentProjection.Distal else it.m_proximalLabel
+                R = mod.getSegment(label).anatomicalFrame.motion[i].getRotation()
+                forceValues[i,:] = np.dot(R.T,F[i,:].T)
+                momentValues[i,:] = np.dot(R.T,M[i,:].T)
+        return forceValues,momentValues
+
+    axes = {"X":"m_axisX","Y":"m_axisY","Z":"m_axisZ"}
+    orders = {"XYZ":[0,1,2],"XZY":[0,2,1],"YXZ":[1,0,2],"YZX":[1,2,0],"ZXY":[2,0,1],"ZYX":[2,1,0]}
+    order = orders[it.m_sequence]
+    for i in range(0,nFrames):
+        e1 = getattr(mod.getSegment(it.m_proximalLabel).anatomicalFrame.motion[i],axes[it.m_sequence[0]])
+        e3 = getattr(mod.getSegment(it.m_distalLabel).anatomicalFrame.motion[i],axes[it.m_sequence[2]])
+        e2 = np.cross(e3,e1)
+        e2 = np.divide(e2,np.linalg.norm(e2))
+
+        if projection == enums.MomentProjection.JCS_Dual:
+            forceValues[i,order[0]] = np.divide(np.dot(np.cross(e2,e3),F[i]), np.dot(np.cross(e1,e2),e3))
+            forceValues[i,order[1]] = np.divide(np.dot(np.cross(e3,e1),F[i]), np.dot(np.cross(e1,e2),e3))
+            forceValues[i,order[2]] = np.divide(np.dot(np.cross(e1,e2),F[i]), np.dot(np.cross(e1,e2),e3))
+
+            momentValues[i,order[0]] = np.divide(np.dot(np.cross(e2,e3),M[i]), np.dot(np.cross(e1,e2),e3))
+            momentValues[i,order[1]] = np.dot(M[i],e2)
+            momentValues[i,order[2]] = np.divide(np.dot(np.cross(e1,e2),M[i]), np.dot(np.cross(e1,e2),e3))
+
+        if projection == enums.MomentProjection.JCS:
+            forceValues[i,order[0]] = np.dot(F[i],e1)
+            forceValues[i,order[1]] = np.dot(F[i],e2)
+            forceValues[i,order[2]] = np.dot(F[i],e3)
+
+            momentValues[i,order[0]] = np.dot(M[i],e1)
+            momentValues[i,order[1]] = np.dot(M[i],e2)
+            momentValues[i,order[2]] = np.dot(M[i],e3)
+
+    return forceValues,momentValues
+
+
+class inverseDynamicProjectionTests():
+
+    @classmethod
+    def projections(cls):
+        """ projected forces and moments match the frame by frame projections
+        """
+        nFrames = 30
+        for projection in [enums.MomentProjection.Distal,
+                           enums.MomentProjection.Proximal,
+                           enums.MomentProjection.Global,
+                           enums.MomentProjection.JCS,
+                           enums.MomentProjection.JCS_Dual]:
+            mod,procedure = _model(nFrames)
+
+            acq = btk.btkAcquisition()
+            acq.Init(0,nFrames)
+            acq.SetPointFrequency(100.0)
+
+            modelFilters.InverseDynamicFilter(mod,acq,procedure = procedure,projection = projection).compute(pointLabelSuffix="test")
+
+            for it in mod.m_jointCollection:
+                forceValues,momentValues = _projections(mod,it,projection)
+                np.testing.assert_almost_equal(acq.GetPoint(it.m_label+"Force_test").GetValues(),forceValues,decimal=10)
+                np.testing.assert_almost_equal(acq.GetPoint(it.m_label+"Moment_test").GetValues(),momentValues,decimal=10)
+
+
+if __name__ == "__main__":
+
+    inverseDynamicProjectionTests.projections()
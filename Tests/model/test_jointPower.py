@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2 import btk, enums
+from pyCGM2.Model import frame, model, modelFilters
+from pyCGM2.Math import derivation
+
+
+def _addMotion(segment,nFrames,seed):
+    # smooth rotations about a random axis
+    random = np.random.RandomState(seed)
+    axis = random.randn(3)
+    axis = axis/np.linalg.norm(axis)
+    time = np.arange(0,nFrames)/100.0
+    for i in range(0,nFrames):
+        angle = 0.8*np.sin(2.0*np.pi*time[i]) + random.randn()*0.01
+        K = np.array([[0,-axis[2],axis[1]],[axis[2],0,-axis[0]],[-axis[1],axis[0],0]])
+        R = np.eye(3) + np.sin(angle)*K + (1-np.cos(angle))*np.dot(K,K)
+        motion = frame.Frame()
+        motion.update(R,random.randn(3))
+        segment.anatomicalFrame.addMotionFrame(motion)
+
+def _wrench(moment):
+    wrench = btk.btkWrench()
+    point = btk.btkPoint(moment.shape[0])
+    point.SetValues(moment)
+    wrench.SetMoment(point)
+    return wrench
+
+def _model(nFrames):
+    mod = model.Model()
+    mod.addAnthropoInputParameters({"Bodymass":70.0})
+    for index,label in enumerate(["Pelvis","Left Thigh","Left Shank","Right Thigh"]):
+        side = enums.SegmentSide.Central if label == "Pelvis" else enums.SegmentSide.Left if "Left" in label else enums.SegmentSide.Right
+        mod.addSegment(label,index,side)
+        _addMotion(mod.getSegment(label),nFrames,index)
+
+    mod.addJoint("LHip","Pelvis","Left Thigh","YXZ","LHJC")
+    mod.addJoint("LKnee","Left Thigh","Left Shank","YXZ","LKJC")
+    mod.addJoint("RHip","Pelvis","Right Thigh","YXZ","RHJC")
+
+    random = np.random.RandomState(10)
+    mod.getSegment("Left Thigh").m_proximalWrench = _wrench(random.randn(nFrames,3)*50000.0)
+    mod.getSegment("Left Shank").m_proximalWrench = _wrench(random.randn(nFrames,3)*50000.0)
+    return mod
+
+def _angularVelocity(segment,sampleFrequency):
+    # frame by frame conventional method
+    frameNumber = len(segment.anatomicalFrame.motion)
+    values = np.zeros((frameNumber,3))
+    rdot = derivation.matrixFirstDerivation(segment.anatomicalFrame.motion, sampleFrequency)
+    for i in range(1,frameNumber-1):
+        tmp = np.dot(rdot[i],segment.anatomicalFrame.motion[i].getRotation().transpose())
+        values[i,:] = [tmp[2,1],tmp[0,2],tmp[1,0]]
+    return values
+
+
+class jointPowerTests():
+
+    @classmethod
+    def powers(cls):
+        """ powers match the frame by frame product of the moment and the relative angular velocity
+        """
+        nFrames = 120
+        mod = _model(nFrames)
+
+        acq = btk.btkAcquisition()
+        acq.Init(0,nFrames)
+        acq.SetPointFrequency(100.0)
+
+        modelFilters.JointPowerFilter(mod,acq).compute(pointLabelSuffix="test")
+
+        for jointLabel,proximal,distal in [("LHip","Pelvis","Left Thigh"),("LKnee","Left Thigh","Left Shank")]:
+            moment = mod.getSegment(distal).m_proximalWrench.GetMoment().GetValues()
+            relativeOmega = _angularVelocity(mod.getSegment(proximal),100.0) - _angularVelocity(mod.getSegment(distal),100.0)
+
+            expected = np.zeros((nFrames,3))
+            for i in range(0,nFrames):
+                expected[i,2] = -1.0*(1.0 / 70.0) * 0.001 * np.dot(moment[i,:],relativeOmega[i,:])
+
+            values = acq.GetPoint(jointLabel+"Power_test").GetValues()
+            assert np.abs(expected[:,2]).max() > 1.0
+            np.testing.assert_almost_equal(values,expected,decimal=10)
+
+        # no proximal wrench on the right thigh
+        assert acq.GetPointNumber() == 2
+
+    @classmethod
+    def jointWork(cls):
+        """ positive and negative works of a known power curve, cycle by cycle
+        """
+        nFrames = 300
+        mod = _model(nFrames)
+
+        acq = btk.btkAcquisition()
+        acq.Init(0,nFrames)
+        acq.SetPointFrequency(100.0)
+        acq.SetFirstFrame(11)
+        for strike in [21,121,221,400]:
+            ev = btk.btkEvent("Foot Strike",(strike-11)/100.0,"Left",btk.btkEvent.Manual,"","",1)
+            ev.SetFrame(strike)
+            acq.AppendEvent(ev)
+
+        powerFilter = modelFilters.JointPowerFilter(mod,acq)
+
+        # one sine period per cycle : +/- 1/pi J/kg
+        power = np.zeros(nFrames)
+        power[10:210] = np.sin(2.0*np.pi*np.arange(0,200)/100.0)
+        works = powerFilter._cycleWorks(power,"Left")
+
+        assert [(work["Start"],work["End"]) for work in works] == [(21,121),(121,221)]
+        for work in works:
+            np.testing.assert_almost_equal(work["Positive"],1.0/np.pi,decimal=4)
+            np.testing.assert_almost_equal(work["Negative"],-1.0/np.pi,decimal=4)
+        assert powerFilter._cycleWorks(power,"Right") == []
+
+        # works of the computed powers
+        powerFilter.compute()
+        assert sorted(powerFilter.m_jointWork.keys()) == ["LHipPower","LKneePower"]
+        for label in ["LHipPower","LKneePower"]:
+            values = acq.GetPoint(label).GetValues()[:,2]
+            for work,(start,end) in zip(powerFilter.m_jointWork[label],[(10,110),(110,210)]):
+                positive = 0.0
+                negative = 0.0
+                for i in range(start,end):
+                    positive += 0.5*(np.clip(values[i],0,None)+np.clip(values[i+1],0,None))*0.01
+                    negative += 0.5*(np.clip(values[i],None,0)+np.clip(values[i+1],None,0))*0.01
+                np.testing.assert_almost_equal(work["Positive"],positive,decimal=10)
+                np.testing.assert_almost_equal(work["Negative"],negative,decimal=10)
+
+
+if __name__ == "__main__":
+
+    jointPowerTests.powers()
+    jointPowerTests.jointWork()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+import os
+import tempfile
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2.Model.Opensim import osimStorage
+
+
+STO_HEADER = "Model Marker Locations from IK\nversion=1\nnRows=%i\nnColumns=%i\ninDegrees=no\nendheader\n"
+
+def _writeStorage(labels,values,header=STO_HEADER):
+    fd,filename = tempfile.mkstemp(suffix=".sto")
+    with os.fdopen(fd,"w") as f:
+        f.write(header %(values.shape[0],values.shape[1]))
+        f.write("\t".join(labels)+"\n")
+        for row in values:
+            f.write("\t".join(["%.10f" %(it) for it in row])+"\r\n")
+    return filename
+
+
+class osimStorageTests():
+
+    @classmethod
+    def read(cls):
+        """ header, labels and values of a storage file
+        """
+        labels = ["time","LASI_tx","LASI_ty","LASI_tz","RASI_tx","RASI_ty","RASI_tz"]
+        values = np.random.RandomState(0).randn(50,7)
+        values[:,0] = np.arange(0,50)/100.0
+        filename = _writeStorage(labels,values)
+
+        try:
+            storage = osimStorage.Storage(filename)
+        finally:
+            os.remove(filename)
+
+        assert storage.m_header["nRows"] == "50"
+        assert storage.m_header["inDegrees"] == "no"
+        assert storage.m_labels == labels
+        assert storage.getFrameNumber() == 50
+        assert storage.getColumnIndex("RASI_tx") == 4
+        np.testing.assert_almost_equal(storage.getTime(),values[:,0])
+        np.testing.assert_almost_equal(storage.getColumns(["RASI_tz","LASI_tx"]),values[:,[6,1]])
+
+    @classmethod
+    def unparsableValues(cls):
+        """ unparsable values and missing rows are detected
+        """
+        labels = ["time","LASI_tx","LASI_ty","LASI_tz"]
+        values = np.random.RandomState(0).randn(10,4)
+
+        filename = _writeStorage(labels,values)
+        try:
+            with open(filename,"r") as f:
+                content = f.read()
+            with open(filename,"w") as f:
+                f.write(content.replace("%.10f" %(values[5,2]),"-1.#IND",1))
+            osimStorage.Storage(filename)
+        except Exception as e:
+            assert "values parsed" in str(e)
+        else:
+            raise AssertionError("unparsable value not detected")
+        finally:
+            os.remove(filename)
+
+        filename = _writeStorage(labels,values,header=STO_HEADER.replace("nRows=%i","nRows=%i0"))
+        try:
+            osimStorage.Storage(filename)
+        except Exception as e:
+            assert "values parsed" in str(e)
+        else:
+            raise AssertionError("missing rows not detected")
+        finally:
+            os.remove(filename)
+
+    @classmethod
+    def markerValues(cls):
+        """ marker trajectories are rotated into the lab coordinate system and scaled in mm
+        """
+        labels = ["time","LASI_tx","LASI_ty","LASI_tz"]
+        values = np.random.RandomState(0).randn(20,4)
+        filename = _writeStorage(labels,values)
+
+        try:
+            storage = osimStorage.Storage(filename)
+        finally:
+            os.remove(filename)
+
+        R_LAB_OSIM = np.array([[1,0,0],[0,0,1],[0,-1,0]])
+        pointValues = storage.getMarkerValues("LASI",R_LAB_OSIM)
+        for i in range(0,20):
+            np.testing.assert_almost_equal(pointValues[i,:],np.dot(R_LAB_OSIM.T,values[i,1:4])*1000.0)
+
+        try:
+            storage.getMarkerValues("RASI",R_LAB_OSIM)
+        except Exception:
+            pass
+        else:
+            raise AssertionError("missing columns not detected")
+
+    @classmethod
+    def writeTrc(cls):
+        """ trc header and rows, missing markers are left empty
+        """
+        values = np.random.RandomState(0).randn(30,2,3)*100.0
+        values[5,1,:] = np.nan
+        fd,filename = tempfile.mkstemp(suffix=".trc")
+        os.close(fd)
+
+        try:
+            osimStorage.writeTrc(filename,["LASI","RASI"],values,100.0,firstFrame=11)
+            with open(filename,"r") as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(filename)
+
+        assert lines[2].split("\t") == ["100.00","100.00","30","2","mm","100.00","11","30"]
+        assert lines[3].split("\t")[0:6] == ["Frame#","Time","LASI","","","RASI"]
+        assert lines[5] == ""
+        assert len(lines) == 6+30
+
+        row = lines[6].split("\t")
+        assert row[0] == "11" and float(row[1]) == 0.0
+        np.testing.assert_almost_equal(np.array(row[2:],dtype=float),values[0].ravel(),decimal=4)
+
+        row = lines[11].split("\t")
+        assert row[0] == "16" and row[5:8] == ["","",""]
+
+    @classmethod
+    def writeMot(cls):
+        """ written mot files are read back
+        """
+        values = np.random.RandomState(0).randn(40,3)
+        time = np.arange(0,40)/100.0
+        fd,filename = tempfile.mkstemp(suffix=".mot")
+        os.close(fd)
+
+        try:
+            osimStorage.writeMot(filename,["hip_flexion_r","knee_angle_r","ankle_angle_r"],values,time)
+            storage = osimStorage.Storage(filename)
+        finally:
+            os.remove(filename)
+
+        assert storage.m_header["inDegrees"] == "yes"
+        np.testing.assert_almost_equal(storage.getTime(),time)
+        np.testing.assert_almost_equal(storage.getColumns(["hip_flexion_r","knee_angle_r","ankle_angle_r"]),values)
+
+
+if __name__ == "__main__":
+
+    osimStorageTests.read()
+    osimStorageTests.unparsableValues()
+    osimStorageTests.markerValues()
+    osimStorageTests.writeTrc()
+    osimStorageTests.writeMot()
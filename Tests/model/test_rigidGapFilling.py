@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2 import btk, enums
+from pyCGM2.Tools import btkTools
+from pyCGM2.Model import frame, model, motion, modelFilters
+
+
+LABELS = ["LTHI","LKNE","LTHAP","LTHAD","LTHIP"]
+
+def _cluster():
+    random = np.random.RandomState(0)
+    return random.randn(len(LABELS),3)*100.0
+
+def _poses(nFrames):
+    random = np.random.RandomState(1)
+    rotations = np.array([np.linalg.qr(random.randn(3,3))[0] for i in range(0,nFrames)])
+    rotations[np.linalg.det(rotations)<0] *= -1.0
+    return rotations, random.randn(nFrames,3)*500.0
+
+def _model(static):
+    mod = model.Model()
+    mod.addSegment("Left Thigh",1,enums.SegmentSide.Left,calibration_markers=[], tracking_markers = list(LABELS))
+    seg = mod.getSegment("Left Thigh")
+    seg.addTechnicalReferential("TF")
+    tf = seg.getReferential("TF")
+    tf.static.update(np.eye(3),np.zeros(3))
+    for i,label in enumerate(LABELS):
+        tf.static.addNode(label,static[i],positionType="Global")
+    return mod
+
+
+class rigidGapFillingTests():
+
+    @classmethod
+    def batchLeastSquare(cls):
+        """ batched fits match the frame by frame segmental least square
+        """
+        static = _cluster()
+        rotations,translations = _poses(20)
+        dynamic = np.einsum("nij,mj->nmi",rotations,static) + translations[:,np.newaxis,:]
+        dynamic = dynamic + np.random.RandomState(2).randn(*dynamic.shape)
+
+        R,L = motion.batchSegmentalLeastSquare(static,dynamic)
+        for i in range(0,20):
+            Ropt, Lopt, RMSE, Am, Bm = motion.segmentalLeastSquare(static,dynamic[i])
+            np.testing.assert_almost_equal(R[i],Ropt)
+            np.testing.assert_almost_equal(L[i],Lopt)
+
+    @classmethod
+    def fill(cls):
+        """ missing markers are rebuilt from the visible markers of the segment
+        """
+        nFrames = 200
+        static = _cluster()
+        rotations,translations = _poses(nFrames)
+        truth = np.einsum("nij,mj->mni",rotations,static) + translations
+
+        acq = btk.btkAcquisition()
+        acq.Init(len(LABELS),nFrames)
+        acq.SetPointFrequency(100.0)
+        for i,label in enumerate(LABELS):
+            values = np.copy(truth[i])
+            if label == "LKNE": values[20:60] = 0.0
+            if label == "LTHAP": values[40:80] = 0.0
+            if label == "LTHI": values[100:110] = 0.0; values[150:160] = 0.0
+            if label in ["LTHAD","LTHIP"]: values[150:160] = 0.0
+            point = acq.GetPoint(i)
+            point.SetLabel(label)
+            point.SetValues(values)
+            point.SetResiduals(np.where((values == 0.0).all(axis=1),-1.0,0.0))
+
+        filledFrames = modelFilters.RigidGapFillingFilter(_model(static),acq).fill()
+
+        assert filledFrames == {"LKNE":40,"LTHAP":40,"LTHI":10}
+        validFrames = np.ones(nFrames,dtype=bool)
+        validFrames[150:160] = False
+        for i,label in enumerate(LABELS):
+            np.testing.assert_almost_equal(acq.GetPoint(label).GetValues()[validFrames],truth[i][validFrames],decimal=8)
+
+        # less than 3 visible markers
+        np.testing.assert_equal(btkTools.getValidFrameMask(acq,LABELS),validFrames)
+
+
+if __name__ == "__main__":
+
+    rigidGapFillingTests.batchLeastSquare()
+    rigidGapFillingTests.fill()
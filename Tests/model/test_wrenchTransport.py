@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import logging
+
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2.Math import wrench, numeric
+
+
+class wrenchTransportTests():
+
+    @classmethod
+    def transport(cls):
+        """ transported moments match the frame by frame skew matrix product
+        """
+        random = np.random.RandomState(0)
+        force = random.randn(100,3)*100.0
+        moment = random.randn(100,3)*10.0
+        position = random.randn(100,3)*100.0
+        origin = random.randn(100,3)*100.0
+
+        values = wrench.transportMoment(force,moment,position,origin)
+        for i in [0,50,99]:
+            expected = moment[i,:] + np.array(numeric.skewMatrix(position[i,:]-origin[i,:])*np.matrix(force[i,:]).T).reshape(3)
+            np.testing.assert_almost_equal(values[i,:],expected,decimal=10)
+
+        resultantForce,resultantMoment = wrench.transportWrenchs([(force,moment,position),(force,moment,position)],origin)
+        np.testing.assert_almost_equal(resultantForce,2.0*force)
+        np.testing.assert_almost_equal(resultantMoment,2.0*values)
+
+    @classmethod
+    def inertia(cls):
+        """ inertial moment with stacked rotations
+        """
+        random = np.random.RandomState(0)
+        rotations = np.array([np.linalg.qr(random.randn(3,3))[0] for i in range(0,100)])
+        inertia = np.diag([0.1,0.2,0.05])
+        alpha = random.randn(100,3)
+        omega = random.randn(100,3)
+
+        values = wrench.inertialMoment(inertia,alpha,omega,rotations)
+        for i in [0,50,99]:
+            Iglobal = np.dot(np.dot(rotations[i],inertia),rotations[i].T)
+            expected = np.dot(Iglobal,alpha[i]) + np.cross(omega[i],np.dot(Iglobal,omega[i]))
+            np.testing.assert_almost_equal(values[i,:],expected,decimal=10)
+
+
+if __name__ == "__main__":
+
+    wrenchTransportTests.transport()
+    wrenchTransportTests.inertia()
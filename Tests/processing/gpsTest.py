@@ -109,8 +109,37 @@ class GpsTest():
 
 
 
+    @classmethod
+    def GpsSyntheticTest(cls):
+        """ stacked gvs against per cycle rms """
+        from pyCGM2.Math import numeric
+        import numpy as np
+
+        values = [np.random.randn(101,3) for i in range(0,5)]
+        valuesNorm = np.random.randn(51,3)
+
+        gvs = scores._stackedRms(values,valuesNorm)
+        for i in range(0,5):
+            np.testing.assert_almost_equal(gvs[i,:], numeric.rms(values[i][0:101:2]-valuesNorm,axis=0))
+
+    @classmethod
+    def GdiSyntheticTest(cls):
+        """ gdi of the reference set is centred on 100 with a 10-point standard deviation """
+        import numpy as np
+
+        reference = np.random.randn(100,459) + np.linspace(0,10,459)
+
+        gdi = scores.GDI(referenceFeatures=reference)
+        values = gdi.score(reference)
+
+        np.testing.assert_almost_equal(values.mean(),100.0)
+        np.testing.assert_almost_equal(values.std(ddof=1),10.0)
+
+
 if __name__ == "__main__":
 
     plt.close("all")
 
     GpsTest.GpsCGM1Test()
+    GpsTest.GpsSyntheticTest()
+    GpsTest.GdiSyntheticTest()
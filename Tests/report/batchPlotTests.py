@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import logging
+import matplotlib.pyplot as plt
+
+# pyCGM2 settings
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+from pyCGM2.Lib import analysis
+
+from pyCGM2.Report import plot,plotFilters,plotViewers,normativeDatasets
+from pyCGM2.Utils import timer
+
+
+class batchPlotTest():
+
+    @classmethod
+    def multipleAnalyses(cls):
+
+        # ----DATA-----
+        DATA_PATH = pyCGM2.TEST_DATA_PATH+"operations\\plot\\gaitPlot\\"
+        modelledFilenames = ["gait Trial 03 - viconName.c3d"]
+
+        analysisInstance = analysis.makeAnalysis("Gait", "CGM1.0", DATA_PATH,modelledFilenames,None, None, None)
+
+        # same analysis rendered 20 times ( simulate an archive)
+        analyses = [analysisInstance]*20
+        filenames = [DATA_PATH+"batchReport"+str(i)+".pdf" for i in range(0,20)]
+
+        bpf = plotFilters.BatchPlottingFilter()
+        bpf.addViewer(plotViewers.NormalizedKinematicsPlotViewer,
+                      concretePlotFunction = plot.gaitDescriptivePlot,
+                      normativeDataset = normativeDatasets.Schwartz2008("Free"))
+        bpf.addViewer(plotViewers.NormalizedKineticsPlotViewer,
+                      concretePlotFunction = plot.gaitDescriptivePlot,
+                      normativeDataset = normativeDatasets.Schwartz2008("Free"))
+
+        backend = plt.get_backend()
+        with timer.Timer("serial rendering"):
+            bpf.render(analyses,filenames)
+        assert plt.get_backend() == backend
+
+        with timer.Timer("pool rendering"):
+            bpf.render(analyses,filenames,nProcesses=4)
+
+
+if __name__ == "__main__":
+
+    batchPlotTest.multipleAnalyses()
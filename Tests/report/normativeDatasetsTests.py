@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import logging
+import numpy as np
+
+# pyCGM2 settings
+import pyCGM2
+from pyCGM2 import log; log.setLoggingLevel(logging.INFO)
+
+from pyCGM2.Report import normativeDatasets
+from pyCGM2.EMG import normalActivation
+from pyCGM2.Utils import timer
+
+
+class normativeDatasetsTest():
+
+    @classmethod
+    def schwartzCache(cls):
+
+        normativeDatasets.clearNormativeRegistry()
+
+        with timer.Timer("first construction (xls or npz)"):
+            nds = normativeDatasets.Schwartz2008("Free")
+            nds.constructNormativeData()
+
+        normativeDatasets.clearNormativeRegistry()
+        with timer.Timer("construction from npz"):
+            nds_npz = normativeDatasets.Schwartz2008("Free")
+            nds_npz.constructNormativeData()
+
+        with timer.Timer("construction from registry"):
+            nds_mem = normativeDatasets.Schwartz2008("Free")
+            nds_mem.constructNormativeData()
+
+        for label in nds.data.keys():
+            np.testing.assert_equal(nds.data[label]["mean"],nds_npz.data[label]["mean"])
+            np.testing.assert_equal(nds.data[label]["sd"],nds_mem.data[label]["sd"])
+
+        # returned dictionnaries are copies
+        nds_mem.data["Hip.Angles"]["mean"][:] = 0
+        nds_mem2 = normativeDatasets.Schwartz2008("Free")
+        nds_mem2.constructNormativeData()
+        np.testing.assert_equal(nds_mem2.data["Hip.Angles"]["mean"],nds.data["Hip.Angles"]["mean"])
+
+    @classmethod
+    def stpCache(cls):
+
+        nds = normativeDatasets.NormalSTP()
+        nds.constructNormativeData()
+
+        normativeDatasets.clearNormativeRegistry()
+        nds_npz = normativeDatasets.NormalSTP()
+        nds_npz.constructNormativeData()
+
+        for label in nds.data.keys():
+            np.testing.assert_almost_equal(nds.data[label]["Mean"],nds_npz.data[label]["Mean"])
+
+    @classmethod
+    def emgNormalActivation(cls):
+
+        with timer.Timer("100 burst lookups"):
+            for i in range(0,100):
+                pos,duration = normalActivation.getNormalBurstActivity("RECFEM",60)
+
+        assert normalActivation.getNormalActivations() is normalActivation.getNormalActivations()
+
+
+if __name__ == "__main__":
+
+    normativeDatasetsTest.schwartzCache()
+    normativeDatasetsTest.stpCache()
+    normativeDatasetsTest.emgNormalActivation()
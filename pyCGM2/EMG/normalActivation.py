@@ -1,8 +1,27 @@
 # -*- coding: utf-8 -*-
+import os
 
 import pyCGM2
 from pyCGM2.Utils import files
 
+# in-process cache of the normal activation table. ( source mtime, content)
+_NORMAL_ACTIVATIONS = dict()
+
+def getNormalActivations():
+    """
+        **Description :** return the content of normalActivation.json.
+        The json file is read once, then re-read only if it has been modified.
+    """
+    path = pyCGM2.NORMATIVE_DATABASE_PATH+"emg\\"
+    filename = "normalActivation.json"
+
+    sourceTime = os.path.getmtime(path+filename) if os.path.isfile(path+filename) else None
+    if _NORMAL_ACTIVATIONS == {} or _NORMAL_ACTIVATIONS["time"] != sourceTime:
+        _NORMAL_ACTIVATIONS["content"] = files.openJson(path,filename)
+        _NORMAL_ACTIVATIONS["time"] = sourceTime
+
+    return _NORMAL_ACTIVATIONS["content"]
+
 def getNormalBurstActivity(muscle, fo):
         """
         detection des zones d"activité normal emg
@@ -17,7 +36,7 @@ def getNormalBurstActivity(muscle, fo):
         # valeurs normales issues d"une livre EMG analys
         """
 
-        normalActivations = files.openJson(pyCGM2.NORMATIVE_DATABASE_PATH+"emg\\","normalActivation.json")
+        normalActivations = getNormalActivations()
 
         NORMAL_STANCE_PHASE=normalActivations["NORMAL_STANCE_PHASE"]
         TABLE = normalActivations["Activation"]
@@ -65,7 +84,7 @@ def getNormalBurstActivity_fromCycles(muscle,ff,begin, fo, end, apf):
         # valeurs normales issues d"une livre EMG analys
         """
 
-        normalActivations = files.openJson(pyCGM2.NORMATIVE_DATABASE_PATH+"emg\\","normalActivation.json")
+        normalActivations = getNormalActivations()
 
         NORMAL_STANCE_PHASE=normalActivations["NORMAL_STANCE_PHASE"]
         TABLE = normalActivations["Activation"]
@@ -1,16 +1,106 @@
 # -*- coding: utf-8 -*-
-import matplotlib.pyplot as plt
 import logging
 import numpy as np
 
 from pyCGM2 import btk
 
 from pyCGM2.Tools import  btkTools
-from pyCGM2.Signal import detect_peaks
+from pyCGM2.ForcePlates import forceplates, groundReactionWrenchs
 
 
 #-------- EVENT PROCEDURES  ----------
 
+ZENI_MARKERS = ["LPSI","RPSI","LHEE","LTOE","RHEE","RTOE","LANK"]
+
+
+def detectStackedPeaks(signals):
+    """
+        rising-edge peaks of stacked signals
+        ( same output as detect_peaks.detect_peaks with default settings, applied on each column)
+
+        :Parameters:
+            - `signals` (numpy.array(n,m)) - m signals
+
+        :Return:
+            - `indexes` (list) - m arrays of peak indexes
+    """
+    x = np.array(signals,dtype=float).reshape(signals.shape[0],-1)
+    n,m = x.shape
+    if n < 3:
+        return [np.array([], dtype=int) for i in range(0,m)]
+
+    nans = np.isnan(x)
+    x[nans] = np.inf
+    with np.errstate(invalid="ignore"):
+        dx = np.diff(x,axis=0)
+    dx[np.isnan(dx)] = np.inf
+
+    peaks = np.zeros((n,m),dtype=bool)
+    peaks[1:-1,:] = (dx[1:,:] <= 0) & (dx[:-1,:] > 0)
+
+    # NaN's and values close to NaN's cannot be peaks
+    if nans.any():
+        close = nans.copy()
+        close[1:,:] |= nans[:-1,:]
+        close[:-1,:] |= nans[1:,:]
+        peaks &= ~close
+
+    return [np.flatnonzero(peaks[:,i]) for i in range(0,m)]
+
+
+def getZeniInputs(acq):
+    """
+        extract the inputs of the Zeni detection from an acquisition
+
+        :Parameters:
+            - `acq` (btkAcquisition) - btk acquisition instance
+
+        :Return:
+            - `inputs` (dict) - marker trajectories, valid frames of LANK and first frame
+    """
+    inputs = dict()
+    for label in ZENI_MARKERS:
+        inputs[label] = acq.GetPoint(label).GetValues()
+    inputs["ValidFrames"] = btkTools.getValidFrameMask(acq,["LANK"])
+    inputs["FirstFrame"] = acq.GetFirstFrame()
+    return inputs
+
+
+def zeniEvents(inputs, footStrikeOffset=0, footOffOffset=0):
+    """
+        Zeni (2008) gait events from marker trajectories
+
+        :Parameters:
+            - `inputs` (dict) - inputs of the detection ( see getZeniInputs)
+            - `footStrikeOffset` (int) - systematic foot strike offset
+            - `footOffOffset` (int) - systematic foot off offset
+
+        :Return:
+            - `indexes_fs_left`,`indexes_fo_left`,`indexes_fs_right`,`indexes_fo_right` (numpy.array) - event frames
+    """
+    ff = inputs["FirstFrame"]
+
+    progressionAxis,forwardProgression,globalFrame = btkTools.findProgressionFromValues(inputs["LANK"],inputs["ValidFrames"])
+    longAxisIndex = 0 if progressionAxis == "X" else 1
+
+    sacrum=(inputs["LPSI"][:,longAxisIndex] + inputs["RPSI"][:,longAxisIndex]) / 2.0
+
+    # heel peaks for foot strikes, toe valleys for foot offs
+    signals = np.array([inputs["LHEE"][:,longAxisIndex]-sacrum,
+                        -(inputs["LTOE"][:,longAxisIndex]-sacrum),
+                        inputs["RHEE"][:,longAxisIndex]-sacrum,
+                        -(inputs["RTOE"][:,longAxisIndex]-sacrum)]).T
+    if not forwardProgression:
+        signals = -signals
+
+    indexes_fs_left,indexes_fo_left,indexes_fs_right,indexes_fo_right = detectStackedPeaks(signals)
+
+    return indexes_fs_left+ff+footStrikeOffset,indexes_fo_left+ff+footOffOffset, indexes_fs_right+ff+footStrikeOffset, indexes_fo_right+ff+footOffOffset
+
+def _zeniEventsStar(args):
+    return zeniEvents(*args)
+
+
 
 # --- calibration procedure
 class ZeniProcedure(object):
@@ -34,44 +124,105 @@ class ZeniProcedure(object):
     def detect(self,acq):
         """
         """
-        ff=acq.GetFirstFrame()
+        return zeniEvents(getZeniInputs(acq),
+                          footStrikeOffset=self.footStrikeOffset,
+                          footOffOffset=self.footOffOffset)
 
 
-        progressionAxis,forwardProgression,globalFrame = btkTools.findProgression(acq,"LANK")
-        longAxisIndex = 0 if progressionAxis == "X" else 1
-
-        sacrum=(acq.GetPoint("LPSI").GetValues() + acq.GetPoint("RPSI").GetValues()) / 2.0
-
-        #Left
-        heel_left = acq.GetPoint("LHEE").GetValues()
-        toe_left = acq.GetPoint("LTOE").GetValues()
+class ForcePlateEventProcedure(object):
+    """
+        Gait Event detection from the vertical ground reaction forces
 
-        diffHeel_left = heel_left-sacrum
-        diffToe_left = toe_left-sacrum
+        A foot strike is detected when the vertical force reaches the high threshold, a foot off when it goes below the low threshold.
+        Events are detected at the analog rate. The side of each contact is the foot with heel and toe markers inside the force plate
+        during the whole contact.
 
-        #Right
-        heel_right = acq.GetPoint("RHEE").GetValues()
-        toe_right = acq.GetPoint("RTOE").GetValues()
+        .. note:: contacts started before the first sample or not ended at the last sample only give a foot off or a foot strike
+    """
 
-        diffHeel_right = heel_right-sacrum
-        diffToe_right = toe_right-sacrum
+    def __init__(self, highThreshold=20.0, lowThreshold=10.0, left_markerLabelToe ="LTOE", left_markerLabelHeel ="LHEE",
+                 right_markerLabelToe ="RTOE", right_markerLabelHeel ="RHEE"):
+        """
+            :Parameters:
+               - `highThreshold` (double) - vertical force threshold of the foot strike (N)
+               - `lowThreshold` (double) - vertical force threshold of the foot off (N)
+               - `left_markerLabelToe` (str) - label of the left toe marker
+               - `left_markerLabelHeel` (str) - label of the left heel marker
+               - `right_markerLabelToe` (str) - label of the right toe marker
+               - `right_markerLabelHeel` (str) - label of the right heel marker
+        """
+        if lowThreshold > highThreshold:
+            raise Exception("[pyCGM2] the low threshold must be inferior to the high threshold")
 
+        self.description = "Force plate"
+        self.m_highThreshold = highThreshold
+        self.m_lowThreshold = lowThreshold
+        self.m_markers = {"Left" : (left_markerLabelHeel,left_markerLabelToe),
+                          "Right" : (right_markerLabelHeel,right_markerLabelToe)}
 
-        if  forwardProgression:
-            indexes_fs_left = detect_peaks.detect_peaks(diffHeel_left[:,longAxisIndex])+ff
-            indexes_fo_left = detect_peaks.detect_peaks(-diffToe_left[:,longAxisIndex])+ff
-        else:
-            indexes_fs_left = detect_peaks.detect_peaks(-diffHeel_left[:,longAxisIndex])+ff
-            indexes_fo_left = detect_peaks.detect_peaks(diffToe_left[:,longAxisIndex])+ff
+    def detect(self,acq):
+        """
+        """
+        grws = groundReactionWrenchs.getGroundReactionWrenchs(acq)
+        events = {"Left": ([],[]), "Right": ([],[])}
 
-        if  forwardProgression:
-            indexes_fs_right = detect_peaks.detect_peaks(diffHeel_right[:,longAxisIndex])+ff
-            indexes_fo_right = detect_peaks.detect_peaks(-diffToe_right[:,longAxisIndex])+ff
+        if grws.getNumberOfForcePlates() == 0:
+            logging.warning("[pyCGM2] no force plate found. No events detected")
         else:
-            indexes_fs_right = detect_peaks.detect_peaks(-diffHeel_right[:,longAxisIndex])+ff
-            indexes_fo_right = detect_peaks.detect_peaks(diffToe_right[:,longAxisIndex])+ff
-
-        return indexes_fs_left+self.footStrikeOffset,indexes_fo_left+self.footOffOffset, indexes_fs_right+self.footStrikeOffset, indexes_fo_right+self.footOffOffset
+            appf = float(grws.m_appf)
+            ff = grws.m_firstFrame
+            pfn = acq.GetPointFrameNumber()
+
+            Fz = np.array([np.abs(grws.getAnalogWrench(i)[0][:,2]) for i in range(0,grws.getNumberOfForcePlates())])
+            states = forceplates.hysteresisStates(Fz,self.m_highThreshold,self.m_lowThreshold)
+            nSamples = Fz.shape[1]
+
+            feet = dict()
+            for side in ["Left","Right"]:
+                feet[side] = [acq.GetPoint(label).GetValues() for label in self.m_markers[side]]
+
+            for i in range(0,Fz.shape[0]):
+                corners = grws.getCorners(i)
+                contained = dict()
+                for side in ["Left","Right"]:
+                    heel,toe = feet[side]
+                    contained[side] = np.logical_and(forceplates.pointsInQuadrilateral(heel,corners),
+                                                     forceplates.pointsInQuadrilateral(toe,corners))
+
+                for start,end in forceplates.runIntervals(states[i]):
+                    # point frames of the contact
+                    first = min(int(np.ceil(start/appf)),pfn-1)
+                    last = max(int(np.floor(end/appf)),first)
+                    sides = [side for side in ["Left","Right"] if np.all(contained[side][first:last+1])]
+                    if len(sides) != 1:
+                        logging.debug("[pyCGM2] contact of force plate #%i [%i-%i] not assigned to a foot" %(i+1,start,end))
+                        continue
+
+                    strikes,offs = events[sides[0]]
+                    if start > 0:
+                        strikes.append(ff + start/appf)
+                    if end < nSamples-1:
+                        offs.append(ff + (end+1)/appf)
+
+        return tuple(np.sort(np.array(it,dtype=float)) for it in [events["Left"][0],events["Left"][1],events["Right"][0],events["Right"][1]])
+
+
+def _appendGaitEvents(acq,eventIndexes,description):
+    indexes_fs_left,indexes_fo_left,indexes_fs_right,indexes_fo_right = eventIndexes
+
+    labels = list()
+    contexts = list()
+    ids = list()
+    for indexes,label,context,eventId in [(indexes_fs_left,"Foot Strike","Left",1),
+                                         (indexes_fo_left,"Foot Off","Left",2),
+                                         (indexes_fs_right,"Foot Strike","Right",1),
+                                         (indexes_fo_right,"Foot Off","Right",2)]:
+        labels = labels + [label]*len(indexes)
+        contexts = contexts + [context]*len(indexes)
+        ids = ids + [eventId]*len(indexes)
+
+    frames = np.concatenate([np.asarray(it) for it in eventIndexes])
+    btkTools.appendEvents(acq,labels,contexts,frames,ids,description=description)
 
 
 class EventFilter(object):
@@ -91,34 +242,58 @@ class EventFilter(object):
         """
             Run the motion filter
         """
-        pf = self.m_aqui.GetPointFrequency()
-
         eventDescriptor = self.m_procedure.description
-        indexes_fs_left,indexes_fo_left,indexes_fs_right,indexes_fo_right =  self.m_procedure.detect(self.m_aqui)
-
-        for ind in indexes_fs_left:
-            ev = btk.btkEvent('Foot Strike', (ind-1)/pf, 'Left', btk.btkEvent.Manual, '', eventDescriptor)
-            ev.SetId(1)
-            self.m_aqui.AppendEvent(ev)
-
-        for ind in indexes_fo_left:
-            ev = btk.btkEvent('Foot Off', (ind-1)/pf, 'Left', btk.btkEvent.Manual, '', eventDescriptor)
-            ev.SetId(2)
-            self.m_aqui.AppendEvent(ev)
-
-        for ind in indexes_fs_right:
-            ev = btk.btkEvent('Foot Strike', (ind-1)/pf, 'Right', btk.btkEvent.Manual, '', eventDescriptor)
-            ev.SetId(1)
-            self.m_aqui.AppendEvent(ev)
-
-        for ind in indexes_fo_right:
-            ev = btk.btkEvent('Foot Off', (ind-1)/pf, 'Right', btk.btkEvent.Manual, '', eventDescriptor)
-            ev.SetId(2)
-            self.m_aqui.AppendEvent(ev)
-
-        # events= self.m_aqui.GetEvents()
-        # for ev in btk.Iterate(events):
-        #     print ev.GetLabel()
-        #     print ev.GetContext()
-        #     print ev.GetTime()
-        #     print "------"
+        eventIndexes =  self.m_procedure.detect(self.m_aqui)
+
+        _appendGaitEvents(self.m_aqui,eventIndexes,eventDescriptor)
+
+
+class BatchEventFilter(object):
+    """
+        Zeni event detection of several acquisitions.
+
+        Marker trajectories are extracted from all acquisitions, detections run in worker processes,
+        then events are written back to the acquisitions.
+
+    """
+    def __init__(self,procedure,acqs):
+        """
+            :Parameters:
+                - `procedure` (ZeniProcedure) - event procedure
+                - `acqs` (list of btkAcquisition) - acquisitions
+        """
+
+        if not isinstance(procedure,ZeniProcedure):
+            raise Exception("[pyCGM2] batch event detection only works with the Zeni procedure")
+
+        self.m_acquisitions = acqs
+        self.m_procedure = procedure
+
+    def detect(self,nProcesses=1):
+        """
+            Run the event detection
+
+            :Parameters:
+                - `nProcesses` (int) - number of worker processes
+
+            :Return:
+                - `eventIndexes` (list) - foot strike and foot off frames of each acquisition
+        """
+        jobs = [(getZeniInputs(acq),self.m_procedure.footStrikeOffset,self.m_procedure.footOffOffset) for acq in self.m_acquisitions]
+
+        if nProcesses == 1 or len(jobs) < 2:
+            eventIndexes = map(_zeniEventsStar,jobs)
+        else:
+            import multiprocessing
+
+            pool = multiprocessing.Pool(processes = min(nProcesses,len(jobs)))
+            try:
+                eventIndexes = pool.map(_zeniEventsStar,jobs,chunksize=max(1,len(jobs)//(4*nProcesses)))
+            finally:
+                pool.close()
+                pool.join()
+
+        for acq,indexes in zip(self.m_acquisitions,eventIndexes):
+            _appendGaitEvents(acq,indexes,self.m_procedure.description)
+
+        return eventIndexes
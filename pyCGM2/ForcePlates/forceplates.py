@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 import logging
-import matplotlib.pyplot as plt
-from matplotlib.path import Path
 
 import re
 
@@ -11,6 +9,7 @@ import re
 from pyCGM2 import btk
 
 from pyCGM2.Tools import  btkTools
+from pyCGM2.ForcePlates import groundReactionWrenchs
 
 
 
@@ -27,36 +26,122 @@ def appendForcePlateCornerAsMarker (btkAcq):
 
 
     # --- ground reaction force wrench ---
-    pfe = btk.btkForcePlatformsExtractor()
-    pfe.SetInput(btkAcq)
-    pfc = pfe.GetOutput()
-    pfc.Update()
+    grws = groundReactionWrenchs.getGroundReactionWrenchs(btkAcq)
 
+    for i in range(0,grws.getNumberOfForcePlates()):
+        corners = grws.getCorners(i)
+        for j in range(0,4):
+            val_corner = corners[j,:] * np.ones((btkAcq.GetPointFrameNumber(),3))
+            btkTools.smartAppendPoint(btkAcq,"fp" + str(i) + "corner"+str(j),val_corner, desc="forcePlate")
 
-    for i in range(0,pfc.GetItemNumber()):
-        val_corner0 = pfc.GetItem(i).GetCorner(0).T * np.ones((btkAcq.GetPointFrameNumber(),3))
-        btkTools.smartAppendPoint(btkAcq,"fp" + str(i) + "corner0",val_corner0, desc="forcePlate")
+        val_origin2 = grws.getOrigin(i)  * np.ones((btkAcq.GetPointFrameNumber(),3))
+        btkTools.smartAppendPoint(btkAcq,"fp" + str(i) + "origin",val_origin2, desc="forcePlate")
 
-        val_corner1 = pfc.GetItem(i).GetCorner(1).T * np.ones((btkAcq.GetPointFrameNumber(),3))
-        btkTools.smartAppendPoint(btkAcq,"fp" + str(i) + "corner1",val_corner1, desc="forcePlate")
 
-        val_corner2 = pfc.GetItem(i).GetCorner(2).T * np.ones((btkAcq.GetPointFrameNumber(),3))
-        btkTools.smartAppendPoint(btkAcq,"fp" + str(i) + "corner2", val_corner2, desc="forcePlate")
 
-        val_corner3 = pfc.GetItem(i).GetCorner(3).T * np.ones((btkAcq.GetPointFrameNumber(),3))
-        btkTools.smartAppendPoint(btkAcq,"fp" + str(i) + "corner3",val_corner3, desc="forcePlate")
 
+def runIntervals(boolArray):
+    """
+        start and end indexes ( included) of the runs of True values
 
+        :Parameters:
+           - `boolArray` (numpy.array(n,) of bool) - boolean array
 
-        val_origin = (pfc.GetItem(i).GetCorner(0)+
-                      pfc.GetItem(i).GetCorner(1)+
-                      pfc.GetItem(i).GetCorner(2)+
-                      pfc.GetItem(i).GetCorner(3)) /4.0
-        val_origin2 = val_origin.T  * np.ones((btkAcq.GetPointFrameNumber(),3))
-        btkTools.smartAppendPoint(btkAcq,"fp" + str(i) + "origin",val_origin2, desc="forcePlate")
+        :Return:
+            - `intervals` (numpy.array(k,2)) - start and end index of each run
+    """
+    flags = np.concatenate(([0],np.asarray(boolArray,dtype=np.int8),[0]))
+    changes = np.diff(flags)
+    starts = np.where(changes == 1)[0]
+    ends = np.where(changes == -1)[0]-1
+    return np.array([starts,ends],dtype=int).T.reshape(-1,2)
+
+def hysteresisStates(values, highThreshold, lowThreshold):
+    """
+        loaded states of stacked signals with a hysteresis
+
+        A signal becomes loaded when it reaches the high threshold and unloaded when it goes below the low threshold.
+        Signals are unloaded before their first crossing.
+
+        :Parameters:
+           - `values` (numpy.array(m,n)) - m signals of n samples
+           - `highThreshold` (double) - loading threshold
+           - `lowThreshold` (double) - unloading threshold
+
+        :Return:
+            - `states` (numpy.array(m,n) of bool) - loaded states
+    """
+    values = np.atleast_2d(values)
+    switches = np.where(values >= highThreshold, 1, np.where(values < lowThreshold, 0, -1))
+
+    # index of the last switch of each sample
+    lastSwitch = np.where(switches >= 0, np.arange(values.shape[1]), 0)
+    lastSwitch = np.maximum.accumulate(lastSwitch,axis=1)
+
+    return switches[np.arange(switches.shape[0])[:,np.newaxis],lastSwitch] == 1
+
+def pointsInQuadrilateral(points, corners):
+    """
+        check if 2d points are inside a convex quadrilateral ( horizontal projection)
+
+        :Parameters:
+           - `points` (numpy.array(n,2) or numpy.array(n,3)) - points
+           - `corners` (numpy.array(4,2) or numpy.array(4,3)) - ordered corners of the quadrilateral
+
+        :Return:
+            - `flags` (numpy.array(n,) of bool) - True if the point is strictly inside
+    """
+    points = np.asarray(points)[:,0:2]
+    corners = np.asarray(corners)[:,0:2]
+
+    edges = np.roll(corners,-1,axis=0)-corners # (4,2)
+    relative = points[:,np.newaxis,:]-corners[np.newaxis,:,:] # (n,4,2)
+    crossProducts = edges[np.newaxis,:,0]*relative[:,:,1] - edges[np.newaxis,:,1]*relative[:,:,0]
+
+    return np.logical_or(np.all(crossProducts>0,axis=1),np.all(crossProducts<0,axis=1))
+
+def detectForcePlateContacts(btkAcq, forceThreshold=50, left_markerLabelToe ="LTOE", left_markerLabelHeel ="LHEE",
+                 right_markerLabelToe ="RTOE", right_markerLabelHeel ="RHEE"):
+    """
+        Contact intervals of each force plate and foot containment
+
+        **synopsis**
+
+        Contact intervals are the runs of frames with a vertical force superior to the threshold. For each interval, a foot is
+        contained if both heel and toe markers are inside the force plate corners during the whole interval.
+
+        :Parameters:
+           - `btkAcq` (btkAcquisition) - Btk acquisition instance from a c3d
+           - `forceThreshold` (double) - vertical force threshold
+           - `left_markerLabelToe` (str) - label of the left toe marker
+           - `left_markerLabelHeel` (str) - label of the left heel marker
+           - `right_markerLabelToe` (str) - label of the right toe marker
+           - `right_markerLabelHeel` (str) - label of the right heel marker
+
+        :Return:
+            - `contacts` (list) - one dictionnary by force plate. keys : *Intervals* (numpy.array(k,2) - first and last frame index of contacts),
+              *Left* and *Right* ( numpy.array(k,) of bool - foot contained in the force plate during the contact)
+
+    """
+    grws = groundReactionWrenchs.getGroundReactionWrenchs(btkAcq)
+
+    feet = {"Left" : (btkAcq.GetPoint(left_markerLabelHeel).GetValues(),btkAcq.GetPoint(left_markerLabelToe).GetValues()),
+            "Right" : (btkAcq.GetPoint(right_markerLabelHeel).GetValues(),btkAcq.GetPoint(right_markerLabelToe).GetValues())}
 
+    contacts = list()
+    for i in range(0,grws.getNumberOfForcePlates()):
+        Rz = np.abs(grws.getPointWrench(i)[0][:,2])
+        intervals = runIntervals(Rz > forceThreshold)
+        corners = grws.getCorners(i)
 
+        contact = {"Intervals" : intervals}
+        for side in ["Left","Right"]:
+            hee,toe = feet[side]
+            contained = np.logical_and(pointsInQuadrilateral(hee,corners),pointsInQuadrilateral(toe,corners))
+            contact[side] = np.array([np.all(contained[start:end+1]) for start,end in intervals],dtype=bool)
+        contacts.append(contact)
 
+    return contacts
 
 def matchingFootSideOnForceplate (btkAcq, enableRefine=True, forceThreshold=50, left_markerLabelToe ="LTOE", left_markerLabelHeel ="LHEE",
                  right_markerLabelToe ="RTOE", right_markerLabelHeel ="RHEE",  display = False, mfpa=None):
@@ -84,19 +169,8 @@ def matchingFootSideOnForceplate (btkAcq, enableRefine=True, forceThreshold=50,
 
     appendForcePlateCornerAsMarker(btkAcq)
 
-    ff=btkAcq.GetFirstFrame()
-    lf=btkAcq.GetLastFrame()
-    appf=btkAcq.GetNumberAnalogSamplePerFrame()
-
-
     # --- ground reaction force wrench ---
-    pfe = btk.btkForcePlatformsExtractor()
-    grwf = btk.btkGroundReactionWrenchFilter()
-    pfe.SetInput(btkAcq)
-    pfc = pfe.GetOutput()
-    grwf.SetInput(pfc)
-    grwc = grwf.GetOutput()
-    grwc.Update()
+    grws = groundReactionWrenchs.getGroundReactionWrenchs(btkAcq)
 
     midfoot_L=(btkAcq.GetPoint(left_markerLabelToe).GetValues() + btkAcq.GetPoint(left_markerLabelHeel).GetValues())/2.0
     midfoot_R=(btkAcq.GetPoint(right_markerLabelToe).GetValues() + btkAcq.GetPoint(right_markerLabelHeel).GetValues())/2.0
@@ -106,20 +180,20 @@ def matchingFootSideOnForceplate (btkAcq, enableRefine=True, forceThreshold=50,
     if mfpa is not None:
         try:
             pfIDS=[]
-            for i in range(0,pfc.GetItemNumber()):
-                pfIDS.append( re.findall( "\[(.*?)\]" ,pfc.GetItem(i).GetChannel(0).GetDescription())[0])
+            for i in range(0,grws.getNumberOfForcePlates()):
+                pfIDS.append( re.findall( "\[(.*?)\]" ,grws.getDescription(i))[0])
         except Exception:
             logging.info("[pyCGM2]: Id of Force plate not detected")
             pass
 
-    for i in range(0,grwc.GetItemNumber()):
-        pos= grwc.GetItem(i).GetPosition().GetValues()
-        pos_downsample = pos[0:(lf-ff+1)*appf:appf]   # downsample
+    for i in range(0,grws.getNumberOfForcePlates()):
+        pos_downsample = grws.getPointWrench(i)[2]
 
         diffL = np.linalg.norm( midfoot_L-pos_downsample,axis =1)
         diffR = np.linalg.norm( midfoot_R-pos_downsample,axis =1)
 
         if display:
+            import matplotlib.pyplot as plt
             plt.figure()
             ax = plt.subplot(1,1,1)
             plt.title("Force plate " + str(i+1))
@@ -137,89 +211,26 @@ def matchingFootSideOnForceplate (btkAcq, enableRefine=True, forceThreshold=50,
 
     if enableRefine:
         # refinement of suffix
-        indexFP =0
-
-        for letter in suffix:
-
-            force= grwc.GetItem(indexFP).GetForce().GetValues()
-            force_downsample = force[0:(lf-ff+1)*appf:appf]   # downsample
-
-
-            Rz = np.abs(force_downsample[:,2])
-
-            boolLst = Rz > forceThreshold
-
-
+        contacts = detectForcePlateContacts(btkAcq, forceThreshold=forceThreshold,
+                                            left_markerLabelToe =left_markerLabelToe, left_markerLabelHeel =left_markerLabelHeel,
+                                            right_markerLabelToe =right_markerLabelToe, right_markerLabelHeel =right_markerLabelHeel)
 
-            enableDataFlag = False
-            for it in boolLst.tolist():
-                if it == True:
-                    enableDataFlag=True
+        li = list(suffix)
+        for indexFP,letter in enumerate(suffix):
 
-                    break
-
-
-            if not enableDataFlag:
+            if contacts[indexFP]["Intervals"].shape[0] == 0:
                 logging.debug("PF #%s not activated. It provides no data superior to threshold"%(str(indexFP)) )
-                li = list(suffix)
                 li[indexFP]="X"
-                suffix ="".join(li)
 
             else:
-
-                if letter =="L":
-                    hee = btkAcq.GetPoint(left_markerLabelHeel).GetValues()
-                    toe = btkAcq.GetPoint(left_markerLabelToe).GetValues()
-                elif letter == "R":
-                    hee = btkAcq.GetPoint(right_markerLabelHeel).GetValues()
-                    toe = btkAcq.GetPoint(right_markerLabelToe).GetValues()
-
-                # polygon builder
-                corner0 =  btkAcq.GetPoint("fp"+ str(indexFP)+"corner0").GetValues()[0,:]
-                corner1 =  btkAcq.GetPoint("fp"+ str(indexFP)+"corner1").GetValues()[0,:]
-                corner2 =  btkAcq.GetPoint("fp"+ str(indexFP)+"corner2").GetValues()[0,:]
-                corner3 =  btkAcq.GetPoint("fp"+ str(indexFP)+"corner3").GetValues()[0,:]
-
-                verts = [
-                    corner0[0:2], # left, bottom
-                    corner1[0:2], # left, top
-                    corner2[0:2], # right, top
-                    corner3[0:2], # right, bottom
-                    corner0[0:2], # ignored
-                    ]
-
-                codes = [Path.MOVETO,
-                         Path.LINETO,
-                         Path.LINETO,
-                         Path.LINETO,
-                         Path.CLOSEPOLY,
-                         ]
-
-                path = Path(verts, codes)
-
-
+                side = "Left" if letter == "L" else "Right"
 
                 # check if contain both toe and hee marker
-                containFlags= list()
-                for i in range (0, Rz.shape[0]):
-                    if boolLst[i]:
-                        if path.contains_point(hee[i,0:2]) and path.contains_point(toe[i,0:2]):
-                            containFlags.append(True)
-                        else:
-                            containFlags.append(False)
-
-
-
-                if not all(containFlags) == True:
+                if not np.all(contacts[indexFP][side]):
                     logging.debug("PF #%s not activated. While Rz superior to threshold, foot markers are not contained in force plate geometry  "%(str(indexFP)) )
-                    # replace only one character
-                    li = list(suffix)
                     li[indexFP]="X"
-                    suffix ="".join(li)
-
 
-
-            indexFP+=1
+        suffix ="".join(li)
 
         # correction with manual assignement
         if mfpa is not None:
@@ -259,18 +270,10 @@ def addForcePlateGeneralEvents (btkAcq,mappedForcePlate ):
     """
 
     ff=btkAcq.GetFirstFrame()
-    lf=btkAcq.GetLastFrame()
     pf = btkAcq.GetPointFrequency()
-    appf=btkAcq.GetNumberAnalogSamplePerFrame()
 
      # --- ground reaction force wrench ---
-    pfe = btk.btkForcePlatformsExtractor()
-    grwf = btk.btkGroundReactionWrenchFilter()
-    pfe.SetInput(btkAcq)
-    pfc = pfe.GetOutput()
-    grwf.SetInput(pfc)
-    grwc = grwf.GetOutput()
-    grwc.Update()
+    grws = groundReactionWrenchs.getGroundReactionWrenchs(btkAcq)
 
     # remove force plates events
     btkTools.clearEvents(btkAcq,["Left-FP","Right-FP"])
@@ -280,9 +283,7 @@ def addForcePlateGeneralEvents (btkAcq,mappedForcePlate ):
     indexFP =0
     for letter in mappedForcePlate:
 
-        force= grwc.GetItem(indexFP).GetForce().GetValues()
-        force_downsample = force[0:(lf-ff+1)*appf:appf]   # downsample
-
+        force_downsample = grws.getPointWrench(indexFP)[0]
 
         Rz = np.abs(force_downsample[:,2])
 
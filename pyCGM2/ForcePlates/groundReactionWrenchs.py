@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Ground reaction wrenchs of the force plates of an acquisition.
+
+Force plates are extracted once per acquisition. Force, moment and point of application
+are stored at the analog rate and at the point rate.
+
+usage ::
+
+    grws = groundReactionWrenchs.getGroundReactionWrenchs(acqGait)
+    force,moment,position = grws.getPointWrench(0)
+
+.. note:: the cache is attached to the acquisition instance. Call `clearGroundReactionWrenchs`
+    if analog channels of the force plates are modified after a first extraction.
+
+"""
+import numpy as np
+import logging
+import weakref
+
+from pyCGM2 import btk
+from pyCGM2.Signal import signal_processing
+
+# acquisition -> ( signature, GroundReactionWrenchs instance)
+_WRENCH_REGISTRY = weakref.WeakKeyDictionary()
+
+
+def _signature(btkAcq):
+    return (btkAcq.GetFirstFrame(),
+            btkAcq.GetPointFrameNumber(),
+            btkAcq.GetNumberAnalogSamplePerFrame(),
+            btkAcq.GetAnalogFrameNumber(),
+            btkAcq.GetAnalogNumber())
+
+def decimateWrench(force, moment, position, appf, numberOfFrames=None):
+    """
+        anti-aliased decimation of a wrench from the analog to the point rate
+
+        The wrench is filtered as a force and a moment about the global origin ( linear in the analog channels),
+        decimated, then expressed at the decimated point of application.
+
+        :Parameters:
+            - `force` (numpy.array(n,3)) - force at the analog rate
+            - `moment` (numpy.array(n,3)) - moment at the point of application
+            - `position` (numpy.array(n,3)) - point of application
+            - `appf` (int) - number of analog samples per frame
+            - `numberOfFrames` (int) - number of point frames
+
+        :Return:
+            - `force`,`moment`,`position` (numpy.array(numberOfFrames,3)) - wrench at the point rate
+    """
+    originMoment = moment + np.cross(position,force)
+
+    force_ds = signal_processing.arrayDecimation(force,appf,numberOfSamples=numberOfFrames)
+    originMoment_ds = signal_processing.arrayDecimation(originMoment,appf,numberOfSamples=numberOfFrames)
+    position_ds = np.array(position[0:force_ds.shape[0]*int(appf):int(appf)],dtype=float)
+
+    moment_ds = originMoment_ds - np.cross(position_ds,force_ds)
+
+    return force_ds,moment_ds,position_ds
+
+
+class GroundReactionWrenchs(object):
+    """
+        Ground reaction wrenchs of all force plates of an acquisition
+    """
+
+    def __init__(self,btkAcq):
+        """
+            :Parameters:
+               - `btkAcq` (btkAcquisition) - btk acquisition instance
+        """
+
+        pfe = btk.btkForcePlatformsExtractor()
+        grwf = btk.btkGroundReactionWrenchFilter()
+        pfe.SetInput(btkAcq)
+        pfc = pfe.GetOutput()
+        grwf.SetInput(pfc)
+        grwc = grwf.GetOutput()
+        grwc.Update()
+
+        self.m_appf = btkAcq.GetNumberAnalogSamplePerFrame()
+        self.m_pointFrequency = btkAcq.GetPointFrequency()
+        self.m_pointFrameNumber = btkAcq.GetPointFrameNumber()
+        self.m_firstFrame = btkAcq.GetFirstFrame()
+
+        self.m_corners = list()
+        self.m_descriptions = list()
+        self.m_analogWrenchs = list()
+        self.m_pointWrenchs = list()
+
+        for i in range(0,grwc.GetItemNumber()):
+            platform = pfc.GetItem(i)
+            self.m_corners.append(np.array([platform.GetCorner(j).flatten() for j in range(0,4)]))
+            try:
+                self.m_descriptions.append(platform.GetChannel(0).GetDescription())
+            except Exception:
+                self.m_descriptions.append("")
+
+            wrench = grwc.GetItem(i)
+            analog = (wrench.GetForce().GetValues(),
+                      wrench.GetMoment().GetValues(),
+                      wrench.GetPosition().GetValues())
+            self.m_analogWrenchs.append(analog)
+            self.m_pointWrenchs.append(decimateWrench(analog[0],analog[1],analog[2],self.m_appf,
+                                                      numberOfFrames=self.m_pointFrameNumber))
+
+        logging.debug("[pyCGM2] ground reaction wrenchs of %i force plates extracted" %(len(self.m_analogWrenchs)))
+
+    def getNumberOfForcePlates(self):
+        return len(self.m_analogWrenchs)
+
+    def getCorners(self,index):
+        """
+            return the corners of a force plate as numpy.array(4,3)
+        """
+        return np.copy(self.m_corners[index])
+
+    def getOrigin(self,index):
+        """
+            return the centre of a force plate as numpy.array(3,)
+        """
+        return self.m_corners[index].mean(axis=0)
+
+    def getDescription(self,index):
+        """
+            return the description of the first analog channel of a force plate
+        """
+        return self.m_descriptions[index]
+
+    def getAnalogWrench(self,index):
+        """
+            return force, moment and point of application at the analog rate
+
+            :Parameters:
+               - `index` (int) - index of the force plate
+        """
+        return tuple(np.copy(it) for it in self.m_analogWrenchs[index])
+
+    def getPointWrench(self,index):
+        """
+            return force, moment and point of application at the point rate
+
+            :Parameters:
+               - `index` (int) - index of the force plate
+        """
+        return tuple(np.copy(it) for it in self.m_pointWrenchs[index])
+
+    def getBtkWrench(self,index):
+        """
+            return a new btkWrench at the point rate ( ex : for connecting a segment)
+
+            :Parameters:
+               - `index` (int) - index of the force plate
+        """
+        wrench = btk.btkWrench()
+        force,moment,position = self.getPointWrench(index)
+        for values,setter in [(force,wrench.SetForce),(moment,wrench.SetMoment),(position,wrench.SetPosition)]:
+            point = btk.btkPoint(self.m_pointFrameNumber)
+            point.SetValues(values)
+            setter(point)
+        return wrench
+
+
+def getGroundReactionWrenchs(btkAcq, refresh=False):
+    """
+        return the ground reaction wrenchs of an acquisition. Force plates are extracted at the first call only.
+
+        :Parameters:
+           - `btkAcq` (btkAcquisition) - btk acquisition instance
+           - `refresh` (bool) - force a new extraction
+    """
+    signature = _signature(btkAcq)
+    if not refresh and btkAcq in _WRENCH_REGISTRY and _WRENCH_REGISTRY[btkAcq][0] == signature:
+        return _WRENCH_REGISTRY[btkAcq][1]
+
+    grws = GroundReactionWrenchs(btkAcq)
+    _WRENCH_REGISTRY[btkAcq] = (signature,grws)
+    return grws
+
+def clearGroundReactionWrenchs(btkAcq=None):
+    """
+        remove the ground reaction wrenchs of an acquisition ( all acquisitions by default) from the cache
+    """
+    if btkAcq is None:
+        _WRENCH_REGISTRY.clear()
+    elif btkAcq in _WRENCH_REGISTRY:
+        del _WRENCH_REGISTRY[btkAcq]
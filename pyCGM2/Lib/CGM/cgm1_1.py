@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 #import ipdb
 import logging
-import matplotlib.pyplot as plt
 import argparse
 
 
@@ -11,6 +10,7 @@ import pyCGM2
 # pyCGM2 libraries
 from pyCGM2.Tools import btkTools
 from pyCGM2 import enums
+from pyCGM2.Signal import gapFilling
 
 from pyCGM2.Model import modelFilters, modelDecorator,bodySegmentParameters
 from pyCGM2.Model.CGM2 import cgm
@@ -169,6 +169,11 @@ def fitting(model,DATA_PATH, reconstructFilenameLabelled,
     btkTools.checkMultipleSubject(acqGait)
     acqGait =  btkTools.applyTranslators(acqGait,translators)
     trackingMarkers = model.getTrackingMarkers()
+    if "rigidGapFilling" in kwargs.keys() and kwargs["rigidGapFilling"]:
+        modelFilters.RigidGapFillingFilter(model,acqGait).fill()
+    if "kalmanGapFilling" in kwargs.keys() and kwargs["kalmanGapFilling"]:
+        gapFilling.fillAcquisitionGaps(acqGait,trackingMarkers)
+
     validFrames,vff,vlf = btkTools.findValidFrames(acqGait,trackingMarkers)
 
     scp=modelFilters.StaticCalibrationProcedure(model) # procedure
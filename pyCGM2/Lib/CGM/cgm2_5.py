@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 #import ipdb
 import logging
-import matplotlib.pyplot as plt
 import argparse
 
 
@@ -11,12 +10,12 @@ import pyCGM2
 # pyCGM2 libraries
 from pyCGM2.Tools import btkTools
 from pyCGM2 import enums
+from pyCGM2.Signal import gapFilling
 
 from pyCGM2.Model import modelFilters, modelDecorator,bodySegmentParameters
 from pyCGM2.Model.CGM2 import cgm,cgm2
 from pyCGM2.Model.CGM2 import decorators
 from pyCGM2.ForcePlates import forceplates
-from pyCGM2.Model.Opensim import opensimFilters
 
 
 
@@ -96,6 +95,8 @@ def calibrate(DATA_PATH,calibrateFilenameLabelled,translators,settings,
 
     if ik_flag:
         #                        ---OPENSIM IK---
+        # imported here. opensim bindings are loaded only if IK is enabled
+        from pyCGM2.Model.Opensim import opensimFilters
 
         # --- opensim calibration Filter ---
         osimfile = pyCGM2.OPENSIM_PREBUILD_MODEL_PATH + "models\\osim\\lowerLimb_ballsJoints.osim"    # osimfile
@@ -254,6 +255,11 @@ def fitting(model,DATA_PATH, reconstructFilenameLabelled,
 
     acqGait =  btkTools.applyTranslators(acqGait,translators)
     trackingMarkers = model.getTrackingMarkers()
+    if "rigidGapFilling" in kwargs.keys() and kwargs["rigidGapFilling"]:
+        modelFilters.RigidGapFillingFilter(model,acqGait).fill()
+    if "kalmanGapFilling" in kwargs.keys() and kwargs["kalmanGapFilling"]:
+        gapFilling.fillAcquisitionGaps(acqGait,trackingMarkers)
+
     validFrames,vff,vlf = btkTools.findValidFrames(acqGait,trackingMarkers)
 
 
@@ -265,6 +271,8 @@ def fitting(model,DATA_PATH, reconstructFilenameLabelled,
 
     if ik_flag:
         #                        ---OPENSIM IK---
+        # imported here. opensim bindings are loaded only if IK is enabled
+        from pyCGM2.Model.Opensim import opensimFilters
 
         # --- opensim calibration Filter ---
         osimfile = pyCGM2.OPENSIM_PREBUILD_MODEL_PATH + "models\\osim\\lowerLimb_ballsJoints.osim"    # osimfile
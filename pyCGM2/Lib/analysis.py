@@ -4,9 +4,9 @@
 from pyCGM2.Processing import c3dManager, cycle, analysis
 from pyCGM2.Model.CGM2 import  cgm
 from pyCGM2.Tools import btkTools
-from pyCGM2.EMG import emgFilters
 from pyCGM2 import enums
-from pyCGM2.Processing import exporter
+
+# note : emg and exporter (pandas) modules are imported by the functions using them
 
 
 def makeAnalysis(DATA_PATH,
@@ -122,6 +122,8 @@ def exportAnalysis(analysisInstance,DATA_PATH,name, mode="Advanced"):
 
     """
 
+    from pyCGM2.Processing import exporter
+
     exportFilter = exporter.XlsAnalysisExportFilter()
     exportFilter.setAnalysisInstance(analysisInstance)
     exportFilter.export(name, path=DATA_PATH,excelFormat = "xls",mode = mode)
@@ -144,6 +146,8 @@ def processEMG(DATA_PATH, trialFiles, emgChannels, highPassFrequencies=[20,200],
     """
 
 
+    from pyCGM2.EMG import emgFilters
+
     for trialFile in trialFiles:
         acq = btkTools.smartReader(DATA_PATH +trialFile)
 
@@ -254,6 +258,8 @@ def normalizedEMG(analysis, emgChannels,contexts, method="MeanMax", fromOtherAna
 
     """
 
+    from pyCGM2.EMG import emgFilters
+
     i=0
     for label in emgChannels:
 
@@ -14,3 +14,17 @@ def zeni(acqGait,footStrikeOffset=0,footOffOffset=0):
     evf.detect()
 
     return acqGait
+
+def zeniBatch(acqGaits,footStrikeOffset=0,footOffOffset=0,nProcesses=1):
+
+    for acqGait in acqGaits:
+        acqGait.ClearEvents()
+
+    evp = events.ZeniProcedure()
+    evp.setFootStrikeOffset(footStrikeOffset)
+    evp.setFootOffOffset(footOffOffset)
+
+    evf = events.BatchEventFilter(evp,acqGaits)
+    evf.detect(nProcesses=nProcesses)
+
+    return acqGaits
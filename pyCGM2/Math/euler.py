@@ -228,3 +228,76 @@ def euler_zyx(Matrix, similarOrder = True):
         return Euler3,Euler2,Euler1
     else:
         return Euler1,Euler2,Euler3
+
+
+def _stackedArcsin(Values):
+    return np.arcsin(np.clip(Values,-1.0,1.0))
+
+def _lockedAngle(Euler, Y, X):
+    # same rule as the single-matrix functions : sign of the locked angle flips the arctan
+    return np.where(Euler > 0, np.arctan2(Y, X), -np.arctan2(Y, X))
+
+def euler_stack(Matrices, sequence, similarOrder = True):
+    """
+        Decomposition of stacked rotation matrices according a sequence
+
+        :Parameters:
+           - `Matrices` (numpy.array(n,3,3)) : Rotation matrices
+           - `sequence` (str) : sequence (XYZ,XZY,YXZ,YZX,ZXY or ZYX)
+           - `similarOrder` (bool) : return in same order than sequence
+
+        :Return:
+            - `angles` (numpy.array(n,3)) - angles in the order returned by the matching euler_* function
+
+        .. note:: each row equals the output of the matching single-matrix function (euler_xyz,...)
+    """
+    M = Matrices
+    threshold = np.spacing(np.single(1))*10
+
+    if sequence == "XYZ":
+        Euler2 = _stackedArcsin( M[:,0,2] )
+        regular = np.abs(np.cos(Euler2)) > threshold
+        Euler1 = np.where(regular, np.arctan2( -M[:,1,2], M[:,2,2] ),
+                          np.where(Euler2 > 0, np.arctan2( M[:,1,0], M[:,1,1] ), -np.arctan2( M[:,0,1], M[:,1,1] )))
+        Euler3 = np.where(regular, np.arctan2( -M[:,0,1], M[:,0,0] ), 0.0)
+        angles = [Euler1,Euler2,Euler3]
+
+    elif sequence == "XZY":
+        Euler3 = _stackedArcsin( -M[:,0,1] )
+        regular = np.abs(np.cos(Euler3)) > threshold
+        Euler1 = np.where(regular, np.arctan2( M[:,2,1], M[:,1,1] ), _lockedAngle(Euler3, -M[:,2,0], M[:,2,2]))
+        Euler2 = np.where(regular, np.arctan2( M[:,0,2], M[:,0,0] ), 0.0)
+        angles = [Euler1,Euler3,Euler2] if similarOrder else [Euler1,Euler2,Euler3]
+
+    elif sequence == "YXZ":
+        Euler1 = _stackedArcsin( -M[:,1,2] )
+        regular = np.abs(np.cos(Euler1)) > threshold
+        Euler2 = np.where(regular, np.arctan2( M[:,0,2], M[:,2,2] ), _lockedAngle(Euler1, -M[:,0,1], M[:,0,0]))
+        Euler3 = np.where(regular, np.arctan2( M[:,1,0], M[:,1,1] ), 0.0)
+        angles = [Euler2,Euler1,Euler3] if similarOrder else [Euler1,Euler2,Euler3]
+
+    elif sequence == "YZX":
+        Euler3 = _stackedArcsin( M[:,1,0] )
+        regular = np.abs(np.cos(Euler3)) > threshold
+        Euler1 = np.where(regular, np.arctan2( -M[:,1,2], M[:,1,1] ), 0.0)
+        Euler2 = np.where(regular, np.arctan2( -M[:,2,0], M[:,0,0] ), _lockedAngle(Euler3, M[:,2,1], M[:,2,2]))
+        angles = [Euler2,Euler3,Euler1] if similarOrder else [Euler1,Euler2,Euler3]
+
+    elif sequence == "ZXY":
+        Euler1 = _stackedArcsin( M[:,2,1] )
+        regular = np.abs(np.cos(Euler1)) > threshold
+        Euler2 = np.where(regular, np.arctan2( -M[:,2,0], M[:,2,2] ), 0.0)
+        Euler3 = np.where(regular, np.arctan2( -M[:,0,1], M[:,1,1] ), _lockedAngle(Euler1, M[:,0,2], M[:,0,0]))
+        angles = [Euler3,Euler1,Euler2] if similarOrder else [Euler1,Euler2,Euler3]
+
+    elif sequence == "ZYX":
+        Euler2 = _stackedArcsin( -M[:,2,0] )
+        regular = np.abs(np.cos(Euler2)) > threshold
+        Euler1 = np.where(regular, np.arctan2( M[:,2,1], M[:,2,2] ), 0.0)
+        Euler3 = np.where(regular, np.arctan2( M[:,1,0], M[:,0,0] ), _lockedAngle(Euler2, -M[:,0,1], M[:,0,2]))
+        angles = [Euler3,Euler2,Euler1] if similarOrder else [Euler1,Euler2,Euler3]
+
+    else:
+        raise Exception("[pyCGM2] joint sequence unknown ")
+
+    return np.array(angles).T
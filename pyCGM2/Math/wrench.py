@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Wrench transport and inertial terms of the Newton-Euler equations.
+
+All functions work on a whole trial : vectors are numpy.array(n,3) and rotations are
+stacked as numpy.array(n,3,3).
+"""
+import numpy as np
+
+
+def transportMoment(force, moment, position, point):
+    """
+        Moment of a wrench transported to a new point ( M + d x F)
+
+        :Parameters:
+            - `force` (numpy.array(n,3)) - force
+            - `moment` (numpy.array(n,3)) - moment at the position
+            - `position` (numpy.array(n,3)) - position of the wrench
+            - `point` (numpy.array(n,3) or numpy.array(3,)) - point where the moment is expressed
+
+        :Return:
+            - `moment` (numpy.array(n,3)) - moment at the point
+
+    """
+    return moment + np.cross(position-point, force)
+
+def transportWrenchs(wrenchs, point):
+    """
+        Sum of wrenchs transported to a point
+
+        :Parameters:
+            - `wrenchs` (list) - list of (force, moment, position) tuples of numpy.array(n,3)
+            - `point` (numpy.array(n,3)) - point where the moment is expressed
+
+        :Return:
+            - `force` (numpy.array(n,3)) - resultant force
+            - `moment` (numpy.array(n,3)) - resultant moment at the point
+
+    """
+    force = np.zeros(point.shape)
+    moment = np.zeros(point.shape)
+    for wrenchForce,wrenchMoment,wrenchPosition in wrenchs:
+        force = force + wrenchForce
+        moment = moment + transportMoment(wrenchForce,wrenchMoment,wrenchPosition,point)
+
+    return force,moment
+
+def globalInertia(inertia, rotations):
+    """
+        Inertia tensor expressed in the global frame ( R I R^T)
+
+        :Parameters:
+            - `inertia` (numpy.array(3,3)) - inertia tensor in the segment frame
+            - `rotations` (numpy.array(n,3,3)) - rotations of the segment frame
+
+        :Return:
+            - `inertia` (numpy.array(n,3,3)) - global inertia tensors
+
+    """
+    return np.einsum("nij,jk,nlk->nil",rotations,inertia,rotations)
+
+def inertialMoment(inertia, alpha, omega, rotations):
+    """
+        Rate of change of the angular momentum about the centre of mass ( I.alpha + omega x I.omega)
+
+        :Parameters:
+            - `inertia` (numpy.array(3,3)) - inertia tensor in the segment frame
+            - `alpha` (numpy.array(n,3)) - angular acceleration
+            - `omega` (numpy.array(n,3)) - angular velocity
+            - `rotations` (numpy.array(n,3,3)) - rotations of the segment frame
+
+        :Return:
+            - `moment` (numpy.array(n,3)) - inertial moment
+
+    """
+    Iglobal = globalInertia(inertia,rotations)
+
+    acceleration = np.einsum("nij,nj->ni",Iglobal,alpha)
+    coriolis = np.cross(omega, np.einsum("nij,nj->ni",Iglobal,omega))
+
+    return acceleration + coriolis
+
+def globalVector(localVector, rotations):
+    """
+        Local vector expressed in the global frame
+
+        :Parameters:
+            - `localVector` (numpy.array(3,)) - vector in the segment frame
+            - `rotations` (numpy.array(n,3,3)) - rotations of the segment frame
+
+        :Return:
+            - `vector` (numpy.array(n,3)) - global vectors
+
+    """
+    return np.einsum("nij,j->ni",rotations,np.asarray(localVector,dtype=float).reshape(3))
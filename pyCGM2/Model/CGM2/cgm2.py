@@ -2389,35 +2389,35 @@ class CGM2_4(CGM2_3):
                 - `staticProcessingFlag` (bool`) : flag indicating only static model ouput will be export
 
         """
-
+        exporter = nexusTools.ModelOutputExporter(NEXUS,vskName,acq)
 
         if staticProcessingFlag:
             if self.checkCalibrationProperty("LeftKAD",True):
-                nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LKNE", acq)
+                exporter.appendModelledMarker("LKNE")
             if self.checkCalibrationProperty("RightKAD",True):
-                nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"RKNE", acq)
+                exporter.appendModelledMarker("RKNE")
 
         # export JC
         if self.m_bodypart != enums.BodyPart.UpperLimb:
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LHJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"RHJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LKJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"RKJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LAJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"RAJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LFJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"RFJC", acq)
+            exporter.appendModelledMarker("LHJC")
+            exporter.appendModelledMarker("RHJC")
+            exporter.appendModelledMarker("LKJC")
+            exporter.appendModelledMarker("RKJC")
+            exporter.appendModelledMarker("LAJC")
+            exporter.appendModelledMarker("RAJC")
+            exporter.appendModelledMarker("LFJC")
+            exporter.appendModelledMarker("RFJC")
 
         if self.m_bodypart == enums.BodyPart.LowerLimbTrunk:
             pass
 
         if self.m_bodypart == enums.BodyPart.UpperLimb or self.m_bodypart == enums.BodyPart.FullBody:
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LSJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"RSJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LEJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"REJC", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"LHO", acq)
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,"RHO", acq)
+            exporter.appendModelledMarker("LSJC")
+            exporter.appendModelledMarker("RSJC")
+            exporter.appendModelledMarker("LEJC")
+            exporter.appendModelledMarker("REJC")
+            exporter.appendModelledMarker("LHO")
+            exporter.appendModelledMarker("RHO")
 
             logging.debug("jc over")
 
@@ -2427,44 +2427,44 @@ class CGM2_4(CGM2_3):
             if it.GetType() == btk.btkPoint.Angle:
                 if pointSuffix is not None:
                     if pointSuffix in it.GetLabel():
-                        nexusTools.appendAngleFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                        exporter.appendAngle(str(it.GetLabel()))
                 else:
-                    nexusTools.appendAngleFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                    exporter.appendAngle(str(it.GetLabel()))
 
         logging.debug("angles over")
 
         # bones
         # -------------
         if self.m_bodypart != enums.BodyPart.UpperLimb:
-            nexusTools.appendBones(NEXUS,vskName,acq,"PELVIS", self.getSegment("Pelvis"),OriginValues = acq.GetPoint("midHJC").GetValues() )
+            exporter.appendBones("PELVIS", self.getSegment("Pelvis"),OriginValues = acq.GetPoint("midHJC").GetValues() )
 
-            nexusTools.appendBones(NEXUS,vskName,acq,"LFEMUR", self.getSegment("Left Thigh"),OriginValues = acq.GetPoint("LKJC").GetValues() )
+            exporter.appendBones("LFEMUR", self.getSegment("Left Thigh"),OriginValues = acq.GetPoint("LKJC").GetValues() )
             #nexusTools.appendBones(NEXUS,vskName,"LFEP", self.getSegment("Left Shank Proximal"),OriginValues = acq.GetPoint("LKJC").GetValues(),manualScale = 100 )
-            nexusTools.appendBones(NEXUS,vskName,acq,"LTIBIA", self.getSegment("Left Shank"),OriginValues = acq.GetPoint("LAJC").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"LFOOT", self.getSegment("Left Foot"), OriginValues = acq.GetPoint("LHEE").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"LTOES", self.getSegment("Left ForeFoot"), OriginValues = acq.GetPoint("LFJC").GetValues() )
+            exporter.appendBones("LTIBIA", self.getSegment("Left Shank"),OriginValues = acq.GetPoint("LAJC").GetValues() )
+            exporter.appendBones("LFOOT", self.getSegment("Left Foot"), OriginValues = acq.GetPoint("LHEE").GetValues() )
+            exporter.appendBones("LTOES", self.getSegment("Left ForeFoot"), OriginValues = acq.GetPoint("LFJC").GetValues() )
 
 
-            nexusTools.appendBones(NEXUS,vskName,acq,"RFEMUR", self.getSegment("Right Thigh"),OriginValues = acq.GetPoint("RKJC").GetValues() )
+            exporter.appendBones("RFEMUR", self.getSegment("Right Thigh"),OriginValues = acq.GetPoint("RKJC").GetValues() )
             #nexusTools.appendBones(NEXUS,vskName,"RFEP", self.getSegment("Right Shank Proximal"),OriginValues = acq.GetPoint("RKJC").GetValues(),manualScale = 100 )
-            nexusTools.appendBones(NEXUS,vskName,acq,"RTIBIA", self.getSegment("Right Shank"),OriginValues = acq.GetPoint("RAJC").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"RFOOT", self.getSegment("Right Foot") , OriginValues = acq.GetPoint("RHEE").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"RTOES", self.getSegment("Right ForeFoot") ,  OriginValues = acq.GetPoint("RFJC").GetValues())
+            exporter.appendBones("RTIBIA", self.getSegment("Right Shank"),OriginValues = acq.GetPoint("RAJC").GetValues() )
+            exporter.appendBones("RFOOT", self.getSegment("Right Foot") , OriginValues = acq.GetPoint("RHEE").GetValues() )
+            exporter.appendBones("RTOES", self.getSegment("Right ForeFoot") ,  OriginValues = acq.GetPoint("RFJC").GetValues())
 
         if self.m_bodypart == enums.BodyPart.LowerLimbTrunk :
-            nexusTools.appendBones(NEXUS,vskName,acq,"THORAX", self.getSegment("Thorax"),OriginValues = acq.GetPoint("OT").GetValues() )
+            exporter.appendBones("THORAX", self.getSegment("Thorax"),OriginValues = acq.GetPoint("OT").GetValues() )
 
         if self.m_bodypart == enums.BodyPart.UpperLimb or self.m_bodypart == enums.BodyPart.FullBody:
-            nexusTools.appendBones(NEXUS,vskName,acq,"THORAX", self.getSegment("Thorax"),OriginValues = acq.GetPoint("OT").GetValues() )
+            exporter.appendBones("THORAX", self.getSegment("Thorax"),OriginValues = acq.GetPoint("OT").GetValues() )
 
-            nexusTools.appendBones(NEXUS,vskName,acq,"LUPPERARM", self.getSegment("Left UpperArm"),OriginValues = acq.GetPoint("LEJC").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"LFOREARM", self.getSegment("Left ForeArm"),OriginValues = acq.GetPoint("LWJC").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"LHAND", self.getSegment("Left Hand"),OriginValues = acq.GetPoint("LHO").GetValues() )
+            exporter.appendBones("LUPPERARM", self.getSegment("Left UpperArm"),OriginValues = acq.GetPoint("LEJC").GetValues() )
+            exporter.appendBones("LFOREARM", self.getSegment("Left ForeArm"),OriginValues = acq.GetPoint("LWJC").GetValues() )
+            exporter.appendBones("LHAND", self.getSegment("Left Hand"),OriginValues = acq.GetPoint("LHO").GetValues() )
 
-            nexusTools.appendBones(NEXUS,vskName,acq,"RUPPERARM", self.getSegment("Right UpperArm"),OriginValues = acq.GetPoint("REJC").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"RFOREARM", self.getSegment("Right ForeArm"),OriginValues = acq.GetPoint("RWJC").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"RHAND", self.getSegment("Right Hand"),OriginValues = acq.GetPoint("RHO").GetValues() )
-            nexusTools.appendBones(NEXUS,vskName,acq,"HEAD", self.getSegment("Head"),OriginValues = acq.GetPoint("HC").GetValues() )
+            exporter.appendBones("RUPPERARM", self.getSegment("Right UpperArm"),OriginValues = acq.GetPoint("REJC").GetValues() )
+            exporter.appendBones("RFOREARM", self.getSegment("Right ForeArm"),OriginValues = acq.GetPoint("RWJC").GetValues() )
+            exporter.appendBones("RHAND", self.getSegment("Right Hand"),OriginValues = acq.GetPoint("RHO").GetValues() )
+            exporter.appendBones("HEAD", self.getSegment("Head"),OriginValues = acq.GetPoint("HC").GetValues() )
         logging.debug("bones over")
 
         if not staticProcessingFlag:
@@ -2473,9 +2473,9 @@ class CGM2_4(CGM2_3):
                 if it.GetType() == btk.btkPoint.Force:
                     if pointSuffix is not None:
                         if pointSuffix in it.GetLabel():
-                            nexusTools.appendForceFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                            exporter.appendForce(str(it.GetLabel()))
                     else:
-                        nexusTools.appendForceFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                        exporter.appendForce(str(it.GetLabel()))
             logging.debug("force over")
 
             # export Moment
@@ -2483,9 +2483,9 @@ class CGM2_4(CGM2_3):
                 if it.GetType() == btk.btkPoint.Moment:
                     if pointSuffix is not None:
                         if pointSuffix in it.GetLabel():
-                            nexusTools.appendMomentFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                            exporter.appendMoment(str(it.GetLabel()))
                     else:
-                        nexusTools.appendMomentFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                        exporter.appendMoment(str(it.GetLabel()))
             logging.debug("Moment over")
 
             # export Moment
@@ -2493,15 +2493,17 @@ class CGM2_4(CGM2_3):
                 if it.GetType() == btk.btkPoint.Power:
                     if pointSuffix is not None:
                         if pointSuffix in it.GetLabel():
-                            nexusTools.appendPowerFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                            exporter.appendPower(str(it.GetLabel()))
                     else:
-                        nexusTools.appendPowerFromAcq(NEXUS,vskName,str(it.GetLabel()), acq)
+                        exporter.appendPower(str(it.GetLabel()))
             logging.debug("power over")
 
         # centre of mass
         centreOfMassLabel  = "CentreOfMass_" + pointSuffix if pointSuffix is not None else "CentreOfMass"
         if self.m_centreOfMass is not None:
-            nexusTools.appendModelledMarkerFromAcq(NEXUS,vskName,str(centreOfMassLabel), acq)
+            exporter.appendModelledMarker(str(centreOfMassLabel))
+
+        exporter.export()
 
 
 class CGM2_5(CGM2_4):
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
+import shutil
+import tempfile
 import numpy as np
 import logging
 
@@ -7,7 +9,7 @@ from pyCGM2 import btk
 
 # pyCGM2
 from pyCGM2.Tools import  btkTools
-from pyCGM2.Model.Opensim import osimProcessing
+from pyCGM2.Model.Opensim import osimProcessing, osimStorage
 
 
 
@@ -187,6 +189,7 @@ class opensimCalibrationFilter(object):
             if os.path.isfile(self.opensimOutputDir +"scaledModel.osim"):
                 os.remove(self.opensimOutputDir +"scaledModel.osim")
             self.exportXml("scaledModel.osim", path = self.opensimOutputDir)
+            self._osimModel.m_calibratedOsimFile = str(self.opensimOutputDir +"scaledModel.osim")
 
         return self._osimModel
 
@@ -204,8 +207,47 @@ class opensimCalibrationFilter(object):
         self._osimModel.m_model.printToXML(filename)
 
 
+def _ikWorkspace(rootDir,acqMotionFilename):
+    # own directory of a IK run in rootDir
+    trialName = os.path.basename(acqMotionFilename[:-4])
+    return os.path.join(tempfile.mkdtemp(prefix=str(trialName+"-ik-"),dir=rootDir),"")
+
+def _releaseIkWorkspace(workingDir,acqMotionFilename,staged):
+    if staged:
+        motFilename = os.path.basename(acqMotionFilename[:-4])+".mot"
+        if os.path.isfile(workingDir + motFilename):
+            shutil.copyfile(workingDir + motFilename, acqMotionFilename[:-4]+".mot")
+    shutil.rmtree(workingDir,ignore_errors=True)
+
+def _fittedAcquisition(acqMotion,ikTags,storage,R_LAB_OSIM):
+    # acq with rigid markers
+    acqMotionFinal = btk.btkAcquisition.Clone(acqMotion)
+    for marker in ikTags.keys():
+        if ikTags[marker] != 0:
+            values = storage.getMarkerValues(marker,R_LAB_OSIM)
+            lenOsim  = len(values)
+
+            lenc3d  = acqMotion.GetPoint(marker).GetFrameNumber()
+            if lenOsim < lenc3d:
+                logging.warning(" size osim (%i) inferior to c3d (%i)" % (lenOsim,lenc3d))
+                values2 = np.zeros((lenc3d,3))
+                values2[0:lenOsim,:]=values
+                values2[lenOsim:lenc3d,:]=acqMotion.GetPoint(marker).GetValues()[lenOsim:lenc3d,:]
+
+                btkTools.smartAppendPoint(acqMotionFinal,marker+"_m", acqMotionFinal.GetPoint(marker).GetValues(), desc= "measured" ) # new acq with marker overwrited
+                btkTools.smartAppendPoint(acqMotionFinal,marker, values2, desc= "kinematic fitting" ) # new acq with marker overwrited
+            else:
+                btkTools.smartAppendPoint(acqMotionFinal,marker+"_m", acqMotionFinal.GetPoint(marker).GetValues(), desc= "measured" ) # measured marker suffix with _m
+                btkTools.smartAppendPoint(acqMotionFinal,marker, values, desc= "kinematic fitting" ) # new acq with marker overwrited
+
+    return acqMotionFinal
+
+def _runKinematicFittingStar(args):
+    return osimProcessing.runKinematicFitting(*args)
+
+
 class opensimFittingFilter(object):
-    def __init__(self,ikToolFile,calibratedOsim, ikTagProcedure,dataDir,accuracy = 1e-8 ):
+    def __init__(self,ikToolFile,calibratedOsim, ikTagProcedure,dataDir,accuracy = 1e-8, stagingDir=None ):
         """
             :Parameters:
                 - `ikToolFile` (str) - full filename of the opensim inverse kinematic tool file
@@ -213,11 +255,14 @@ class opensimFittingFilter(object):
                 - `ikTagProcedure` (pyCGM2.opensim.procedure) - fitting procedure
                 - `dataDir` (str) - path to opensim result directory
                 - `accuracy` (double) - accuracy of the kinematic fitter
+                - `stagingDir` (str) - if given, the trc file and the IK outputs of each run are staged in a new folder of this directory ( ie. tempfile.gettempdir() or a RAM-disk).
+                  Only the IK motion file is copied back next to the motion trial. Otherwise, IK outputs are written in a new folder of `dataDir`, removed after the run.
 
         """
         self.m_calibratedOsim = calibratedOsim
         self.m_ikToolFile = ikToolFile
         self.m_procedure = ikTagProcedure
+        self.m_stagingDir = stagingDir
 
         self.accuracy = accuracy
 
@@ -238,7 +283,6 @@ class opensimFittingFilter(object):
         """
 
 
-        acqMotion_forIK = btk.btkAcquisition.Clone(acqMotion)
         progressionAxis,forwardProgression,globalFrame = btkTools.findProgressionAxisFromPelvicMarkers(acqMotion,["LASI","RASI","RPSI","LPSI"])
 
         # --- ikTasks
@@ -246,43 +290,30 @@ class opensimFittingFilter(object):
         for markerIt in self.m_procedure.ikTags.keys():
             self._osimIK.updateIKTask(markerIt,self.m_procedure.ikTags[markerIt])
 
+        # --- working directory of the trial
+        staged = self.m_stagingDir is not None
+        workingDir = _ikWorkspace(self.m_stagingDir if staged else self.opensimOutputDir,acqMotionFilename)
+        self._osimIK.setResultsDirectory(workingDir)
 
-        # --- configuration and run IK
-        if os.path.isfile(self.opensimOutputDir +"ik_model_marker_locations.sto"):
-            os.remove(self.opensimOutputDir +"ik_model_marker_locations.sto")
-
-        R_LAB_OSIM = osimProcessing.setGlobalTransormation_lab_osim(progressionAxis,forwardProgression)
-        self._osimIK.config(R_LAB_OSIM, acqMotion_forIK, acqMotionFilename )
-
-        if exportSetUp:
-            if os.path.isfile(self.opensimOutputDir +"scaledModel-ikSetUp.xml"):
-                os.remove(self.opensimOutputDir +"scaledModel-ikSetUp.xml")
-            self.exportXml("scaledModel-ikSetUp.xml",path = self.opensimOutputDir)
+        try:
+            # --- configuration and run IK
+            R_LAB_OSIM = osimProcessing.setGlobalTransormation_lab_osim(progressionAxis,forwardProgression)
+            self._osimIK.config(R_LAB_OSIM, acqMotion, acqMotionFilename,
+                                workingDir = workingDir if staged else None)
 
+            if exportSetUp:
+                setUpFilename = os.path.basename(acqMotionFilename[:-4])+"-ikSetUp.xml"
+                if os.path.isfile(self.opensimOutputDir +setUpFilename):
+                    os.remove(self.opensimOutputDir +setUpFilename)
+                self.exportXml(setUpFilename,path = self.opensimOutputDir)
 
-        self._osimIK.run()
+            self._osimIK.run()
 
-        # --- gernerate acq with rigid markers
-        acqMotionFinal = btk.btkAcquisition.Clone(acqMotion)
-        for marker in self.m_procedure.ikTags.keys():
-            if self.m_procedure.ikTags[marker] != 0:
-                values =osimProcessing.sto2pointValues(self.opensimOutputDir + "ik_model_marker_locations.sto",marker,R_LAB_OSIM)
-                lenOsim  = len(values)
+            storage = osimStorage.Storage(workingDir + "ik_model_marker_locations.sto")
+        finally:
+            _releaseIkWorkspace(workingDir,acqMotionFilename,staged)
 
-                lenc3d  = acqMotion.GetPoint(marker).GetFrameNumber()
-                if lenOsim < lenc3d:
-                    logging.warning(" size osim (%i) inferior to c3d (%i)" % (lenOsim,lenc3d))
-                    values2 = np.zeros((lenc3d,3))
-                    values2[0:lenOsim,:]=values
-                    values2[lenOsim:lenc3d,:]=acqMotion.GetPoint(marker).GetValues()[lenOsim:lenc3d,:]
-
-                    btkTools.smartAppendPoint(acqMotionFinal,marker+"_m", acqMotionFinal.GetPoint(marker).GetValues(), desc= "measured" ) # new acq with marker overwrited
-                    btkTools.smartAppendPoint(acqMotionFinal,marker, values2, desc= "kinematic fitting" ) # new acq with marker overwrited
-                else:
-                    btkTools.smartAppendPoint(acqMotionFinal,marker+"_m", acqMotionFinal.GetPoint(marker).GetValues(), desc= "measured" ) # measured marker suffix with _m
-                    btkTools.smartAppendPoint(acqMotionFinal,marker, values, desc= "kinematic fitting" ) # new acq with marker overwrited
-
-        return acqMotionFinal
+        return _fittedAcquisition(acqMotion,self.m_procedure.ikTags,storage,R_LAB_OSIM)
 
 
     def exportXml(self,filename, path=None):
@@ -295,3 +326,86 @@ class opensimFittingFilter(object):
         """
         filename = filename if path is None else str(path+filename)
         self._osimIK.m_ikTool.printToXML(filename)
+
+
+class opensimBatchFittingFilter(object):
+    """
+        Kinematic fitting of several trials in a process pool.
+
+        Each trial runs in its own working directory. Workers load the calibrated osim
+        file exported by `opensimCalibrationFilter.build`, read only.
+    """
+    def __init__(self,ikToolFile,calibratedOsim, ikTagProcedure,dataDir,accuracy = 1e-8, stagingDir=None ):
+        """
+            :Parameters:
+                - `ikToolFile` (str) - full filename of the opensim inverse kinematic tool file
+                - `calibratedOsim` (osim file) - calibrated opensim file, exported by the calibration filter
+                - `ikTagProcedure` (pyCGM2.opensim.procedure) - fitting procedure
+                - `dataDir` (str) - path to opensim result directory
+                - `accuracy` (double) - accuracy of the kinematic fitter
+                - `stagingDir` (str) - if given, trc files and IK outputs are staged in this directory ( see opensimFittingFilter)
+
+        """
+        if calibratedOsim.m_calibratedOsimFile is None:
+            raise Exception("[pyCGM2] batch fitting needs the exported calibrated osim file. Build the calibrated model with exportOsim=True")
+
+        self.m_calibratedOsimFile = calibratedOsim.m_calibratedOsimFile
+        self.m_ikToolFile = ikToolFile
+        self.m_procedure = ikTagProcedure
+        self.m_stagingDir = stagingDir
+
+        self.accuracy = accuracy
+
+        self.opensimOutputDir = dataDir if dataDir[-1:] =="\\" else str(dataDir+"\\")
+
+    def run(self,acqMotions, acqMotionFilenames, nProcesses=1):
+        """
+            Run kinematic fitting
+
+            :Parameters:
+                - `acqMotions` (list of btk.Acquisition) - acquisitions of the motion trials
+                - `acqMotionFilenames` (list of str) - filenames of the motion trials
+                - `nProcesses` (int) - number of worker processes
+
+            :Return:
+                - `acqMotionFinals` (list of btk.Acquisition) - acquisitions with fitted markers
+
+        """
+        staged = self.m_stagingDir is not None
+        ikTags = dict(self.m_procedure.ikTags)
+
+        jobs = list()
+        rotations = list()
+        workingDirs = list()
+        try:
+            for acqMotion,acqMotionFilename in zip(acqMotions,acqMotionFilenames):
+                progressionAxis,forwardProgression,globalFrame = btkTools.findProgressionAxisFromPelvicMarkers(acqMotion,["LASI","RASI","RPSI","LPSI"])
+                R_LAB_OSIM = osimProcessing.setGlobalTransormation_lab_osim(progressionAxis,forwardProgression)
+
+                workingDir = _ikWorkspace(self.m_stagingDir if staged else self.opensimOutputDir,acqMotionFilename)
+                workingDirs.append(workingDir)
+
+                filenameNoExt = acqMotionFilename[:-4] if not staged else str(workingDir + os.path.basename(acqMotionFilename[:-4]))
+                osimProcessing.smartTrcExport(acqMotion,filenameNoExt,R_LAB_OSIM=R_LAB_OSIM)
+                endTime = (acqMotion.GetLastFrame() - acqMotion.GetFirstFrame())/acqMotion.GetPointFrequency()
+
+                rotations.append(R_LAB_OSIM)
+                jobs.append((self.m_calibratedOsimFile,self.m_ikToolFile,ikTags,filenameNoExt,endTime,workingDir,self.accuracy))
+
+            if nProcesses == 1 or len(jobs) < 2:
+                storages = map(_runKinematicFittingStar,jobs)
+            else:
+                import multiprocessing
+
+                pool = multiprocessing.Pool(processes = min(nProcesses,len(jobs)))
+                try:
+                    storages = pool.map(_runKinematicFittingStar,jobs,chunksize=1)
+                finally:
+                    pool.close()
+                    pool.join()
+        finally:
+            for workingDir,acqMotionFilename in zip(workingDirs,acqMotionFilenames):
+                _releaseIkWorkspace(workingDir,acqMotionFilename,staged)
+
+        return [_fittedAcquisition(acqMotion,ikTags,storage,R_LAB_OSIM)
+                    for acqMotion,storage,R_LAB_OSIM in zip(acqMotions,storages,rotations)]
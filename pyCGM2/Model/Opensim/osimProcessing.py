@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
+import os
 import logging
 import numpy as np
 
 from pyCGM2 import btk
 from pyCGM2 import opensim3 as opensim
+from pyCGM2.Model.Opensim import osimStorage
 
 
 
@@ -32,74 +34,47 @@ def globalTransformationLabToOsim(acq,R_LAB_OSIM):
     points = acq.GetPoints()
     for it in btk.Iterate(points):
         if it.GetType() == btk.btkPoint.Marker:
-            values = np.zeros(it.GetValues().shape)
-            for i in range(0,it.GetValues().shape[0]):
-                values[i,:] = np.dot(R_LAB_OSIM,it.GetValues()[i,:])
-            it.SetValues(values)
-
-def smartTrcExport(acq,filenameNoExt):
-    writerDyn = btk.btkAcquisitionFileWriter()
-    writerDyn.SetInput(acq)
-    writerDyn.SetFilename(str(filenameNoExt + ".trc"))
-    writerDyn.Update()
-
-
-
-def sto2pointValues(stoFilename,label,R_LAB_OSIM):
-    storageObject = opensim.Storage(stoFilename)
-    index_x =storageObject.getStateIndex(label+"_tx")
-    index_y =storageObject.getStateIndex(label+"_ty")
-    index_z =storageObject.getStateIndex(label+"_tz")
-
-    array_x=opensim.ArrayDouble()
-    storageObject.getDataColumn(index_x,array_x)
-
-    array_y=opensim.ArrayDouble()
-    storageObject.getDataColumn(index_y,array_y)
-
-    array_z=opensim.ArrayDouble()
-    storageObject.getDataColumn(index_z,array_z)
+            it.SetValues(np.dot(it.GetValues(),R_LAB_OSIM.T))
+
+def getMarkerArrays(acq):
+    """
+        Trajectories of the markers of an acquisition
+
+        :Parameters:
+            - `acq` (btkAcquisition) - a btk acquisition inctance
+
+        :Return:
+            - `labels` (list) - marker labels
+            - `values` (numpy.array(n,m,3)) - marker trajectories, *nan* where residuals are negative
+    """
+    labels = list()
+    values = list()
+    for it in btk.Iterate(acq.GetPoints()):
+        if it.GetType() == btk.btkPoint.Marker:
+            markerValues = np.array(it.GetValues(),dtype=float)
+            markerValues[it.GetResiduals().reshape(-1)<0] = np.nan
+            labels.append(it.GetLabel())
+            values.append(markerValues)
 
-    n= array_x.getSize()
-    pointValues = np.zeros((n,3))
-    for i in range(0,n):
-        pointValues[i,0] = array_x.getitem(i)
-        pointValues[i,1] = array_y.getitem(i)
-        pointValues[i,2] = array_z.getitem(i)
+    values = np.array(values).transpose(1,0,2) if values != [] else np.zeros((acq.GetPointFrameNumber(),0,3))
+    return labels, values
 
+def smartTrcExport(acq,filenameNoExt,R_LAB_OSIM=None):
+    labels,values = getMarkerArrays(acq)
+    if R_LAB_OSIM is not None:
+        values = np.dot(values,R_LAB_OSIM.T)
+    osimStorage.writeTrc(str(filenameNoExt + ".trc"),labels,values,acq.GetPointFrequency(),firstFrame=acq.GetFirstFrame())
 
-    for i in range(0,n):
-        pointValues[i,:] = np.dot(R_LAB_OSIM.T,pointValues[i,:])*1000.0
 
 
-    return pointValues
+def sto2pointValues(stoFilename,label,R_LAB_OSIM):
+    storage = osimStorage.Storage(stoFilename)
+    return storage.getMarkerValues(label,R_LAB_OSIM)
 
 
 def mot2pointValues(motFilename,labels,orientation =[1,1,1]):
-    storageObject = opensim.Storage(motFilename)
-
-    index_x =storageObject.getStateIndex(labels[0])
-    index_y =storageObject.getStateIndex(labels[1])
-    index_z =storageObject.getStateIndex(labels[2])
-
-    array_x=opensim.ArrayDouble()
-    storageObject.getDataColumn(index_x,array_x)
-
-    array_y=opensim.ArrayDouble()
-    storageObject.getDataColumn(index_y,array_y)
-
-    array_z=opensim.ArrayDouble()
-    storageObject.getDataColumn(index_z,array_z)
-
-    n= array_x.getSize()
-    pointValues = np.zeros((n,3))
-    for i in range(0,n):
-        pointValues[i,0] = orientation[0]*array_x.getitem(i)
-        pointValues[i,1] = orientation[1]*array_y.getitem(i)
-        pointValues[i,2] = orientation[2]*array_z.getitem(i)
-
-
-    return pointValues
+    storage = osimStorage.Storage(motFilename)
+    return storage.getColumns(labels[0:3])*np.array(orientation)
 
 def setGlobalTransormation_lab_osim(axis,forwardProgression):
     """ Todo : incomplet, il faut traiter tous les cas """
@@ -132,6 +107,7 @@ class opensimModel(object):
         self.m_model = opensim.Model(str(osimFile))
         self.m_cgmModel = cgmModel
         self.m_markers= list()
+        self.m_calibratedOsimFile = None
 
 
         self.m_model.initSystem()
@@ -245,15 +221,19 @@ class opensimKinematicFitting(object):
             self.m_ikTool.getIKTaskSet().set(int(i),self.m_ikMarkers[i]) #FIXME memory issue
 
 
-    def config(self, R_LAB_OSIM,acq, acqFileName):
+    def config(self, R_LAB_OSIM,acq, acqFileName, workingDir=None):
 
         # steps 1 : motion data processing
-        globalTransformationLabToOsim(acq,R_LAB_OSIM) # global Transformation lab to OSIM
-
-        filenameNoExt = acqFileName[:-4]
-        smartTrcExport(acq,filenameNoExt) # trc export
+        # trc export in the osim global frame. The acquisition is not modified
+        filenameNoExt = acqFileName[:-4] if workingDir is None else str(workingDir + os.path.basename(acqFileName[:-4]))
+        smartTrcExport(acq,filenameNoExt,R_LAB_OSIM=R_LAB_OSIM)
 
         # steps 2 : config ikTool
+        endTime = (acq.GetLastFrame() - acq.GetFirstFrame())/acq.GetPointFrequency()
+        self.setMarkerData(filenameNoExt,endTime)
+
+    def setMarkerData(self, filenameNoExt, endTime):
+
         self.m_ikTool.setModel(self.m_model)
         self.m_ikTool.setMarkerDataFileName(filenameNoExt+".trc")
         self.m_ikTool.setOutputMotionFileName(filenameNoExt+".mot")
@@ -262,7 +242,6 @@ class opensimKinematicFitting(object):
         prTime= self.m_ikTool.getPropertyByName("time_range")
 
         opensim.PropertyHelper().appendValueDouble(0.0, prTime)
-        endTime = (acq.GetLastFrame() - acq.GetFirstFrame())/acq.GetPointFrequency()
         opensim.PropertyHelper().appendValueDouble(endTime, prTime)
 
         # doesn t work
@@ -286,3 +265,37 @@ class opensimKinematicFitting(object):
     def run(self):
 
         self.m_ikTool.run()
+
+
+def runKinematicFitting(calibratedOsimFile,ikToolFile,ikTags,filenameNoExt,endTime,resultsDir,accuracy=1e-8):
+    """
+        Run the inverse kinematics of a trc file.
+
+        The calibrated model is loaded from its osim file, read only. Arguments are
+        strings and numbers, so the function can run in a worker process.
+
+        :Parameters:
+            - `calibratedOsimFile` (str) - full filename of the calibrated osim file
+            - `ikToolFile` (str) - full filename of the opensim inverse kinematic tool file
+            - `ikTags` (dict) - weight of the ik markers
+            - `filenameNoExt` (str) - full filename of the trc file, without extension. The motion file is written next to it
+            - `endTime` (double) - end time of the fitting
+            - `resultsDir` (str) - directory of the IK outputs. Each concurrent run needs its own directory
+            - `accuracy` (double) - accuracy of the kinematic fitter
+
+        :Return:
+            - `storage` (pyCGM2.Model.Opensim.osimStorage.Storage) - model marker locations
+    """
+    model = opensim.Model(str(calibratedOsimFile))
+    model.initSystem()
+
+    osimIK = opensimKinematicFitting(model,ikToolFile)
+    osimIK.setAccuracy(accuracy)
+    osimIK.setResultsDirectory(resultsDir)
+    for label in ikTags.keys():
+        osimIK.updateIKTask(label,ikTags[label])
+
+    osimIK.setMarkerData(filenameNoExt,endTime)
+    osimIK.run()
+
+    return osimStorage.Storage(resultsDir + "ik_model_marker_locations.sto")
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Reader and writers of opensim text files (.sto, .mot and .trc)
+
+Files are parsed and written at once with numpy. They don't need the opensim bindings.
+
+usage ::
+
+    storage = osimStorage.Storage("ik_model_marker_locations.sto")
+    values = storage.getMarkerValues("LASI",R_LAB_OSIM)
+
+    osimStorage.writeTrc("gait01.trc",labels,values,100.0)
+
+"""
+import os
+import numpy as np
+
+
+def readStorage(filename):
+    """
+        Read an opensim storage file
+
+        :Parameters:
+            - `filename` (str) - full filename of the .sto or .mot file
+
+        :Return:
+            - `header` (dict) - key-value items of the header
+            - `labels` (list) - column labels
+            - `values` (numpy.array(n,m)) - values of the m columns
+    """
+    with open(filename, "r") as f:
+        content = f.read()
+
+    lines = content.splitlines(True)
+    header = dict()
+    position = 0
+    for i,line in enumerate(lines):
+        position += len(line)
+        line = line.strip()
+        if line.lower() == "endheader":
+            break
+        if "=" in line:
+            key,value = line.split("=",1)
+            header[key.strip()] = value.strip()
+        elif line != "":
+            items = line.split(None,1)
+            header[items[0]] = items[1].strip() if len(items)==2 else ""
+    else:
+        raise Exception("[pyCGM2] storage file (%s) : no endheader" %(filename))
+
+    # column labels on the first non-empty line after the header
+    for j,line in enumerate(lines[i+1:]):
+        position += len(line)
+        if line.strip() != "":
+            labels = line.split()
+            break
+    else:
+        raise Exception("[pyCGM2] storage file (%s) : no column labels" %(filename))
+
+    # numpy.fromstring stops at the first unparsable token ( ex : -1.#IND). The parsed count is checked
+    nRows = header.get("nRows",header.get("datarows"))
+    nRows = int(nRows) if nRows is not None else len([line for line in lines[i+j+2:] if line.strip() != ""])
+    nColumns = header.get("nColumns",header.get("datacolumns"))
+    nColumns = int(nColumns) if nColumns is not None else len(labels)
+    if nColumns != len(labels):
+        raise Exception("[pyCGM2] storage file (%s) : %i column labels, %i columns expected" %(filename,len(labels),nColumns))
+
+    values = np.fromstring(content[position:], sep=" ")
+    if values.size != nRows*nColumns:
+        raise Exception("[pyCGM2] storage file (%s) : %i values parsed, %i expected (%i rows, %i columns)" %(filename,values.size,nRows*nColumns,nRows,nColumns))
+
+    return header, labels, values.reshape(nRows,nColumns)
+
+
+class Storage(object):
+    """
+        Columns of an opensim storage file
+    """
+    def __init__(self,filename):
+        """
+            :Parameters:
+                - `filename` (str) - full filename of the .sto or .mot file
+        """
+        self.m_filename = filename
+        self.m_header, self.m_labels, self.m_values = readStorage(filename)
+        self.m_index = dict((label,i) for i,label in enumerate(self.m_labels))
+
+    def getFrameNumber(self):
+        return self.m_values.shape[0]
+
+    def getTime(self):
+        return self.getColumns(["time"])[:,0]
+
+    def getColumnIndex(self,label):
+        """
+            return the index of a column
+
+            :Parameters:
+                - `label` (str) - column label
+        """
+        if label not in self.m_index:
+            raise Exception("[pyCGM2] column (%s) not found in the storage file (%s)" %(label,self.m_filename))
+        return self.m_index[label]
+
+    def getColumns(self,labels):
+        """
+            return the values ( numpy.array(n,len(labels))) of several columns
+
+            :Parameters:
+                - `labels` (list) - column labels
+        """
+        return self.m_values[:,[self.getColumnIndex(label) for label in labels]]
+
+    def getMarkerValues(self,label,R_LAB_OSIM):
+        """
+            return the trajectory of a marker in the lab coordinate system and in mm
+
+            :Parameters:
+                - `label` (str) - marker label ( columns label_tx, label_ty and label_tz)
+                - `R_LAB_OSIM` (numpy.array(3,3)) - rotation from the lab to the opensim coordinate system
+        """
+        values = self.getColumns([label+"_tx",label+"_ty",label+"_tz"])
+        return np.dot(values,R_LAB_OSIM)*1000.0
+
+
+def _formatRows(values,columnFormats):
+    # one formatting operation for the whole array. nan values are left empty
+    n = values.shape[0]
+    if n == 0:
+        return ""
+    rowFormat = "\t".join(columnFormats)+"\n"
+    return ((rowFormat*n) %tuple(values.ravel())).replace("nan","")
+
+
+def writeTrc(filename,labels,values,pointFrequency,firstFrame=1,units="mm"):
+    """
+        Write marker trajectories in a trc file. Time starts at 0.
+
+        :Parameters:
+            - `filename` (str) - full filename of the trc file
+            - `labels` (list) - marker labels
+            - `values` (numpy.array(n,m,3)) - trajectories of the m markers, *nan* where a marker is missing
+            - `pointFrequency` (double) - point frequency
+            - `firstFrame` (int) - number of the first frame
+            - `units` (str) - unit of the trajectories
+    """
+    n = values.shape[0]
+    m = len(labels)
+    if values.shape[1:] != (m,3):
+        raise Exception("[pyCGM2] trc export : values dimensions (%s) don t match the %i markers" %(str(values.shape),m))
+
+    header = "PathFileType\t4\t(X/Y/Z)\t%s\n" %(os.path.basename(filename))
+    header += "DataRate\tCameraRate\tNumFrames\tNumMarkers\tUnits\tOrigDataRate\tOrigDataStartFrame\tOrigNumFrames\n"
+    header += "%.2f\t%.2f\t%i\t%i\t%s\t%.2f\t%i\t%i\n" %(pointFrequency,pointFrequency,n,m,units,pointFrequency,firstFrame,n)
+    header += "Frame#\tTime\t" + "".join([label+"\t\t\t" for label in labels]) + "\n"
+    header += "\t\t" + "\t".join(["X%i\tY%i\tZ%i" %(i,i,i) for i in range(1,m+1)]) + "\n\n"
+
+    data = np.zeros((n,2+3*m))
+    data[:,0] = firstFrame + np.arange(0,n)
+    data[:,1] = np.arange(0,n)/float(pointFrequency)
+    data[:,2:] = values.reshape(n,3*m)
+
+    with open(filename,"w") as f:
+        f.write(header)
+        f.write(_formatRows(data,["%i","%.5f"]+["%.5f"]*(3*m)))
+
+
+def writeMot(filename,labels,values,time,name="pyCGM2",inDegrees=True):
+    """
+        Write columns in a mot file
+
+        :Parameters:
+            - `filename` (str) - full filename of the mot file
+            - `labels` (list) - column labels ( without time)
+            - `values` (numpy.array(n,m)) - values of the m columns
+            - `time` (numpy.array(n,)) - time of the rows
+            - `name` (str) - name written on the first line of the header
+            - `inDegrees` (bool) - angles in degrees
+    """
+    n = values.shape[0]
+    if values.shape[1] != len(labels) or len(time) != n:
+        raise Exception("[pyCGM2] mot export : values dimensions (%s) don t match labels or time" %(str(values.shape)))
+
+    header = "%s\nversion=1\nnRows=%i\nnColumns=%i\ninDegrees=%s\nendheader\n" %(name,n,len(labels)+1,"yes" if inDegrees else "no")
+    header += "\t".join(["time"]+list(labels)) + "\n"
+
+    data = np.concatenate((np.asarray(time,dtype=float).reshape(n,1),values),axis=1)
+
+    with open(filename,"w") as f:
+        f.write(header)
+        f.write(_formatRows(data,["%.8f"]*data.shape[1]))
@@ -83,18 +83,63 @@ class Bsp(object):
         #      obj.m_KineticPelvis = KineticSegment( obj.m_Pelvis, CentreOfMass, Bodymass*0.142, ...
         #                                            [I;I;I], NullSegment(), [0;0;0] );
 
-        mass = bodymass *  Bsp.TABLE[bspSegmentLabel]["mass"]/100.0
-        com = -1.0 * segmentLength *  Bsp.TABLE[bspSegmentLabel]["com"]/100.0 # com from Prox->dist but longitudinal is from Dist-> prox Generally
-        ml2 = mass * segmentLength*segmentLength
+        (mass,com,Ixx,Iyy,Izz) = Bsp.setCohortParameters(bspSegmentLabel,segmentLength, bodymass)
 
-        Ixx = ml2 * Bsp.TABLE[bspSegmentLabel]["inertia"][0] * Bsp.TABLE[bspSegmentLabel]["inertia"][0] / 10000.0;  # 10000 ( because mm*mm /100, 100 acociount for )
-        Iyy = ml2 * Bsp.TABLE[bspSegmentLabel]["inertia"][1] * Bsp.TABLE[bspSegmentLabel]["inertia"][1] / 10000.0;
-        Izz = ml2 * Bsp.TABLE[bspSegmentLabel]["inertia"][2] * Bsp.TABLE[bspSegmentLabel]["inertia"][2] / 10000.0;
+        return (mass[0],com[0],Ixx[0],Iyy[0],Izz[0])
 
+    @classmethod
+    def setCohortParameters(cls, bspSegmentLabel,segmentLengths, bodymasses):
+        """
+        Compute body parameter of a selected lower limb segment for a cohort
+
+        :Parameters:
+           - `bspSegmentLabel` (str) - segment label defined in the class object `TABLE`
+           - `segmentLengths` (numpy.array(m,)) - lengths of the segment
+           - `bodymasses` (numpy.array(m,)) - masses of the subjects
+
+        :Return:
+           - `mass` (numpy.array(m,)) - segment masses
+           - `com` (numpy.array(m,3)) - centres of mass in the segment coordinate system
+           - `Ixx`, `Iyy`, `Izz` (numpy.array(m,)) - principal moments of inertia
+        """
+        segmentLengths = np.atleast_1d(np.asarray(segmentLengths,dtype=float))
+        bodymasses = np.atleast_1d(np.asarray(bodymasses,dtype=float))
+
+        mass = bodymasses *  Bsp.TABLE[bspSegmentLabel]["mass"]/100.0
+        com = -1.0 * segmentLengths.reshape(-1,1) *  Bsp.TABLE[bspSegmentLabel]["com"]/100.0 # com from Prox->dist but longitudinal is from Dist-> prox Generally
+        ml2 = mass * segmentLengths*segmentLengths
+
+        inertia = ml2.reshape(-1,1) * Bsp.TABLE[bspSegmentLabel]["inertia"] * Bsp.TABLE[bspSegmentLabel]["inertia"] / 10000.0  # 10000 ( because mm*mm /100, 100 acociount for )
+
+        return (mass,com,inertia[:,0],inertia[:,1],inertia[:,2] )
+
+    @classmethod
+    def computeCohort(cls, bodymasses, segmentLengths):
+        """
+        Compute body segment parameters of a cohort
+
+        :Parameters:
+           - `bodymasses` (numpy.array(m,)) - masses of the subjects
+           - `segmentLengths` (dict) - columnar table of segment lengths ( segment label : numpy.array(m,)). ex: {"Left Thigh": ...}
 
-        return (mass,com,Ixx,Iyy,Izz )
+        :Return:
+           - `bsp` (dict) - by segment label, dictionnary with keys *mass* (numpy.array(m,)), *com* (numpy.array(m,3)) and *inertia* (numpy.array(m,3,3))
+        """
 
+        bsp = dict()
+        for segmentLabel in segmentLengths.keys():
+            for it in segmentLabel.split(): # split label along space
+                if it in Bsp.TABLE.keys():
+                    (mass,com,Ixx,Iyy,Izz)  = Bsp.setCohortParameters( it, segmentLengths[segmentLabel], bodymasses)
 
+                    inertia = np.zeros((mass.shape[0],3,3))
+                    inertia[:,0,0] = Ixx
+                    inertia[:,1,1] = Iyy
+                    inertia[:,2,2] = Izz
+
+                    bsp[segmentLabel] = {"mass" : mass, "com" : com, "inertia" : inertia}
+
+        return bsp
 
 
 
@@ -122,18 +167,21 @@ class Bsp(object):
 #        self.m_model.getSegment("Left Thigh").setInertiaTensor (np.array([[Ixx,0.0,0.0],[0.0,Iyy,0.0],[0.0,0.0,Izz]]))
 
 
-        # automatic method : check if segment Name is in keys of Bsp Table
+        # automatic method : check if segment Name is in keys of Bsp Table ( one-subject cohort)
+        segmentLengths = dict()
         for itSegment in self.m_model.m_segmentCollection:
-            nameDecompose = itSegment.name.split()
+            segmentLengths[itSegment.name] = np.array([itSegment.m_bsp["length"]])
 
-            for it in nameDecompose: # split label along space
-                if it in Bsp.TABLE.keys():
-                    length = self.m_model.getSegment(itSegment.name).m_bsp["length"]
-                    (mass,com,Ixx,Iyy,Izz)  = Bsp.setParameters( it, length, bodymass)
-                    if self.m_model.getSegment(itSegment.name).anatomicalFrame.static.getNode_byLabel("com"): # update com if defined during calibration.
-                        logging.debug("segment %s -- com already defined during calibration. " %(itSegment.name) )
-                        com = self.m_model.getSegment(itSegment.name).anatomicalFrame.static.getNode_byLabel("com").m_local
-
-                    self.m_model.getSegment(itSegment.name).setMass( mass)
-                    self.m_model.getSegment(itSegment.name).setComPosition (com)
-                    self.m_model.getSegment(itSegment.name).setInertiaTensor (np.array([[Ixx,0.0,0.0],[0.0,Iyy,0.0],[0.0,0.0,Izz]]))
+        bsp = Bsp.computeCohort(np.array([bodymass]),segmentLengths)
+
+        for itSegment in self.m_model.m_segmentCollection:
+            if itSegment.name in bsp:
+                mass = bsp[itSegment.name]["mass"][0]
+                com = bsp[itSegment.name]["com"][0]
+                if self.m_model.getSegment(itSegment.name).anatomicalFrame.static.getNode_byLabel("com"): # update com if defined during calibration.
+                    logging.debug("segment %s -- com already defined during calibration. " %(itSegment.name) )
+                    com = self.m_model.getSegment(itSegment.name).anatomicalFrame.static.getNode_byLabel("com").m_local
+
+                self.m_model.getSegment(itSegment.name).setMass( mass)
+                self.m_model.getSegment(itSegment.name).setComPosition (com)
+                self.m_model.getSegment(itSegment.name).setInertiaTensor (bsp[itSegment.name]["inertia"][0])
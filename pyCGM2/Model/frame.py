@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 import logging
+from collections import OrderedDict
 
 
 
@@ -76,6 +77,99 @@ def angleAxisFromQuaternion(Quaternion):
 
     return np.rad2deg(AngleAxis)
 
+def getQuaternionsFromMatrices(RotMats):
+    """
+        Calculates the quaternion representation of stacked rotation matrices
+        ( batched version of `getQuaternionFromMatrix`, Shoemake branches are selected with masks)
+
+       :Parameters:
+           - `RotMats` (numy.array(n,3,3)) - Rotation Matrices
+
+
+        :Return:
+            - `Quaternions` (numy.array(n,4)) - 4 components of the quaternions
+
+    """
+    RotMats = np.asarray(RotMats,dtype=float).reshape(-1,3,3)
+    n = RotMats.shape[0]
+
+    Quaternions = np.zeros((n,4))
+    Trace = np.trace(RotMats,axis1=1,axis2=2)
+
+    # positive trace
+    pos = Trace > 0
+    if pos.any():
+        R = RotMats[pos]
+        Root = np.sqrt( Trace[pos] + 1 )
+        Quaternions[pos,3] = 0.5 * Root
+        Root = 0.5 / Root
+        Quaternions[pos,0] = ( R[:,2,1] - R[:,1,2] ) * Root
+        Quaternions[pos,1] = ( R[:,0,2] - R[:,2,0] ) * Root
+        Quaternions[pos,2] = ( R[:,1,0] - R[:,0,1] ) * Root
+
+    # largest diagonal element
+    neg = ~pos
+    if neg.any():
+        R = RotMats[neg]
+        rows = np.arange(R.shape[0])
+        Next = np.array([ 1, 2, 0 ])
+
+        i = np.where(R[:,1,1] > R[:,0,0], 1, 0)
+        i = np.where(R[:,2,2] > R[rows,i,i], 2, i)
+        j = Next[i]
+        k = Next[j]
+
+        Root = np.sqrt( R[rows,i,i] - R[rows,j,j] - R[rows,k,k] + 1 )
+        Q = np.zeros((R.shape[0],4))
+        Q[rows,i] = 0.5 * Root
+        Root = 0.5 / Root
+        Q[:,3] = ( R[rows,k,j] - R[rows,j,k] ) * Root
+        Q[rows,j] = ( R[rows,j,i] + R[rows,i,j] ) * Root
+        Q[rows,k] = ( R[rows,k,i] + R[rows,i,k] ) * Root
+        Quaternions[neg] = Q
+
+    return Quaternions / np.linalg.norm(Quaternions,axis=1).reshape(n,1)
+
+def angleAxisFromQuaternions(Quaternions):
+    """
+        Calculates the AngleAxis representation of stacked quaternions
+        ( batched version of `angleAxisFromQuaternion`)
+
+       :Parameters:
+           - `Quaternions` (numy.array(n,4)) - 4 components of the quaternions
+
+
+        :Return:
+            - `AngleAxis` (numy.array(n,3)) - angle Axis in deg
+
+    """
+    Quaternions = np.asarray(Quaternions,dtype=float).reshape(-1,4)
+
+    imag = Quaternions[:,:-1]
+    real = Quaternions[:,3]
+
+    lenQ = np.linalg.norm(imag,axis=1)
+    small = lenQ < 100*np.spacing(np.single(1))
+
+    scale = np.ones(lenQ.shape)
+    scale[~small] = 2*np.arctan2( lenQ[~small], real[~small] ) / lenQ[~small]
+
+    return np.rad2deg(imag * scale.reshape(-1,1))
+
+def angleAxisFromMatrices(RotMats):
+    """
+        Calculates the AngleAxis representation of stacked rotation matrices
+
+       :Parameters:
+           - `RotMats` (numy.array(n,3,3)) - Rotation Matrices
+
+
+        :Return:
+            - `AngleAxis` (numy.array(n,3)) - angle Axis in deg
+
+    """
+    return angleAxisFromQuaternions(getQuaternionsFromMatrices(RotMats))
+
 def setFrameData(a1,a2,sequence):
     """
         set Frame of a ccordinate system accoring two vector and a sequence
@@ -239,6 +333,13 @@ class Frame(object):
 
 
         self._nodes=[]
+        self._nodeIndex=OrderedDict() # node label -> index in the node list
+
+    def __setstate__(self,state):
+        self.__dict__.update(state)
+        # frames pickled without node index
+        if "_nodeIndex" not in state:
+            self._nodeIndex=OrderedDict((node.m_name[:-5],i) for i,node in enumerate(self._nodes))
 
     def getRotation(self):
         """
@@ -330,15 +431,8 @@ class Frame(object):
 
         logging.debug("new node (%s) added " % nodeLabel)
 
-        isFind=False
-        i=0
-        for nodeIt in self._nodes:
-            if str(nodeLabel+"_node") == nodeIt.m_name:
-                isFind=True
-                index = i
-            i+=1
-
-        if isFind:
+        if nodeLabel in self._nodeIndex:
+            index = self._nodeIndex[nodeLabel]
             if positionType == "Global":
                 self._nodes[index].m_global = position
                 self._nodes[index].computeLocal(self._matrixRot,self._translation)
@@ -364,6 +458,7 @@ class Frame(object):
                 node.computeGlobal(self._matrixRot,self._translation)
             else :
                 raise Exception("positionType not Known (Global or Local")
+            self._nodeIndex[nodeLabel] = len(self._nodes)
             self._nodes.append(node)
 
     def getNode_byIndex(self,index):
@@ -387,12 +482,8 @@ class Frame(object):
             - `na` (pyCGM2.pyCGM2.Model.CGM2.Frame.Node) - a node instance
         """
 
-        for nodeIt in self._nodes:
-            if str(label+"_node") == nodeIt.m_name:
-                logging.debug( " target label ( %s) - label find (%s) " %(label,nodeIt.m_name) )
-                return nodeIt
-            #else:
-            #    raise Exception("Node label (%s) not found " %(label))
+        if label in self._nodeIndex:
+            return self._nodes[self._nodeIndex[label]]
 
         return False
 
@@ -404,11 +495,11 @@ class Frame(object):
             Display all node labels
 
         """
-        labels=list()
-        for nodeIt in self._nodes:
-            labels.append(nodeIt.m_name[:-5])
+        labels=list(self._nodeIndex.keys())
 
-            if display: print nodeIt.m_name
+        if display:
+            for nodeIt in self._nodes:
+                print nodeIt.m_name
 
         return labels
 
@@ -417,6 +508,7 @@ class Frame(object):
             erase all nodes
         """
         self._nodes=[]
+        self._nodeIndex=OrderedDict()
 
     def getNodes(self):
 
@@ -424,12 +516,7 @@ class Frame(object):
 
     def isNodeExist(self,nodeLabel):
 
-        flag = False
-        for nodeIt in self._nodes:
-            if str(nodeLabel+"_node") == nodeIt.m_name:
-                logging.debug( " target label ( %s) - label find (%s) " %(nodeLabel,nodeIt.m_name) )
-                flag = True
-                break
+        flag = nodeLabel in self._nodeIndex
 
         if not flag:
             logging.debug( " node label ( %s) doesn t exist " %(nodeLabel))
@@ -439,14 +526,8 @@ class Frame(object):
 
     def getNodeIndex(self,nodeLabel):
 
-        if self.isNodeExist(nodeLabel):
-
-            for nodeIt in self._nodes:
-                if str(nodeLabel+"_node") == nodeIt.m_name:
-                    index = i
-                    break
-                i+=1
-            return i
+        if nodeLabel in self._nodeIndex:
+            return self._nodeIndex[nodeLabel]
         else:
             raise Exception("[pyCGM2] node label doesn t exist" )
 
@@ -470,12 +551,32 @@ class Frame(object):
         desc = self._nodes[indexToCopy].m_desc
 
         if self.isNodeExist(nodeLabel):
-            index =  self.getNodeIndex(nodeToCopy)
+            index =  self.getNodeIndex(nodeLabel)
             self._nodes[index].m_global = globalArray
             self._nodes[index].m_local = localArray
             self._nodes[index].m_desc = desc
         else:
-            self.addNode(nodeLabel,globalArray, position = "Global",desc =  desc)
+            self.addNode(nodeLabel,globalArray, positionType = "Global",desc =  desc)
+
+    def getLocalPositions(self,nodeLabels=None):
+        """
+            Return local positions of nodes as a compact array
+
+            :Parameters:
+                - `nodeLabels` (list) - node labels. All nodes by default
+
+            :Return:
+                - `na` (np.array(m,3)) - local positions, in the order of the labels
+        """
+        if nodeLabels is None:
+            nodes = self._nodes
+        else:
+            nodes = [self._nodes[self.getNodeIndex(label)] for label in nodeLabels]
+
+        positions = np.zeros((len(nodes),3))
+        for i,node in enumerate(nodes):
+            positions[i,:] = np.asarray(node.m_local).reshape(3)
+        return positions
 
     def getGlobalPosition(self,nodeLabel):
 
@@ -12,6 +12,7 @@ from pyCGM2.Model import motion
 from  pyCGM2.Tools import  btkTools
 from pyCGM2.Math import  derivation
 from  pyCGM2.Signal import signal_processing
+from pyCGM2.ForcePlates import groundReactionWrenchs
 
 
 class ClinicalDescriptor(object):
@@ -275,9 +276,10 @@ class Model(object):
 
         for seg in self.m_segmentCollection:
 
+            nodeTrajs = seg.getReferential(TechnicalFrameLabel).getNodeTrajectories(seg.m_tracking_markers)
             for marker in seg.m_tracking_markers:
 
-                nodeTraj= seg.getReferential(TechnicalFrameLabel).getNodeTrajectory(marker)
+                nodeTraj= nodeTrajs[marker]
                 markersTraj =acq.GetPoint(marker).GetValues()
 
                 markerTrajectoryX=np.array( [ markersTraj[:,0], nodeTraj[:,1], nodeTraj[:,2]]).T
@@ -579,12 +581,43 @@ class Referential(object):
         """
 
         node=self.static.getNode_byLabel(label)
-        nFrames=len(self.motion)
-        pt=np.zeros((nFrames,3))
-        for i in range(0,nFrames):
-            pt[i,:]=np.dot(self.motion[i].getRotation(),node.m_local)+ self.motion[i].getTranslation()
+        R,t = self.getMotionArrays()
 
-        return pt
+        return np.dot(R,node.m_local) + t
+
+    def getNodeTrajectories(self,labels=None):
+        """
+            Get trajectories of several nodes in one pass
+
+            :Parameters:
+                - `labels` (list) - labels of the desired nodes. All nodes by default
+
+            :Return:
+                - `trajectories` (dict) - node label : numpy.array(:,3) values of the global point trajectory
+
+        """
+        if labels is None:
+            labels = self.static.getNodeLabels(display=False)
+
+        local = self.static.getLocalPositions(labels)
+        R,t = self.getMotionArrays()
+        values = np.einsum("nij,mj->mni",R,local) + t
+
+        return dict(zip(labels,values))
+
+    def getMotionArrays(self):
+        """
+            Get rotations and translations of the motion frames
+
+            :Return:
+                - `R` (numpy.array(n,3,3)) - stacked rotations
+                - `t` (numpy.array(n,3)) - stacked translations
+
+        """
+        R = np.array([it.getRotation() for it in self.motion])
+        t = np.array([it.getTranslation() for it in self.motion])
+
+        return R,t
 
 
 
@@ -754,7 +787,9 @@ class Segment(object):
 
     def downSampleExternalDeviceWrenchs(self,appf):
         """
-            Downsample external device wrenchs
+            Downsample external device wrenchs ( anti-aliased decimation)
+
+            .. note:: wrenchs connected from `groundReactionWrenchs` are already at the point rate
 
             :Parameters:
                 - `appf` (int) - analog point per frame
@@ -762,16 +797,12 @@ class Segment(object):
         if self.isExternalDeviceWrenchsConnected():
 
             for wrIt in  self.m_externalDeviceWrenchs:
-                forceValues = wrIt.GetForce().GetValues()
-                forceValues_ds= forceValues[::appf]
+                forceValues_ds,momentValues_ds,positionValues_ds = groundReactionWrenchs.decimateWrench(wrIt.GetForce().GetValues(),
+                                                                                                      wrIt.GetMoment().GetValues(),
+                                                                                                      wrIt.GetPosition().GetValues(),
+                                                                                                      appf)
                 wrIt.GetForce().SetValues(forceValues_ds)
-
-                momentValues = wrIt.GetMoment().GetValues()
-                momentValues_ds= momentValues[::appf]
                 wrIt.GetMoment().SetValues(momentValues_ds)
-
-                positionValues = wrIt.GetPosition().GetValues()
-                positionValues_ds= positionValues[::appf]
                 wrIt.GetPosition().SetValues(positionValues_ds)
 
 
@@ -1001,30 +1032,27 @@ class Segment(object):
         frameNumber = len(self.anatomicalFrame.motion)
         AngularVelocValues = np.zeros((frameNumber,3))
 
-        # pig method0
-        if method == "pig":
-            for i in range(1,frameNumber-1):
-                omegaX=(np.dot( self.anatomicalFrame.motion[i+1].m_axisY,
-                                          self.anatomicalFrame.motion[i-1].m_axisZ))/(2*1/sampleFrequency)
-
-                omegaY=(np.dot( self.anatomicalFrame.motion[i+1].m_axisZ,
-                                          self.anatomicalFrame.motion[i-1].m_axisX))/(2*1/sampleFrequency)
+        if frameNumber < 3:
+            return AngularVelocValues
 
-                omegaZ=(np.dot( self.anatomicalFrame.motion[i+1].m_axisX,
-                                self.anatomicalFrame.motion[i-1].m_axisY))/(2*1/sampleFrequency)
+        R = self.anatomicalFrame.getMotionArrays()[0]
 
-                omega = np.array([[omegaX,omegaY,omegaZ]]).transpose()
+        # pig method0
+        if method == "pig":
+            omega = np.zeros((frameNumber-2,3))
+            omega[:,0] = np.einsum("ni,ni->n",R[2:,:,1],R[:-2,:,2])/(2*1/sampleFrequency)
+            omega[:,1] = np.einsum("ni,ni->n",R[2:,:,2],R[:-2,:,0])/(2*1/sampleFrequency)
+            omega[:,2] = np.einsum("ni,ni->n",R[2:,:,0],R[:-2,:,1])/(2*1/sampleFrequency)
 
-                AngularVelocValues[i,:] = np.dot(self.anatomicalFrame.motion[i].getRotation(),  omega).transpose()
+            AngularVelocValues[1:-1,:] = np.einsum("nij,nj->ni",R[1:-1],omega)
 
         # conventional method
         if method == "conventional":
-            rdot = derivation.matrixFirstDerivation(self.anatomicalFrame.motion, sampleFrequency)
-            for i in range(1,frameNumber-1):
-                tmp =np.dot(rdot[i],self.anatomicalFrame.motion[i].getRotation().transpose())
-                AngularVelocValues[i,0]=tmp[2,1]
-                AngularVelocValues[i,1]=tmp[0,2]
-                AngularVelocValues[i,2]=tmp[1,0]
+            rdot = (R[2:]-R[:-2])/(2*1/sampleFrequency)
+            tmp = np.einsum("nij,nkj->nik",rdot,R[1:-1])
+            AngularVelocValues[1:-1,0]=tmp[:,2,1]
+            AngularVelocValues[1:-1,1]=tmp[:,0,2]
+            AngularVelocValues[1:-1,2]=tmp[:,1,0]
 
         return AngularVelocValues
 
@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 import logging
-import matplotlib.pyplot as plt
-from scipy.optimize import least_squares
 
 
 import pyCGM2
@@ -65,199 +63,235 @@ def chord (offset,A1,A2,A3,beta=0.0, epsilon =0.001):
 
         :Parameters:
             - `offset` (double) - offset to apply from the base point
-            - `I` (double) - base point
-            - `J` (double) - top point
-            - `K` (double) - lateral point
+            - `I` (numpy.array(3,) or numpy.array(n,3)) - base point
+            - `J` (numpy.array(3,) or numpy.array(n,3)) - top point
+            - `K` (numpy.array(3,) or numpy.array(n,3)) - lateral point
             - `beta` (double) - angle offset
 
         .. note:: For locating Knee Joint centre, native CGM uses I=KNE, J=HJC and K=THI and offset = knee radius
 
+        .. note:: points are broadcast against each other ( ex: a static HJC with a KNE trajectory). The beta iteration runs on all frames at once
+
         **Reference**
 
         Kabada, M., Ramakrishan, H., & Wooten, M. (1990). Measurement of lower extremity kinematics during level walking. Journal of Orthopaedic Research, 8, 383–392.
 
     """
 
-    if (len(A1) != len(A2) or len(A1) != len(A3) or len(A2) != len(A3)):
-        raise exception ("length of input argument of chord function different")
-
-    arrayDim = len(A1.shape) # si 1 = array1d si 2 = array2d
-
-    if arrayDim == 2:
-        nrow = len(A1)
-        returnValues = np.zeros((nrow,3))
-    else:
-        nrow =1
-        returnValues = np.zeros((1,3))
-
-
-    for i in range(0,nrow):
-        I = A1[i,:] if arrayDim==2 else A1
-        J = A2[i,:] if arrayDim==2 else A2
-        K = A3[i,:] if arrayDim==2 else A3
-
-        if beta == 0.0:
-            y=np.divide((J-I),np.linalg.norm(J-I))
-            x=np.cross(y,K-I)
-            x=np.divide((x),np.linalg.norm(x))
-            z=np.cross(x,y)
-
-            matR=np.array([x,y,z]).T
-            ori=(J+I)/2.0
+    arrayDim = max(len(np.shape(A1)),len(np.shape(A2)),len(np.shape(A3))) # si 1 = array1d si 2 = array2d
 
-            d=np.linalg.norm(I-J)
-            theta=np.arcsin(offset/d)*2.0
-            v_r=np.array([0, -d/2.0, 0])
+    try:
+        I,J,K = np.broadcast_arrays(np.atleast_2d(A1).astype(float),np.atleast_2d(A2).astype(float),np.atleast_2d(A3).astype(float))
+    except ValueError:
+        raise Exception ("[pyCGM2] length of input argument of chord function different")
 
-            rot=np.array([[1,0,0],[0,np.cos(theta),-1.0*np.sin(theta)],[0,np.sin(theta),np.cos(theta)] ])
+    # chord with a null beta
+    d = np.linalg.norm(J-I,axis=1).reshape(-1,1)
+    y = (J-I)/d
+    x = np.cross(y,K-I)
+    x = x/np.linalg.norm(x,axis=1).reshape(-1,1)
+    z = np.cross(x,y)
 
-            P = np.dot(np.dot(matR,rot),v_r)+ori
+    theta = np.arcsin(offset/d)*2.0
 
-        else:
-
-            A=J
-            B=I
-            C=K
-            L=offset
-
-            eps =  epsilon
-
-            AB = np.linalg.norm(A-B)
-            alpha = np.arcsin(L/AB)
-            AO = np.sqrt(AB*AB-L*L*(1+np.cos(alpha)*np.cos(alpha)))
+    # P = [x,y,z]*rot(theta)*[0,-d/2,0] + (J+I)/2
+    P = -d/2.0*np.cos(theta)*y - d/2.0*np.sin(theta)*z + (J+I)/2.0
 
-            # chord avec beta nul
-            #P = chord(L,B,A,C,beta=0.0) # attention ma methode . attention au arg input
+    if beta != 0.0:
 
-            y=np.divide((J-I),np.linalg.norm(J-I))
-            x=np.cross(y,K-I)
-            x=np.divide((x),np.linalg.norm(x))
-            z=np.cross(x,y)
+        A=J
+        B=I
+        C=K
+        L=offset
 
-            matR=np.array([x,y,z]).T
-            ori=(J+I)/2.0
+        AB = d
+        alpha = np.arcsin(L/AB)
+        AO = np.sqrt(AB*AB-L*L*(1+np.cos(alpha)*np.cos(alpha)))
 
-            d=np.linalg.norm(I-J)
-            theta=np.arcsin(offset/d)*2.0
-            v_r=np.array([0, -d/2.0, 0])
+        # define P research circle in T plan
+        n = (A-B)/AB
+        O = A - n*AO
+        r = L*np.cos(alpha)
 
-            rot=np.array([[1,0,0],[0,np.cos(theta),-1.0*np.sin(theta)],[0,np.sin(theta),np.cos(theta)] ])
+        # build segment
+        Z = n/np.linalg.norm(n,axis=1).reshape(-1,1)
+        Y = np.cross(Z,P-O)
+        Y = Y/np.linalg.norm(Y,axis=1).reshape(-1,1)
+        X = np.cross(Y,Z)
+        X = X/np.linalg.norm(X,axis=1).reshape(-1,1)
 
+        nrow = I.shape[0]
+        Salpha = np.zeros(nrow)
+        alphaincr = beta*np.ones(nrow) # in degree
+        diffBeta = np.abs(beta)*np.ones(nrow)
+        count = np.zeros(nrow,dtype=int)
 
-            P= np.dot(np.dot(matR,rot),v_r)+ori
-            # fin chord 0
+        active = diffBeta > epsilon
+        while np.any(active):
+            if np.any(count > 100):
+                raise Exception("count boundary of Chord achieve")
 
+            idx = np.where(active)[0]
 
-            Salpha = 0
-            diffBeta = np.abs(beta)
-            alphaincr = beta # in degree
+            count[idx] += 1
+            idiff = diffBeta[idx]
 
+            Salpha[idx] = Salpha[idx] + alphaincr[idx]
+            Salpharad = (Salpha[idx] * np.pi / 180.0).reshape(-1,1)
+            P[idx] = O[idx] + r[idx]*np.cos(Salpharad)*X[idx] + r[idx]*np.sin(Salpharad)*Y[idx]
 
-            # define P research circle in T plan
-            n = np.divide((A-B),AB)
-            O = A - np.dot(n, AO)
-            r = L*np.cos(alpha) #OK
+            nBone = A[idx]-P[idx]
+            ProjC = np.cross(nBone,np.cross(C[idx]-P[idx],nBone))
+            ProjB = np.cross(nBone,np.cross(B[idx]-P[idx],nBone))
 
+            sens = np.einsum("ij,ij->i",np.cross(ProjC,ProjB),nBone)
+            cosBeta = np.einsum("ij,ij->i",ProjC,ProjB) / (np.linalg.norm(ProjC,axis=1)*np.linalg.norm(ProjB,axis=1))
+            with np.errstate(invalid="ignore"):
+                Betai = sens/np.abs(sens) * np.arccos(cosBeta)*180.0/np.pi
 
-            # build segment
-            #T = BuildSegment(O,n,P-O,'zyx');
-            Z=np.divide(n,np.linalg.norm(n))
-            Y=np.divide(np.cross(Z,P-O),np.linalg.norm(np.cross(Z,P-O)))
-            X=np.divide(np.cross(Y,Z),np.linalg.norm(np.cross(Y,Z)))
-            Origin= O
+            diffBeta[idx] = np.abs(beta - Betai)
 
-            # erreur ici, il manque les norm
-            T=np.array([[ X[0],Y[0],Z[0],Origin[0] ],
-                        [ X[1],Y[1],Z[1],Origin[1] ],
-                        [ X[2],Y[2],Z[2],Origin[2] ],
-                        [    0,   0,   0,       1.0  ]])
+            # diverging : reverse the increment ( halve it after the first iteration)
+            with np.errstate(invalid="ignore"):
+                diverging = (diffBeta[idx] - idiff) > 0
+            first = idx[np.logical_and(diverging, count[idx] == 1)]
+            others = idx[np.logical_and(diverging, count[idx] != 1)]
 
-            count = 0
-            while diffBeta > eps or count > 100:
-                if count > 100:
-                    raise Exception("count boundary of Chord achieve")
+            Salpha[first] = Salpha[first] - alphaincr[first]
+            alphaincr[first] = -alphaincr[first]
+            alphaincr[others] = -alphaincr[others] / 2.0
 
+            with np.errstate(invalid="ignore"):
+                active = diffBeta > epsilon
 
-                count = count + 1
-                idiff = diffBeta
+        if np.any(count > 100):
+            raise Exception("count boundary of Chord achieve")
 
-                Salpha = Salpha + alphaincr
-                Salpharad = Salpha * np.pi / 180.0
-                Pplan = np.array([  [r*np.cos(Salpharad)],
-                                    [ r*np.sin(Salpharad)],
-                                     [0],
-                                    [1]])
-                P = np.dot(T,Pplan)
-
-                P = P[0:3,0]
-                nBone = A-P
-
-                ProjC = np.cross(nBone,np.cross(C-P,nBone))
-                ProjB = np.cross(nBone,np.cross(B-P,nBone))
+    if arrayDim ==1:
+        out = P[0,:]
+    else:
+        out = P
 
+    return out
 
-                sens = np.dot(np.cross(ProjC,ProjB).T,nBone)
+def midPoint(acq,lateralMarkerLabel,medialMarkerLabel,offset=0):
 
+    lateral = acq.GetPoint(lateralMarkerLabel).GetValues()
+    medial = acq.GetPoint(medialMarkerLabel).GetValues()
 
-                Betai = np.divide(sens,np.linalg.norm(sens))*np.arccos(np.divide((np.dot(ProjC.T,ProjB)),(np.linalg.norm(ProjC)*np.linalg.norm(ProjB))))*180.0/np.pi
+    if offset !=0:
+        v = medial-lateral
+        v = v/np.linalg.norm(v,axis=1).reshape(-1,1)
 
-                diffBeta = np.abs(beta - Betai)
+        midvalues = lateral + (offset)*v
+    else:
+        midvalues = (lateral + medial)/2.0
 
-                if (diffBeta - idiff) > 0:
-                    if count == 1:
-                        Salpha = Salpha - alphaincr
-                        alphaincr = -alphaincr
-                    else:
-                        alphaincr = -alphaincr / 2.0;
+    return midvalues
 
-        returnValues[i,:]=P
+def kadLateralCondyle(KAX,KD1,KD2,side,distSkin=0):
+    """
+        Location of the lateral condyle from the Knee Alignment Device markers
 
-    if arrayDim ==1:
-        out = returnValues[0,:]
-    else:
-        out = returnValues
+        :Parameters:
+            - `KAX` (numpy.array(n,3)) - KAX marker trajectory
+            - `KD1` (numpy.array(n,3)) - KD1 marker trajectory
+            - `KD2` (numpy.array(n,3)) - KD2 marker trajectory
+            - `side` (str) - body side ( left or right)
+            - `distSkin` (double) - distance from the skin
+
+        :Return:
+            - `KNE` (numpy.array(n,3)) - lateral condyle
+            - `KAXO` (numpy.array(n,3)) - unit vector from KAX to the lateral condyle
+    """
 
-    return out
+    dist = np.array([np.linalg.norm(KAX-KD1,axis=1), np.linalg.norm(KAX-KD2,axis=1),np.linalg.norm(KD1-KD2,axis=1)] )
+    dist =  dist / np.sqrt(2)
+    meanDist = np.mean(dist,axis=0).reshape(-1,1)
 
-def midPoint(acq,lateralMarkerLabel,medialMarkerLabel,offset=0):
+    n = np.cross(KD2-KD1 , KAX-KD1)
+    n = n/np.linalg.norm(n,axis=1).reshape(-1,1)
+    if side == "right":
+        n=-n # look out the negative sign
 
-    midvalues = np.zeros((acq.GetPointFrameNumber(),3))
+    I = (KD1+KAX)/2
+    PP1 = 2/3.0*(I-KD2)+KD2
+    O = PP1 - n*np.sqrt(3)*meanDist/3.0
+    KAXO = (O-KAX)/np.linalg.norm(O-KAX,axis=1).reshape(-1,1)
 
-    for i in range(0,acq.GetPointFrameNumber()):
-        lateral = acq.GetPoint(lateralMarkerLabel).GetValues()[i,:]
-        medial = acq.GetPoint(medialMarkerLabel).GetValues()[i,:]
+    return O + KAXO * distSkin, KAXO
 
-        if offset !=0:
-            v = medial-lateral
-            v=v/np.linalg.norm(v)
+def _selectFrames(nFrames,indexFirstFrame,indexLastFrame):
+    """ frame indexes of a motion between  optional first and last frames
+    """
+    start = indexFirstFrame if indexFirstFrame else 0
+    end = indexLastFrame+1 if indexLastFrame else None
+    return range(0,nFrames)[start:end]
 
-            midvalues[i,:] = lateral + (offset)*v
+def _motionArrays(motionRef,frames):
+    """ stacked rotations (n,3,3) and translations (n,3) of a motion
+    """
+    R = np.array([motionRef[f].getRotation() for f in frames])
+    t = np.array([motionRef[f].getTranslation() for f in frames])
+    return R,t
+
+def _angularExcursionFrames(Rrelative, angularStep):
+    """ indexes of frames spaced by an angular excursion (deg) of the relative rotation.
+        A frame is kept when its rotation from the last kept frame exceeds the angular step.
+        Frames without motion ( static periods) are skipped
+    """
+    # cosine of the angular step : angle(Ra,Rb) > step <=> trace(Ra^T.Rb) < 1+2cos(step)
+    traceLimit = 1.0 + 2.0*np.cos(np.deg2rad(angularStep))
+
+    # forward scan in chunks. The chunk doubles until the next crossing, so frames are visited about once
+    nFrames = Rrelative.shape[0]
+    selection = [0]
+    start = 1
+    chunk = 8
+    while start < nFrames:
+        end = min(start+chunk,nFrames)
+        traces = np.einsum("ji,nji->n",Rrelative[selection[-1]],Rrelative[start:end])
+        beyond = np.where(traces < traceLimit)[0]
+        if beyond.size == 0:
+            start = end
+            chunk = 2*chunk
         else:
-            midvalues[i,:] = (lateral + medial)/2.0
-
-    return midvalues
-
-def calibration2Dof(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame,jointRange,sequence="YXZ",index=1,flexInd=0):
+            selection.append(start+beyond[0])
+            start = selection[-1]+1
+            chunk = 8
 
-    # onjective function : minimize variance of the knee varus valgus angle
-    def objFun(x, proxMotionRef, distMotionRef,indexFirstFrame,indexLastFrame, sequence,index,jointRange):
-        #nFrames= len(proxMotionRef)
-        frames0 = range(0,len(proxMotionRef))
+    return np.array(selection,dtype=int)
 
-        if indexFirstFrame and indexLastFrame:
-            frames = frames0[indexFirstFrame:indexLastFrame+1]
+def calibration2Dof(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame,jointRange,sequence="YXZ",index=1,flexInd=0, bounds=(-90.0,90.0)):
+    """
+        Find the rotation offset (deg) about the Z-axis of the proximal referential which minimizes
+        the variance of a joint angle ( ex : knee varus-valgus)
 
-        elif  not indexFirstFrame and indexLastFrame:
-            frames = frames0[:indexLastFrame+1]
+        :Parameters:
+            - `proxMotionRef` (list of Frame) - motion of the proximal referential
+            - `distMotionRef` (list of Frame) - motion of the distal referential
+            - `indexFirstFrame` (int) - start frame
+            - `indexLastFrame` (int) - end frame
+            - `jointRange` (list) - flexion range (deg) of the included frames. None for all frames
+            - `sequence` (str) - euler sequence
+            - `index` (int) - index of the angle which variance is minimized
+            - `flexInd` (int) - index of the flexion angle
+            - `bounds` (tuple) - search interval of the offset (deg)
+
+        .. note:: the relative rotations are stacked once. Every evaluation of the objective only applies
+            the Z-rotation to the stack and runs a stacked Euler decomposition.
+    """
 
-        elif  indexFirstFrame and not indexLastFrame:
-            frames = frames0[indexFirstFrame:]
+    frames = _selectFrames(len(proxMotionRef),indexFirstFrame,indexLastFrame)
 
-        else:
-            frames = frames0
+    Rprox,tprox = _motionArrays(proxMotionRef,frames)
+    Rdist,tdist = _motionArrays(distMotionRef,frames)
 
-        nFrames = len(frames)
+    # Rrelative = (Rprox*rotZ).T * Rdist = rotZ.T * (Rprox.T * Rdist)
+    Rrelative0 = np.einsum("nji,njk->nik",Rprox,Rdist)
 
+    # onjective function : minimize variance of the knee varus valgus angle
+    def objFun(x):
         angle=np.deg2rad(x)
         rotZ = np.eye(3,3)
         rotZ[0,0] = np.cos(angle)
@@ -265,71 +299,40 @@ def calibration2Dof(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame,j
         rotZ[1,0] = np.sin(angle)
         rotZ[1,1] = np.cos(angle)
 
-        jointValues = np.zeros((nFrames,3))
-
-        i=0
-        for f in frames:
-            Rprox = np.dot(proxMotionRef[f].getRotation(),rotZ)
-            Rdist = distMotionRef[f].getRotation()
-
-            Rrelative= np.dot(Rprox.T, Rdist)
-
-            if sequence == "XYZ":
-                Euler1,Euler2,Euler3 = euler.euler_xyz(Rrelative)
-            elif sequence == "XZY":
-                Euler1,Euler2,Euler3 = euler.euler_xzy(Rrelative)
-            elif sequence == "YXZ":
-                Euler1,Euler2,Euler3 = euler.euler_yxz(Rrelative)
-            elif sequence == "YZX":
-                Euler1,Euler2,Euler3 = euler.euler_yzx(Rrelative)
-            elif sequence == "ZXY":
-                Euler1,Euler2,Euler3 = euler.euler_zxy(Rrelative)
-            elif sequence == "ZYX":
-                Euler1,Euler2,Euler3 = euler.euler_zyx(Rrelative)
-            else:
-                raise Exception("[pyCGM2] joint sequence unknown ")
-
-            jointValues[i,0] = Euler1
-            jointValues[i,1] = Euler2
-            jointValues[i,2] = Euler3
-            i+=1
+        jointValues = euler.euler_stack(np.einsum("ji,njk->nik",rotZ,Rrelative0),sequence)
 
         if  jointRange is None:
-            variance = np.var(jointValues[:,index])
+            return np.var(jointValues[:,index])
         else:
             flexExt = jointValues[:,flexInd]
-            indexes = np.where(np.logical_and(flexExt>=np.deg2rad(jointRange[0]), flexExt<=np.deg2rad(jointRange[1])))[0].tolist()
+            indexes = np.where(np.logical_and(flexExt>=np.deg2rad(jointRange[0]), flexExt<=np.deg2rad(jointRange[1])))[0]
 
-            if indexes == []:
+            if indexes.shape[0] == 0:
                 raise Exception ("[pyCGM2]. Calibration2-dof : There is no frames included in inputed joint limits")
 
-            varVal = jointValues[:,index]
-            varValExtract = varVal[indexes]
-
-            variance = np.var(varValExtract)
-
+            return np.var(jointValues[indexes,index])
 
+    from scipy.optimize import minimize_scalar
+    res = minimize_scalar(objFun, bounds=bounds, method="bounded", options={"xatol":1e-6})
 
-        return variance
+    return res.x
 
-    x0 = 0.0 # deg
-    res = least_squares(objFun, x0, args=(proxMotionRef, distMotionRef,indexFirstFrame,indexLastFrame,sequence,index,jointRange), verbose=2)
 
-    return res.x[0]
 
 
-
-
-def saraCalibration(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame, gap = 100, method = "1"):
+def saraCalibration(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame, gap = 100, method = "1", angularStep=None):
     """
 
-        Computation of the hip joint center position from Harrington's regressions.
+        Computation of a functional axis of rotation with the Symmetrical Axis of Rotation Approach (SARA).
 
         :Parameters:
-            - `proxMotionRef` (list of numpy.array(3,3)) - motion of the proximal referential
-            - `distMotionRef` (list of numpy.array(3,3)) - motion of the distal referential
+            - `proxMotionRef` (list of Frame) - motion of the proximal referential
+            - `distMotionRef` (list of Frame) - motion of the distal referential
+            - `indexFirstFrame` (int) - start frame
+            - `indexLastFrame` (int) - end frame
             - `gap` (double) - distance in mm for positionning an axis limit
-            - `method` (int) - affect the objective function (see Ehrig et al.).
+            - `method` (str) - "1" : svd of the (3n,6) system.  "2" : normal equations ( 6x6 accumulation, suited to long trials)
+            - `angularStep` (double) - if not None, only frames spaced by this angular excursion (deg) of the relative rotation are used
 
         :Returns:
             - `prox_origin` (np.array(3)) - position of the origin in the proximal referential
@@ -351,33 +354,26 @@ def saraCalibration(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame,
         Ehrig, R., Taylor, W. R., Duda, G., & Heller, M. (2007). A survey of formal methods for determining functional joint axes. Journal of Biomechanics, 40(10), 2150–7.
 
     """
-    frames0 = range(0,len(proxMotionRef))
+    frames = _selectFrames(len(proxMotionRef),indexFirstFrame,indexLastFrame)
 
-    if indexFirstFrame and indexLastFrame:
-        frames = frames0[indexFirstFrame:indexLastFrame+1]
+    Rprox,tprox = _motionArrays(proxMotionRef,frames)
+    Rdist,tdist = _motionArrays(distMotionRef,frames)
 
-    elif  not indexFirstFrame and indexLastFrame:
-        frames = frames0[:indexLastFrame+1]
+    # transformation of the distal segment in the proximal reference system
+    R = np.einsum("nji,njk->nik",Rprox,Rdist)
+    d = np.einsum("nji,nj->ni",Rprox,tdist-tprox)
 
-    elif  indexFirstFrame and not indexLastFrame:
-        frames = frames0[indexFirstFrame:]
+    if angularStep is not None:
+        selection = _angularExcursionFrames(R,angularStep)
+        logging.debug("[pyCGM2] SARA : %i frames selected from %i" %(selection.shape[0],R.shape[0]))
+        Rprox,tprox,Rdist,tdist,R,d = [it[selection] for it in [Rprox,tprox,Rdist,tdist,R,d]]
 
-    nFrames = len(frames)
+    nFrames = R.shape[0]
 
     if method =="1":
 
-        A = np.zeros((nFrames*3,6))
-        b = np.zeros((nFrames*3,1))
-
-        i=0
-        for f in frames:
-            A[i*3:i*3+3,0:3] = proxMotionRef[f].getRotation()
-            A[i*3:i*3+3,3:6] = -1.0 * distMotionRef[f].getRotation()
-            b[i*3:i*3+3,:] = (distMotionRef[f].getTranslation() - proxMotionRef[f].getTranslation()).reshape(3,1)
-            i+=1
-
-
-
+        A = np.concatenate((Rprox,-1.0 * Rdist),axis=2).reshape(nFrames*3,6)
+        b = (tdist - tprox).reshape(nFrames*3,1)
 
         U,s,V = np.linalg.svd(A,full_matrices=False)
         V = V.T # beware of V ( there is a difference between numpy and matlab)
@@ -389,37 +385,11 @@ def saraCalibration(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame,
         AoR = V[:,5]
 
 
-
     elif method =="2": # idem programmation morgan
 
-        SR = np.zeros((3,3))
-        Sd = np.zeros((3,1))
-        SRd = np.zeros((3,1))
-
-        # For each frame compute the transformation matrix of the distal
-        # segment in the proximal reference system
-
-        for f in frames:
-            Rprox = proxMotionRef[f].getRotation()
-            tprox = proxMotionRef[f].getTranslation()
-
-            Rdist = distMotionRef[f].getRotation()
-            tdist = distMotionRef[f].getTranslation()
-
-
-            P = np.concatenate((np.concatenate((Rprox,tprox.reshape(1,3).T),axis=1),np.array([[0,0,0,1]])),axis=0)
-            D = np.concatenate((np.concatenate((Rdist,tdist.reshape(1,3).T),axis=1),np.array([[0,0,0,1]])),axis=0)
-
-            T = np.dot(np.linalg.pinv(P),D)
-            R = T[0:3,0:3 ]
-            d= T[0:3,3].reshape(3,1)
-
-
-            SR = SR + R
-            Sd = Sd + d
-            SRd = SRd + np.dot(R.T,d)
-
-
+        SR = R.sum(axis=0)
+        Sd = d.sum(axis=0).reshape(3,1)
+        SRd = np.einsum("nji,nj->i",R,d).reshape(3,1)
 
         A0 = np.concatenate((nFrames*np.eye(3),-SR),axis=1)
         A1 = np.concatenate((-SR.T,nFrames*np.eye(3)),axis=1)
@@ -460,6 +430,228 @@ def saraCalibration(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame,
 
 
 
+def scoreCalibration(proxMotionRef,distMotionRef,indexFirstFrame,indexLastFrame, method = "1", angularStep=None):
+    """
+        Computation of a functional centre of rotation with the Symmetrical Centre of Rotation Estimation (SCoRE).
+
+        :Parameters:
+            - `proxMotionRef` (list of Frame) - motion of the proximal referential
+            - `distMotionRef` (list of Frame) - motion of the distal referential
+            - `indexFirstFrame` (int) - start frame
+            - `indexLastFrame` (int) - end frame
+            - `method` (str) - "1" : least square solution of the (3n,6) system.  "2" : normal equations ( 6x6 accumulation, suited to long trials)
+            - `angularStep` (double) - if not None, only frames spaced by this angular excursion (deg) of the relative rotation are used
+
+        :Returns:
+            - `prox_centre` (np.array(3)) - position of the centre in the proximal referential
+            - `dist_centre` (np.array(3)) - position of the centre in the distal referential
+            - `residuals` (np.array(n)) - distance beetween the proximal and distal centres at each used frame
+
+        **Reference**
+
+        Ehrig, R. M., Taylor, W. R., Duda, G. N., & Heller, M. O. (2006). A survey of formal methods for determining the centre of rotation of ball joints. Journal of Biomechanics, 39(15), 2798–2809.
+
+    """
+    frames = _selectFrames(len(proxMotionRef),indexFirstFrame,indexLastFrame)
+
+    Rprox,tprox = _motionArrays(proxMotionRef,frames)
+    Rdist,tdist = _motionArrays(distMotionRef,frames)
+
+    if angularStep is not None:
+        selection = _angularExcursionFrames(np.einsum("nji,njk->nik",Rprox,Rdist),angularStep)
+        logging.debug("[pyCGM2] SCoRE : %i frames selected from %i" %(selection.shape[0],Rprox.shape[0]))
+        Rprox,tprox,Rdist,tdist = [it[selection] for it in [Rprox,tprox,Rdist,tdist]]
+
+    nFrames = Rprox.shape[0]
+
+    if method =="1":
+        A = np.concatenate((Rprox,-1.0 * Rdist),axis=2).reshape(nFrames*3,6)
+        b = (tdist - tprox).reshape(nFrames*3)
+
+        CoR = np.linalg.lstsq(A,b,rcond=None)[0]
+
+    elif method =="2":
+        # A.T*A = [n.I, -SR; -SR.T, n.I] with SR the sum of the relative rotations
+        SR = np.einsum("nji,njk->ik",Rprox,Rdist)
+        AtA = np.concatenate((np.concatenate((nFrames*np.eye(3),-SR),axis=1),
+                              np.concatenate((-SR.T,nFrames*np.eye(3)),axis=1)))
+        Atb = np.concatenate((np.einsum("nji,nj->i",Rprox,tdist - tprox),
+                              -np.einsum("nji,nj->i",Rdist,tdist - tprox)))
+
+        CoR = np.linalg.solve(AtA,Atb)
+
+    else:
+        raise Exception("[pyCGM2] SCoRE method (%s) unknown" %(method))
+
+    prox_centre = CoR[0:3]
+    dist_centre = CoR[3:6]
+
+    residuals = np.linalg.norm(np.dot(Rprox,prox_centre) + tprox - np.dot(Rdist,dist_centre) - tdist, axis=1)
+
+    return prox_centre,dist_centre,residuals
+
+
+
+def _cohortColumn(table,label):
+    """ column of an anthropometric table as a float array
+    """
+    if label not in table:
+        raise Exception("[pyCGM2] anthropometric table has no column %s" %(label))
+    return np.atleast_1d(np.asarray(table[label],dtype=float))
+
+def _subjectTable(*mps):
+    """ one-row anthropometric table from anthropometric dictionnaries
+    """
+    table = dict()
+    for mp in mps:
+        if mp is not None:
+            for label,value in mp.items():
+                if np.isscalar(value) and not isinstance(value,basestring):
+                    table[label] = np.array([value],dtype=float)
+    return table
+
+def _stackHjc(x,y,z):
+    return np.array([x,y,z]).T
+
+def cohortHaraRegression(table,markerDiameter = 14.0,  basePlate = 2.0):
+    """
+        Hip joint centre regression from Hara et al, 2016 for a cohort
+
+        :Parameters:
+            - `table` (dict) - columnar anthropometric table ( label : numpy.array(m,)). Columns : LeftLegLength, RightLegLength
+            - `markerDiameter` (double) - diameter of the marker
+            - `basePlate` (double) - thickness of the base plate
+
+        :Return:
+            - `HJC_L`, `HJC_R` (numpy.array(m,3)) - hip joint centres in the pelvis coordinate system
+
+    """
+    leftLegLength = _cohortColumn(table,"LeftLegLength")
+    rightLegLength = _cohortColumn(table,"RightLegLength")
+
+    HJC_L = _stackHjc(11.0 -0.063*leftLegLength - markerDiameter/2.0 - basePlate,
+                      8.0+0.086*leftLegLength,
+                      -9.0-0.078*leftLegLength)
+
+    HJC_R = _stackHjc(11.0 -0.063*rightLegLength- markerDiameter/2.0 - basePlate,
+                      -1.0*(8.0+0.086*rightLegLength),
+                      -9.0-0.078*rightLegLength)
+
+    return HJC_L,HJC_R
+
+def cohortHarringtonRegression(table, predictors, markerDiameter = 14.0, basePlate = 2.0, cgmReferential=True):
+    """
+        Hip joint centre regression from Harrington et al, 2007 for a cohort
+
+        :Parameters:
+            - `table` (dict) - columnar anthropometric table ( label : numpy.array(m,)). Columns : PelvisDepth, InterAsisDistance, MeanlegLength ( depending on predictors)
+            - `predictors` (pyCGM2.enums) - predictor choice of the regression (full,PWonly,LLonly)
+            - `markerDiameter` (double) - diameter of the marker
+            - `basePlate` (double) - thickness of the base plate
+            - `cgmReferential` (bool) - flag indicating HJC position will be expressed in the CGM pelvis Coordinate system
+
+        :Return:
+            - `HJC_L`, `HJC_R` (numpy.array(m,3)) - hip joint centres
+
+    """
+
+    if predictors.value == "full":
+        pelvisDepth = _cohortColumn(table,"PelvisDepth")
+        asisDistance = _cohortColumn(table,"InterAsisDistance")
+        legLength = _cohortColumn(table,"MeanlegLength")
+
+        HJCx=-0.24*pelvisDepth-9.9  - markerDiameter/2.0 - basePlate # post/ant
+        HJCy=-0.16*asisDistance-0.04*legLength-7.1
+        HJCz=0.28*pelvisDepth+0.16*asisDistance+7.9
+
+    elif predictors.value=="PWonly":
+        asisDistance = _cohortColumn(table,"InterAsisDistance")
+
+        HJCx=-0.138*asisDistance-10.4 - markerDiameter/2.0 - basePlate
+        HJCy=-0.305*asisDistance-10.9
+        HJCz=0.33*asisDistance+7.3
+
+    elif predictors.value=="LLonly":
+        legLength = _cohortColumn(table,"MeanlegLength")
+
+        HJCx=-0.041*legLength-6.3 - markerDiameter/2.0 - basePlate
+        HJCy=-0.083*legLength-7.9
+        HJCz=0.0874*legLength+5.4
+
+    else:
+        raise Exception("[pyCGM2] Predictor is unknown choixe possible : full, PWonly, LLonly")
+
+    HJC_L_har = _stackHjc(HJCx,HJCy,-1*HJCz)
+    HJC_R_har = _stackHjc(HJCx,HJCy,1*HJCz)
+
+    if cgmReferential :
+        Rhar_cgm1=np.array([[1, 0, 0],[0, 0, -1], [0, 1, 0]])
+        HJC_L = np.dot(HJC_L_har,Rhar_cgm1.T)
+        HJC_R = np.dot(HJC_R_har,Rhar_cgm1.T)
+    else:
+        HJC_L = HJC_L_har
+        HJC_R = HJC_R_har
+
+    return HJC_L,HJC_R
+
+def cohortDavisRegression(table, markerDiameter = 14.0, basePlate = 2.0):
+    """
+        Hip joint centre regression according Davis et al, 1991 for a cohort
+
+        :Parameters:
+            - `table` (dict) - columnar anthropometric table ( label : numpy.array(m,)). Columns : MeanlegLength, InterAsisDistance, LeftAsisTrocanterDistance, RightAsisTrocanterDistance
+            - `markerDiameter` (double) - diameter of optoelectronic marker
+
+        :Return:
+            - `HJC_L`, `HJC_R` (numpy.array(m,3)) - hip joint centres in the pelvis coordinate system
+
+    """
+
+    C=_cohortColumn(table,"MeanlegLength") * 0.115 - 15.3
+    asisDistance = _cohortColumn(table,"InterAsisDistance")
+
+    HJC = dict()
+    for side,sign in [("Left",-1.0),("Right",1.0)]:
+        asisTrocanterDistance = _cohortColumn(table,side+"AsisTrocanterDistance")
+
+        HJC[side] = _stackHjc(C * np.cos(0.5) * np.sin(0.314) - (asisTrocanterDistance + markerDiameter/2.0) * np.cos(0.314),
+                              sign*(C * np.sin(0.5) - (asisDistance / 2.0)),
+                              - C * np.cos(0.5) * np.cos(0.314) - (asisTrocanterDistance + markerDiameter/2.0) * np.sin(0.314))
+
+    return HJC["Left"],HJC["Right"]
+
+def cohortBellRegression(table,  markerDiameter = 14.0, basePlate = 2.0, cgmReferential=True):
+    """
+        Hip joint centre regression from Bell and Brand et al, 2007 for a cohort
+
+        :Parameters:
+            - `table` (dict) - columnar anthropometric table ( label : numpy.array(m,)). Column : InterAsisDistance
+            - `markerDiameter` (double) - diameter of the marker
+            - `basePlate` (double) - thickness of the base plate
+            - `cgmReferential` (bool) - flag indicating HJC position will be expressed in the CGM pelvis Coordinate system
+
+        :Return:
+            - `HJC_L`, `HJC_R` (numpy.array(m,3)) - hip joint centres
+
+    """
+    asisDistance = _cohortColumn(table,"InterAsisDistance")
+
+    HJC_L_bell = _stackHjc(0.36*asisDistance, -0.19*asisDistance, -0.19*asisDistance) # ML - AP - IS
+    HJC_R_bell = _stackHjc(-0.36*asisDistance, -0.19*asisDistance, -0.19*asisDistance)
+
+    if cgmReferential :
+        Rbell_cgm1=np.array([[0, 1, 0],
+                             [1, 0, 0],
+                             [0, 0, 1]])
+        HJC_L = np.dot(HJC_L_bell,Rbell_cgm1.T)
+        HJC_R = np.dot(HJC_R_bell,Rbell_cgm1.T)
+    else:
+        HJC_L = HJC_L_bell
+        HJC_R = HJC_R_bell
+
+    return HJC_L,HJC_R
+
+
 def haraRegression(mp_input,mp_computed,markerDiameter = 14.0,  basePlate = 2.0):
     """
         Hip joint centre regression from Hara et al, 2016
@@ -470,6 +662,8 @@ def haraRegression(mp_input,mp_computed,markerDiameter = 14.0,  basePlate = 2.0)
             - `markerDiameter` (double) - diameter of the marker
             - `basePlate` (double) - thickness of the base plate
 
+        .. note:: single-subject wrapper of `cohortHaraRegression`
+
         **Reference**
 
         Hara, R., Mcginley, J. L., C, B., Baker, R., & Sangeux, M. (2016). Generation of age and sex specific regression equations to locate the Hip Joint Centres. Gait & Posture
@@ -477,23 +671,12 @@ def haraRegression(mp_input,mp_computed,markerDiameter = 14.0,  basePlate = 2.0)
     """
     #TODO : remove mp_computed
 
+    HJC_L,HJC_R = cohortHaraRegression(_subjectTable(mp_input),markerDiameter = markerDiameter, basePlate = basePlate)
+    HJC_L = HJC_L[0]
+    HJC_R = HJC_R[0]
 
-    HJCx_L= 11.0 -0.063*mp_input["LeftLegLength"] - markerDiameter/2.0 - basePlate
-    HJCy_L=8.0+0.086*mp_input["LeftLegLength"]
-    HJCz_L=-9.0-0.078*mp_input["LeftLegLength"]
-
-    logging.debug("Left HJC position from Hara [ X = %s, Y = %s, Z = %s]" %(HJCx_L,HJCy_L,HJCz_L))
-    HJC_L_hara=np.array([HJCx_L,HJCy_L,HJCz_L])
-
-    HJCx_R= 11.0 -0.063*mp_input["RightLegLength"]- markerDiameter/2.0 - basePlate
-    HJCy_R=-1.0*(8.0+0.086*mp_input["RightLegLength"])
-    HJCz_R=-9.0-0.078*mp_input["RightLegLength"]
-
-    logging.debug("Right HJC position from Hara [ X = %s, Y = %s, Z = %s]" %(HJCx_R,HJCy_R,HJCz_R))
-    HJC_R_hara=np.array([HJCx_R,HJCy_R,HJCz_R])
-
-    HJC_L = HJC_L_hara
-    HJC_R = HJC_R_hara
+    logging.debug("Left HJC position from Hara [ X = %s, Y = %s, Z = %s]" %(HJC_L[0],HJC_L[1],HJC_L[2]))
+    logging.debug("Right HJC position from Hara [ X = %s, Y = %s, Z = %s]" %(HJC_R[0],HJC_R[1],HJC_R[2]))
 
     return HJC_L,HJC_R
 
@@ -513,6 +696,8 @@ def harringtonRegression(mp_input,mp_computed, predictors, markerDiameter = 14.0
 
         .. note:: Predictor choice allow using modified Harrington's regression from Sangeux 2015
 
+        .. note:: single-subject wrapper of `cohortHarringtonRegression`
+
         '' warning:: this function requires pelvisDepth,asisDistance and meanlegLength which are automaticcly computed during CGM calibration
 
 
@@ -524,57 +709,15 @@ def harringtonRegression(mp_input,mp_computed, predictors, markerDiameter = 14.0
     """
     #TODO : how to work without CGM calibration
 
-    if predictors.value == "full":
-        HJCx_L=-0.24*mp_computed["PelvisDepth"]-9.9  - markerDiameter/2.0 - basePlate # post/ant
-        HJCy_L=-0.16*mp_computed["InterAsisDistance"]-0.04*mp_computed["MeanlegLength"]-7.1
-        HJCz_L=-1*(0.28*mp_computed["PelvisDepth"]+0.16*mp_computed["InterAsisDistance"]+7.9)
-        HJC_L_har=np.array([HJCx_L,HJCy_L,HJCz_L])
-
-        HJCx_R=-0.24*mp_computed["PelvisDepth"]-9.9 - markerDiameter/2.0 - basePlate# post/ant
-        HJCy_R=-0.16*mp_computed["InterAsisDistance"]-0.04*mp_computed["MeanlegLength"]-7.1
-        HJCz_R=1*(0.28*mp_computed["PelvisDepth"]+0.16*mp_computed["InterAsisDistance"]+7.9)
-        HJC_R_har=np.array([HJCx_R,HJCy_R,HJCz_R])
-
-    elif predictors.value=="PWonly":
-        HJCx_L=-0.138*mp_computed["InterAsisDistance"]-10.4 - markerDiameter/2.0 - basePlate
-        HJCy_L=-0.305*mp_computed["InterAsisDistance"]-10.9
-        HJCz_L=-1*(0.33*mp_computed["InterAsisDistance"]+7.3)
-
-        HJC_L_har=np.array([HJCx_L,HJCy_L,HJCz_L])
-
-        HJCx_R=-0.138*mp_computed["InterAsisDistance"]-10.4 - markerDiameter/2.0 - basePlate
-        HJCy_R=-0.305*mp_computed["InterAsisDistance"]-10.9
-        HJCz_R=1*(0.33*mp_computed["InterAsisDistance"]+7.3)
-
-        HJC_R_har=np.array([HJCx_R,HJCy_R,HJCz_R])
-
-
-    elif predictors.value=="LLonly":
-        HJCx_L=-0.041*mp_computed["MeanlegLength"]-6.3 - markerDiameter/2.0 - basePlate
-        HJCy_L=-0.083*mp_computed["MeanlegLength"]-7.9
-        HJCz_L=-1*(0.0874*mp_computed["MeanlegLength"]+5.4)
-
-        HJC_L_har=np.array([HJCx_L,HJCy_L,HJCz_L])
-
-        HJCx_R=-0.041*mp_computed["MeanlegLength"]-6.3 - markerDiameter/2.0 - basePlate
-        HJCy_R=-0.083*mp_computed["MeanlegLength"]-7.9
-        HJCz_R=1*(0.0874*mp_computed["MeanlegLength"]+5.4)
-
-        HJC_R_har=np.array([HJCx_R,HJCy_R,HJCz_R])
-
-    else:
-        raise Exception("[pyCGM2] Predictor is unknown choixe possible : full, PWonly, LLonly")
+    HJC_L,HJC_R = cohortHarringtonRegression(_subjectTable(mp_computed), predictors,
+                                             markerDiameter = markerDiameter, basePlate = basePlate, cgmReferential=cgmReferential)
+    HJC_L = HJC_L[0]
+    HJC_R = HJC_R[0]
 
     if cgmReferential :
-        Rhar_cgm1=np.array([[1, 0, 0],[0, 0, -1], [0, 1, 0]])
-        HJC_L = np.dot(Rhar_cgm1,HJC_L_har)
-        HJC_R = np.dot(Rhar_cgm1,HJC_R_har)
         logging.debug("computation in cgm pelvis referential")
-        logging.debug("Left HJC position from Harrington [ X = %s, Y = %s, Z = %s]" %(HJC_L[0],HJC_L[1],HJC_L[2]))
-        logging.debug("Right HJC position from Harrington [ X = %s, Y = %s, Z = %s]" %(HJC_L[0],HJC_L[1],HJC_L[2]))
-    else:
-        HJC_L = HJC_L_har
-        HJC_R = HJC_R_har
+    logging.debug("Left HJC position from Harrington [ X = %s, Y = %s, Z = %s]" %(HJC_L[0],HJC_L[1],HJC_L[2]))
+    logging.debug("Right HJC position from Harrington [ X = %s, Y = %s, Z = %s]" %(HJC_R[0],HJC_R[1],HJC_R[2]))
 
     return HJC_L,HJC_R
 
@@ -590,6 +733,8 @@ def davisRegression(mp_input,mp_computed, markerDiameter = 14.0, basePlate = 2.0
 
         .. Danger:: Don t use a marker set with different diameters.
 
+        .. note:: single-subject wrapper of `cohortDavisRegression`
+
         **Reference**
 
         Davis, R., Ounpuu, S., Tyburski, D., & Gage, J. (1991). A gait analysis data collection and reduction technique. Human Movement Science, 10, 575–587.
@@ -597,21 +742,9 @@ def davisRegression(mp_input,mp_computed, markerDiameter = 14.0, basePlate = 2.0
 
     """
 
-    C=mp_computed["MeanlegLength"] * 0.115 - 15.3
+    HJC_L,HJC_R = cohortDavisRegression(_subjectTable(mp_computed), markerDiameter = markerDiameter, basePlate = basePlate)
 
-    HJCx_L= C * np.cos(0.5) * np.sin(0.314) - (mp_computed["LeftAsisTrocanterDistance"] + markerDiameter/2.0) * np.cos(0.314)
-    HJCy_L=-1*(C * np.sin(0.5) - (mp_computed["InterAsisDistance"] / 2.0))
-    HJCz_L= - C * np.cos(0.5) * np.cos(0.314) - (mp_computed["LeftAsisTrocanterDistance"] + markerDiameter/2.0) * np.sin(0.314)
-
-    HJC_L=np.array([HJCx_L,HJCy_L,HJCz_L])
-
-    HJCx_R= C * np.cos(0.5) * np.sin(0.314) - (mp_computed["RightAsisTrocanterDistance"] + markerDiameter/2.0) * np.cos(0.314)
-    HJCy_R=+1*(C * np.sin(0.5) - (mp_computed["InterAsisDistance"] / 2.0))
-    HJCz_R= -C * np.cos(0.5) * np.cos(0.314) - (mp_computed["RightAsisTrocanterDistance"] + markerDiameter/2.0) * np.sin(0.314)
-
-    HJC_R=np.array([HJCx_R,HJCy_R,HJCz_R])
-
-    return HJC_L,HJC_R
+    return HJC_L[0],HJC_R[0]
 
 def bellRegression(mp_input,mp_computed,  markerDiameter = 14.0, basePlate = 2.0, cgmReferential=True):
     """
@@ -624,6 +757,8 @@ def bellRegression(mp_input,mp_computed,  markerDiameter = 14.0, basePlate = 2.0
             - `basePlate` (double) - thickness of the base plate
             - `cgmReferential` (bool) - flag indicating HJC position will be expressed in the CGM pelvis Coordinate system
 
+        .. note:: single-subject wrapper of `cohortBellRegression`
+
         Bell AL, Pederson DR, and Brand RA (1989) Prediction of hip joint center location from external landmarks.
         Human Movement Science. 8:3-16:
 
@@ -631,31 +766,15 @@ def bellRegression(mp_input,mp_computed,  markerDiameter = 14.0, basePlate = 2.0
         J Biomech. 23, 617-621.
     """
 
-
-    HJCx_L= 0.36*mp_computed["InterAsisDistance"] # ML
-    HJCy_L= -0.19*mp_computed["InterAsisDistance"] #AP
-    HJCz_L=-0.19*mp_computed["InterAsisDistance"] # IS
-    HJC_L_bell=np.array([HJCx_L,HJCy_L,HJCz_L])
-
-    HJCx_R= -0.36*mp_computed["InterAsisDistance"] # ML
-    HJCy_R= -0.19*mp_computed["InterAsisDistance"] #AP
-    HJCz_R=-0.19*mp_computed["InterAsisDistance"] # IS
-    HJC_R_bell=np.array([HJCx_R,HJCy_R,HJCz_R])
-
-
+    HJC_L,HJC_R = cohortBellRegression(_subjectTable(mp_computed), markerDiameter = markerDiameter, basePlate = basePlate,
+                                       cgmReferential=cgmReferential)
+    HJC_L = HJC_L[0]
+    HJC_R = HJC_R[0]
 
     if cgmReferential :
-        Rbell_cgm1=np.array([[0, 1, 0],
-                             [1, 0, 0],
-                             [0, 0, 1]])
-        HJC_L = np.dot(Rbell_cgm1,HJC_L_bell)
-        HJC_R = np.dot(Rbell_cgm1,HJC_R_bell)
         logging.debug("computation in cgm pelvis referential")
-        logging.debug("Left HJC position from Bell [ X = %s, Y = %s, Z = %s]" %(HJC_L[0],HJC_L[1],HJC_L[2]))
-        logging.debug("Right HJC position from Bell [ X = %s, Y = %s, Z = %s]" %(HJC_L[0],HJC_L[1],HJC_L[2]))
-    else:
-        HJC_L = HJC_L_bell
-        HJC_R = HJC_R_bell
+    logging.debug("Left HJC position from Bell [ X = %s, Y = %s, Z = %s]" %(HJC_L[0],HJC_L[1],HJC_L[2]))
+    logging.debug("Right HJC position from Bell [ X = %s, Y = %s, Z = %s]" %(HJC_R[0],HJC_R[1],HJC_R[2]))
 
     return HJC_L,HJC_R
 
@@ -702,15 +821,6 @@ class Kad(DecoratorModel):
         #self.model.nativeCgm1 = False
         self.model.decoratedModel = True
 
-        LKJCvalues =  np.zeros((self.acq.GetPointFrameNumber(),3))
-        LKNEvalues =  np.zeros((self.acq.GetPointFrameNumber(),3))
-        LAJCvalues = np.zeros((self.acq.GetPointFrameNumber(),3))
-
-        RKJCvalues = np.zeros((self.acq.GetPointFrameNumber(),3))
-        RKNEvalues =  np.zeros((self.acq.GetPointFrameNumber(),3))
-        RAJCvalues = np.zeros((self.acq.GetPointFrameNumber(),3))
-
-
         if side == "both" or side == "left":
 
             self.model.setCalibrationProperty("LeftKAD",True)
@@ -720,43 +830,29 @@ class Kad(DecoratorModel):
                 if self.model.mp.has_key("LeftThighRotation") : self.model.mp["LeftThighRotation"] =0 # look out, it's mp, not mp_computed.
                 if self.model.mp.has_key("LeftShankRotation") : self.model.mp["LeftShankRotation"] =0
 
-            for i in range(0,self.acq.GetPointFrameNumber()):
-                #  compute points left and right lateral condyle
-                LKAX = self.acq.GetPoint("LKAX").GetValues()[i,:]
-                LKD1 = self.acq.GetPoint("LKD1").GetValues()[i,:]
-                LKD2 = self.acq.GetPoint("LKD2").GetValues()[i,:]
-
-                dist = np.array([np.linalg.norm(LKAX-LKD1), np.linalg.norm(LKAX-LKD2),np.linalg.norm(LKD1-LKD2)] )
-                dist =  dist / np.sqrt(2)
-                res = np.array([np.mean(dist), np.var(dist)])
-                n = np.cross(LKD2-LKD1 , LKAX-LKD1)
-                n= n/np.linalg.norm(n)
+            LKAX = self.acq.GetPoint("LKAX").GetValues()
+            LKD1 = self.acq.GetPoint("LKD1").GetValues()
+            LKD2 = self.acq.GetPoint("LKD2").GetValues()
 
-                I = (LKD1+LKAX)/2
-                PP1 = 2/3.0*(I-LKD2)+LKD2
-                O = PP1 - n*np.sqrt(3)*res[0]/3.0
-                LKAXO = (O-LKAX)/np.linalg.norm(O-LKAX)
+            #  compute points left and right lateral condyle
+            LKNEvalues,LKAXO = kadLateralCondyle(LKAX,LKD1,LKD2,"left",distSkin=distSkin)
 
-                LKNEvalues[i,:] = O + LKAXO * distSkin
-
-                # locate KJC
-    #            LKJC = LKNE + LKAXO * (self.model.mp["leftKneeWidth"]+markerDiameter )/2.0
-                if btkTools.isPointExist(self.acq,"LHJC"):
-                    LHJC = self.acq.GetPoint("LHJC").GetValues()[i,:]
-                    LKJCvalues[i,:] = chord( (self.model.mp["LeftKneeWidth"]+markerDiameter )/2.0 ,LKNEvalues[i,:],LHJC,LKAX, beta= 0.0 )
-                else:
-                    LKJCvalues[i,:] = LKNEvalues[i,:] + LKAXO * (self.model.mp["LeftKneeWidth"]+markerDiameter )/2.0
-
-                # locate AJC
-                beta = 0
-                ajcDesc = "KAD"
-                if self.model.mp.has_key("LeftTibialTorsion") and self.model.mp["LeftTibialTorsion"] !=0:
-                    beta = -1.0 * self.model.mp["LeftTibialTorsion"]
-                    ajcDesc = "KAD-manualTT"
+            # locate KJC
+            if btkTools.isPointExist(self.acq,"LHJC"):
+                LHJC = self.acq.GetPoint("LHJC").GetValues()
+                LKJCvalues = chord( (self.model.mp["LeftKneeWidth"]+markerDiameter )/2.0 ,LKNEvalues,LHJC,LKAX, beta= 0.0 )
+            else:
+                LKJCvalues = LKNEvalues + LKAXO * (self.model.mp["LeftKneeWidth"]+markerDiameter )/2.0
 
+            # locate AJC
+            beta = 0
+            ajcDesc = "KAD"
+            if self.model.mp.has_key("LeftTibialTorsion") and self.model.mp["LeftTibialTorsion"] !=0:
+                beta = -1.0 * self.model.mp["LeftTibialTorsion"]
+                ajcDesc = "KAD-manualTT"
 
-                LANK = self.acq.GetPoint("LANK").GetValues()[i,:]
-                LAJCvalues[i,:] = chord( (self.model.mp["LeftAnkleWidth"]+markerDiameter )/2.0 ,LANK,LKJCvalues[i,:],LKAX,beta= beta )
+            LANK = self.acq.GetPoint("LANK").GetValues()
+            LAJCvalues = chord( (self.model.mp["LeftAnkleWidth"]+markerDiameter )/2.0 ,LANK,LKJCvalues,LKAX,beta= beta )
 
             tf_prox = self.model.getSegment("Left Thigh").getReferential("TF")
             tf_dist = self.model.getSegment("Left Shank").getReferential("TF")
@@ -790,44 +886,29 @@ class Kad(DecoratorModel):
                 if self.model.mp.has_key("RightShankRotation") : self.model.mp["RightShankRotation"] =0
 
 
-            for i in range(0,self.acq.GetPointFrameNumber()):
-                #  compute points left and right lateral condyle
-                RKAX = self.acq.GetPoint("RKAX").GetValues()[i,:]
-                RKD1 = self.acq.GetPoint("RKD1").GetValues()[i,:]
-                RKD2 = self.acq.GetPoint("RKD2").GetValues()[i,:]
-
-                dist = np.array([np.linalg.norm(RKAX-RKD1), np.linalg.norm(RKAX-RKD2),np.linalg.norm(RKD1-RKD2)] )
-                dist =  dist / np.sqrt(2)
-                res = np.array([np.mean(dist), np.var(dist)])
-                n = np.cross(RKD2-RKD1 , RKAX-RKD1)
-                n= n/np.linalg.norm(n)
-
-                n=-n # look out the negative sign
-
+            RKAX = self.acq.GetPoint("RKAX").GetValues()
+            RKD1 = self.acq.GetPoint("RKD1").GetValues()
+            RKD2 = self.acq.GetPoint("RKD2").GetValues()
 
-                I = (RKD1+RKAX)/2
-                PP1 = 2/3.0*(I-RKD2)+RKD2
-                O = PP1 - n*np.sqrt(3)*res[0]/3.0
-                RKAXO = (O-RKAX)/np.linalg.norm(O-RKAX)
-                RKNEvalues[i,:] = O + RKAXO * distSkin
+            #  compute points left and right lateral condyle
+            RKNEvalues,RKAXO = kadLateralCondyle(RKAX,RKD1,RKD2,"right",distSkin=distSkin)
 
-                # locate KJC
-    #            RKJC = RKNE + RKAXO * (self.model.mp["rightKneeWidth"]+markerDiameter )/2.0
-                if btkTools.isPointExist(self.acq,"RHJC"):
-                    RHJC = self.acq.GetPoint("RHJC").GetValues()[frameInit:frameEnd,:].mean(axis=0)
-                    RKJCvalues[i,:] = chord( (self.model.mp["RightKneeWidth"]+markerDiameter )/2.0 ,RKNEvalues[i,:],RHJC,RKAX,beta= 0.0 )
-                else:
-                    RKJCvalues[i,:] = RKNEvalues[i,:] + RKAXO * (self.model.mp["RightKneeWidth"]+markerDiameter )/2.0
+            # locate KJC
+            if btkTools.isPointExist(self.acq,"RHJC"):
+                RHJC = self.acq.GetPoint("RHJC").GetValues()[frameInit:frameEnd,:].mean(axis=0)
+                RKJCvalues = chord( (self.model.mp["RightKneeWidth"]+markerDiameter )/2.0 ,RKNEvalues,RHJC,RKAX,beta= 0.0 )
+            else:
+                RKJCvalues = RKNEvalues + RKAXO * (self.model.mp["RightKneeWidth"]+markerDiameter )/2.0
 
-                beta = 0
-                ajcDesc = "KAD"
-                if self.model.mp.has_key("RightTibialTorsion") and self.model.mp["RightTibialTorsion"] !=0:
-                    beta = self.model.mp["RightTibialTorsion"]
-                    ajcDesc = "KAD-manualTT"
+            beta = 0
+            ajcDesc = "KAD"
+            if self.model.mp.has_key("RightTibialTorsion") and self.model.mp["RightTibialTorsion"] !=0:
+                beta = self.model.mp["RightTibialTorsion"]
+                ajcDesc = "KAD-manualTT"
 
-                # locate AJC
-                RANK = self.acq.GetPoint("RANK").GetValues()[i,:]
-                RAJCvalues[i,:] = chord( (self.model.mp["RightAnkleWidth"]+markerDiameter )/2.0 ,RANK,RKJCvalues[i,:],RKAX,beta= beta )
+            # locate AJC
+            RANK = self.acq.GetPoint("RANK").GetValues()
+            RAJCvalues = chord( (self.model.mp["RightAnkleWidth"]+markerDiameter )/2.0 ,RANK,RKJCvalues,RKAX,beta= beta )
 
             tf_prox = self.model.getSegment("Right Thigh").getReferential("TF")
             tf_dist = self.model.getSegment("Right Shank").getReferential("TF")
@@ -1333,6 +1414,58 @@ class HipJointCenterDecorator(DecoratorModel):
             # marker
             #btkTools.smartAppendPoint(acq,"LHJC_MRK",RHJCvalues, desc="from marker")
 
+    def score(self, side="both", method="2", **kwargs):
+        """
+            Locate hip joint centres from the functional SCoRE method.
+
+            The technical referentials of the pelvis and thighs must have been tracked beforehand on a functional trial ( ex : star arc)
+            with the `ModelMotionFilter`
+
+            :Parameters:
+               - `side` (str) - body side
+               - `method` (str) - "1" : least square solution.  "2" : normal equations ( suited to long trials)
+
+            :kwargs:
+                - `indexFirstFrame` (int) - start frame
+                - `indexLastFrame` (int) - end frame
+                - `angularStep` (double) - angular excursion (deg) beetween two used frames. Redundant static frames are skipped
+
+            :Return:
+                - `report` (dict) - residuals (mm) of the centre of rotation by side ( mean, rms, max and number of frames)
+
+        """
+        self.model.decoratedModel = True
+
+        iff = kwargs["indexFirstFrame"] if kwargs.has_key("indexFirstFrame") else None
+        ilf = kwargs["indexLastFrame"] if kwargs.has_key("indexLastFrame") else None
+        angularStep = kwargs["angularStep"] if kwargs.has_key("angularStep") else None
+
+        report = dict()
+        for context,letter,thighLabel in [("Left","L","Left Thigh"),("Right","R","Right Thigh")]:
+            if side == "both" or side == context.lower():
+
+                tf_prox = self.model.getSegment("Pelvis").getReferential("TF")
+                tf_dist = self.model.getSegment(thighLabel).getReferential("TF")
+
+                HJC_pos,dist_pos,residuals = scoreCalibration(tf_prox.motion,tf_dist.motion,iff,ilf, method=method, angularStep=angularStep)
+
+                report[context] = {"mean" : np.mean(residuals),
+                                   "rms" : np.sqrt(np.mean(residuals**2)),
+                                   "max" : np.max(residuals),
+                                   "frames" : residuals.shape[0]}
+                logging.info("[pyCGM2] %s SCoRE residual (mm) : mean %.2f - rms %.2f - max %.2f (%i frames)" %(context,
+                             report[context]["mean"],report[context]["rms"],report[context]["max"],report[context]["frames"]))
+
+                # nodes
+                tf_prox.static.addNode(letter+"HJC_Score",HJC_pos, positionType="Local", desc = "Score")
+                tf_prox.static.addNode(letter+"HJC",HJC_pos, positionType="Local", desc = "Score")
+
+                glob = tf_prox.static.getNode_byLabel(letter+"HJC_Score").m_global
+                tf_dist.static.addNode(letter+"HJC_Score",glob, positionType="Global", desc = "Score")
+                tf_dist.static.addNode(letter+"HJC",glob, positionType="Global", desc = "Score")
+
+        return report
+
 class KneeCalibrationDecorator(DecoratorModel):
     """
         Concrete cgm decorator altering the knee joint
@@ -1516,6 +1649,11 @@ class KneeCalibrationDecorator(DecoratorModel):
             :Parameters:
                 - `side` (str) - lower limb side
 
+            :kwargs:
+                - `indexFirstFrame` (int) - start frame
+                - `indexLastFrame` (int) - end frame
+                - `angularStep` (double) - angular excursion (deg) beetween two used frames. Redundant static frames are skipped
+
         """
         self.model.decoratedModel = True
 
@@ -1545,7 +1683,9 @@ class KneeCalibrationDecorator(DecoratorModel):
         distMotion = self.model.getSegment(distSegmentlabel).getReferential("TF").motion
 
         # -- main function -----
-        prox_ori,prox_axisLim,dist_ori,dist_axisLim,axis_prox,axis_dist,quality = saraCalibration(proxMotion,distMotion,iff, ilf, method="2")
+        angularStep = kwargs["angularStep"] if kwargs.has_key("angularStep") else None
+
+        prox_ori,prox_axisLim,dist_ori,dist_axisLim,axis_prox,axis_dist,quality = saraCalibration(proxMotion,distMotion,iff, ilf, method="2",angularStep=angularStep)
         # end function -----
 
 
@@ -11,9 +11,10 @@ import motion
 from pyCGM2 import enums
 from  pyCGM2.Math import euler,numeric
 import pyCGM2.Signal.signal_processing as pyCGM2signal
+import pyCGM2.Math.wrench as pyCGM2wrench
 from pyCGM2.Tools import  btkTools
+from pyCGM2.ForcePlates import groundReactionWrenchs
 from pyCGM2.Utils import timer
-import matplotlib.pyplot as plt
 
 
 
@@ -113,125 +114,61 @@ class CGMLowerlimbInverseDynamicProcedure(object):
         return forceValues
 
     def _externalDeviceMomentContribution(self, wrenchs, Oi, scaleToMeter):
+        """
+        sum of external device moments transported to the segment origin ( Oi, numpy.array(n,3))
+        """
 
-        nf = wrenchs[0].GetMoment().GetValues().shape[0]
-        momentValues = np.zeros((nf,3))
-
-        for wrIt in wrenchs:
-             Fext = wrIt.GetForce().GetValues()
-             Mext = wrIt.GetMoment().GetValues()
-             posExt = wrIt.GetPosition().GetValues()
-
-             for i in range(0,nf):
-                 Fext_i = np.matrix(Fext[i,:])
-                 Mext_i = np.matrix(Mext[i,:])
-                 di = posExt[i,:] - Oi[i].getTranslation()
-                 wrMomentValues = (Mext_i.T*scaleToMeter + numeric.skewMatrix(di*scaleToMeter)*Fext_i.T)
-                 momentValues[i,:] = momentValues[i,:] + np.array(wrMomentValues.T)
-
-        return momentValues
-
-
-    def _distalMomentContribution(self, wrench, Oi, scaleToMeter, source = "Wrench"):
+        wrenchValues = [(wrIt.GetForce().GetValues(),wrIt.GetMoment().GetValues(),wrIt.GetPosition().GetValues()) for wrIt in wrenchs]
+        momentValues = pyCGM2wrench.transportWrenchs(wrenchValues, Oi)[1]
 
-        nf = wrench.GetMoment().GetValues().shape[0]
-        momentValues = np.zeros((nf,3))
+        return momentValues*scaleToMeter
 
-        Fext = wrench.GetForce().GetValues()
-        Mext = wrench.GetMoment().GetValues()
-        posExt = wrench.GetPosition().GetValues()
 
-        for i in range(0,nf):
-            Fext_i = np.matrix(Fext[i,:])
-            Mext_i = np.matrix(Mext[i,:])
-            di = posExt[i,:] - Oi[i].getTranslation()
+    def _distalMomentContribution(self, distalWrench, Oi, scaleToMeter, source = "Wrench"):
+        """
+        moment of the distal segment wrench at the segment origin ( Oi, numpy.array(n,3))
+        """
 
-            if source == "Wrench":
-                wrMomentValues = (- 1.0*Mext_i.T*scaleToMeter + - 1.0*numeric.skewMatrix(di*scaleToMeter)*Fext_i.T)
-            elif source == "Force":
-                wrMomentValues = ( - 1.0*numeric.skewMatrix(di*scaleToMeter)*Fext_i.T)
-            elif source == "Moment":
-                wrMomentValues = (- 1.0*Mext_i.T*scaleToMeter)
+        Fext = distalWrench.GetForce().GetValues()
+        Mext = distalWrench.GetMoment().GetValues()
+        posExt = distalWrench.GetPosition().GetValues()
 
-            momentValues[i,:] =  np.array(wrMomentValues.T)
+        if source == "Wrench":
+            momentValues = - 1.0*pyCGM2wrench.transportMoment(Fext,Mext,posExt,Oi)*scaleToMeter
+        elif source == "Force":
+            momentValues = - 1.0*np.cross(posExt-Oi,Fext)*scaleToMeter
+        elif source == "Moment":
+            momentValues = - 1.0*Mext*scaleToMeter
 
         return momentValues
 
     def _forceAccelerationContribution(self,mi,ai,g,scaleToMeter):
 
-        nf = ai.shape[0]
-        g= np.matrix(g)
-        accelerationContribution = np.zeros((nf,3))
-
-        for i in range(0,nf):
-            ai_i = np.matrix(ai[i,:])
-            val = mi * ai_i.T*scaleToMeter - mi*g.T
-            accelerationContribution[i,:] = np.array(val.T)
+        return  mi*ai*scaleToMeter - mi*np.asarray(g).reshape(1,3)
 
-        return  accelerationContribution
 
-
-    def _inertialMomentContribution(self,Ii, alphai,omegai, Ti ,scaleToMeter):
+    def _inertialMomentContribution(self,Ii, alphai,omegai, Ri ,scaleToMeter):
         """
+        rate of change of the angular momentum. Ri (numpy.array(n,3,3)) are the rotations of the segment
         """
-        nf = alphai.shape[0]
-
-        accelerationContribution = np.zeros((nf,3))
-        coriolisContribution = np.zeros((nf,3))
-
-        Ii = np.matrix(Ii)
-
-
-        for i in range(0,nf):
-            alphai_i = np.matrix(alphai[i,:])
-            omegai_i = np.matrix(omegai[i,:])
-            Ri_i = np.matrix(Ti[i].getRotation())
-
-            accContr_i = Ri_i*(Ii*np.power(scaleToMeter,2))*Ri_i.T * alphai_i.T
-            accelerationContribution[i,:]=np.array(accContr_i.T)
 
-            corCont_i = numeric.skewMatrix(omegai_i) * Ri_i*(Ii*np.power(scaleToMeter,2))*Ri_i.T * omegai_i.T
-            coriolisContribution[i,:] = np.array(corCont_i.T)
+        return pyCGM2wrench.inertialMoment(np.asarray(Ii)*np.power(scaleToMeter,2), alphai, omegai, Ri)
 
-
-        return   accelerationContribution + coriolisContribution
-
-    def _accelerationMomentContribution(self, mi,ci, ai, Ti, scaleToMeter):
+    def _accelerationMomentContribution(self, mi,ci, ai, Ri, scaleToMeter):
         """
         SkewMatrix(ai_i*scaleToMeter) *mi * Ri_i*(ci*scaleToMeter
         """
 
-        nf = ai.shape[0]
-
-        accelerationContribution = np.zeros((nf,3))
-
-        for i in range(0,nf):
-            ai_i = np.matrix(ai[i,:])
-            Ri_i = np.matrix(Ti[i].getRotation())
-            ci = np.matrix(ci)
-
-            val = -1.0*mi*numeric.skewMatrix(ai_i*scaleToMeter) * Ri_i*(ci.T*scaleToMeter)
-
-            accelerationContribution[i,:] = np.array(val.T)
+        comVector = pyCGM2wrench.globalVector(ci,Ri)*scaleToMeter
 
-        return accelerationContribution
+        return -1.0*mi*np.cross(ai*scaleToMeter,comVector)
 
 
-    def _gravityMomentContribution(self, mi,ci, g, Ti, scaleToMeter):
+    def _gravityMomentContribution(self, mi,ci, g, Ri, scaleToMeter):
 
-        nf = len(Ti)
+        comVector = pyCGM2wrench.globalVector(ci,Ri)*scaleToMeter
 
-        gravityContribution = np.zeros((nf,3))
-
-
-        g= np.matrix(g)
-        ci = np.matrix(ci)
-        for i in range(0,nf):
-            Ri_i = np.matrix(Ti[i].getRotation())
-            val = - 1.0 *mi*numeric.skewMatrix(g) * Ri_i*(ci.T*scaleToMeter)
-
-            gravityContribution[i,:] = np.array(val.T)
-        return  gravityContribution
+        return - 1.0 *mi*np.cross(np.asarray(g).reshape(1,3),comVector)
 
 
 
@@ -250,7 +187,7 @@ class CGMLowerlimbInverseDynamicProcedure(object):
         MomentBtkPoint = btk.btkPoint(N)
         PositionBtkPoint = btk.btkPoint(N)
 
-        Ti = model.getSegment(segmentLabel).anatomicalFrame.motion
+        Ri,Oi = model.getSegment(segmentLabel).anatomicalFrame.getMotionArrays()
         mi = model.getSegment(segmentLabel).m_bsp["mass"]
         ci = model.getSegment(segmentLabel).m_bsp["com"]
         Ii = model.getSegment(segmentLabel).m_bsp["inertia"]
@@ -261,7 +198,7 @@ class CGMLowerlimbInverseDynamicProcedure(object):
         extMoment = np.zeros((N,3))
         if model.getSegment(segmentLabel).isExternalDeviceWrenchsConnected():
             extForces = self._externalDeviceForceContribution(model.getSegment(segmentLabel).m_externalDeviceWrenchs)
-            extMoment = self._externalDeviceMomentContribution(model.getSegment(segmentLabel).m_externalDeviceWrenchs, Ti, scaleToMeter)
+            extMoment = self._externalDeviceMomentContribution(model.getSegment(segmentLabel).m_externalDeviceWrenchs, Oi, scaleToMeter)
 
         # distal
         distSegMoment = np.zeros((N,3))
@@ -274,10 +211,10 @@ class CGMLowerlimbInverseDynamicProcedure(object):
             distalWrench = model.getSegment(distalSegmentLabel).m_proximalWrench
 
             distSegForce = distalWrench.GetForce().GetValues()
-            distSegMoment = self._distalMomentContribution(distalWrench, Ti, scaleToMeter)
 
-            distSegMoment_forceDistalContribution = self._distalMomentContribution(distalWrench, Ti, scaleToMeter, source ="Force")
-            distSegMoment_momentDistalContribution = self._distalMomentContribution(distalWrench, Ti, scaleToMeter, source ="Moment")
+            distSegMoment_forceDistalContribution = self._distalMomentContribution(distalWrench, Oi, scaleToMeter, source ="Force")
+            distSegMoment_momentDistalContribution = self._distalMomentContribution(distalWrench, Oi, scaleToMeter, source ="Moment")
+            distSegMoment = distSegMoment_forceDistalContribution + distSegMoment_momentDistalContribution
 
         # Force
         ai = model.getSegment(segmentLabel).getComAcceleration(btkAcq.GetPointFrequency(), order=4, fc=6 )
@@ -288,14 +225,13 @@ class CGMLowerlimbInverseDynamicProcedure(object):
         alphai = model.getSegment(segmentLabel).getAngularAcceleration(btkAcq.GetPointFrequency())
         omegai = model.getSegment(segmentLabel).getAngularVelocity(btkAcq.GetPointFrequency())
 
-        inertieCont = self._inertialMomentContribution(Ii, alphai,omegai, Ti ,scaleToMeter)
-        accCont = self._accelerationMomentContribution(mi,ci, ai, Ti, scaleToMeter)
-        grCont = self._gravityMomentContribution(mi,ci, gravity, Ti, scaleToMeter)
+        inertieCont = self._inertialMomentContribution(Ii, alphai,omegai, Ri ,scaleToMeter)
+        accCont = self._accelerationMomentContribution(mi,ci, ai, Ri, scaleToMeter)
+        grCont = self._gravityMomentContribution(mi,ci, gravity, Ri, scaleToMeter)
 
         momentValues = inertieCont + accCont -  grCont - extMoment - distSegMoment
 
-        for i in range(0,N):
-            positionValues[i,:] = Ti[i].getTranslation()
+        positionValues = Oi
 
         ForceBtkPoint.SetValues(forceValues)
         MomentBtkPoint.SetValues(momentValues/scaleToMeter)
@@ -490,6 +426,78 @@ class ModelCalibrationFilter(object):
 
 
 
+class RigidGapFillingFilter(object):
+    """
+        Fill gaps of tracking markers from the static positions of the technical referential.
+
+        On each frame with missing markers, the rigid transformation of the segment is fitted
+        on its visible tracking markers ( at least 3). Frames sharing the same visible markers
+        are fitted together. The filter has to run before the motion filter.
+    """
+    def __init__(self,iModel,iAcq):
+        """
+            :Parameters:
+               - `iModel` (pyCGM2.Model.CGM2.model.Model) - a calibrated model instance
+               - `iAcq` (btkAcquisition) - btk acquisition instance of a dynamic trial
+        """
+        self.m_model = iModel
+        self.m_acq = iAcq
+
+    def fill(self):
+        """
+            Run gap filling. Filled frames get a null residual.
+
+            :Return:
+                - `filledFrames` (dict) - number of filled frames of each marker
+        """
+        filledFrames = dict()
+        for seg in self.m_model.m_segmentCollection:
+            tf = seg.getReferential("TF")
+            if tf is None:
+                continue
+
+            labels = [label for label in seg.m_tracking_markers
+                        if tf.static.isNodeExist(label) and btkTools.isPointExist(self.m_acq,label)]
+            if len(labels) < 4:
+                continue
+
+            static = np.array([tf.static.getNode_byLabel(label).m_global for label in labels])
+            values = np.array([self.m_acq.GetPoint(label).GetValues() for label in labels])
+            visible = np.array([self.m_acq.GetPoint(label).GetResiduals().reshape(-1) >= 0 for label in labels]).T
+
+            nVisible = visible.sum(axis=1)
+            gapFrames = np.where((nVisible < len(labels)) & (nVisible >= 3))[0]
+            if gapFrames.size == 0:
+                continue
+
+            # frames grouped by visible markers. each visibility row is encoded as an integer key
+            keys = visible[gapFrames].dot(2**np.arange(len(labels),dtype=np.int64))
+            patternKeys, firstFrames, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+            filled = np.zeros(visible.shape,dtype=bool)
+            for p in range(0,patternKeys.shape[0]):
+                pattern = visible[gapFrames[firstFrames[p]]]
+                frames = gapFrames[inverse == p]
+                missing = np.where(~pattern)[0]
+
+                R,L = motion.batchSegmentalLeastSquare(static[pattern],
+                                                       values[pattern][:,frames,:].transpose(1,0,2))
+
+                values[np.ix_(missing,frames)] = np.einsum("fij,mj->mfi",R,static[missing]) + L
+                filled[np.ix_(frames,missing)] = True
+
+            for j in np.where(filled.any(axis=0))[0]:
+                point = self.m_acq.GetPoint(labels[j])
+                residuals = np.array(point.GetResiduals(),dtype=float)
+                residuals[filled[:,j]] = 0.0
+                point.SetValues(values[j])
+                point.SetResiduals(residuals)
+                filledFrames[labels[j]] = filledFrames.get(labels[j],0) + int(filled[:,j].sum())
+
+        logging.debug("[pyCGM2] rigid gap filling - filled frames : %s" %(str(filledFrames)))
+        return filledFrames
+
+
 class ModelMotionFilter(object):
     """
         Compute Motion of each segment
@@ -784,9 +792,10 @@ class TrackingMarkerDecompositionFilter(object):
 
 
                 # decompose tracking marker in the acq
+                nodeTrajs = seg.anatomicalFrame.getNodeTrajectories(copyTrackingMarkers)
                 for marker in copyTrackingMarkers:
 
-                    nodeTraj= seg.anatomicalFrame.getNodeTrajectory(marker)
+                    nodeTraj= nodeTrajs[marker]
                     markersTraj =self.m_acq.GetPoint(marker).GetValues()
 
                     markerTrajectoryX=np.array( [ markersTraj[:,0], nodeTraj[:,1],    nodeTraj[:,2]]).T
@@ -1165,33 +1174,19 @@ class ForcePlateAssemblyFilter(object):
         """
             run `ForcePlateAssemblyFilter`
         """
-        pfe = btk.btkForcePlatformsExtractor()
-        grwf = btk.btkGroundReactionWrenchFilter()
-        pfe.SetInput(self.m_aqui)
-        pfc = pfe.GetOutput()
-        grwf.SetInput(pfc)
-        grwc = grwf.GetOutput()
-        grwc.Update()
-
-        appf = self.m_aqui.GetNumberAnalogSamplePerFrame()
-        pfn = self.m_aqui.GetPointFrameNumber()
-
+        # wrenchs are connected at the point rate ( anti-aliased decimation done once by the wrench cache)
+        grws = groundReactionWrenchs.getGroundReactionWrenchs(self.m_aqui)
 
         i = 0
         for l in self.m_mappedForcePlate:
             if l == "L":
-                self.m_model.getSegment(self.m_leftSeglabel).addExternalDeviceWrench(grwc.GetItem(i))
+                self.m_model.getSegment(self.m_leftSeglabel).addExternalDeviceWrench(grws.getBtkWrench(i))
             elif l == "R":
-                self.m_model.getSegment(self.m_rightSeglabel).addExternalDeviceWrench(grwc.GetItem(i))
+                self.m_model.getSegment(self.m_rightSeglabel).addExternalDeviceWrench(grws.getBtkWrench(i))
             else:
                 logging.debug("force plate %i sans donnees" %(i))
             i+=1
 
-        if "L" in self.m_mappedForcePlate:
-            self.m_model.getSegment(self.m_leftSeglabel).downSampleExternalDeviceWrenchs(appf)
-        if "R" in self.m_mappedForcePlate:
-            self.m_model.getSegment(self.m_rightSeglabel).downSampleExternalDeviceWrenchs(appf)
-
 
 
 # ----- Inverse dynamics -----
@@ -1224,6 +1219,14 @@ class InverseDynamicFilter(object):
         self.m_exportMomentContributions = exportMomentContributions
         self.m_options = options
 
+    def _getRotations(self,segmentLabel,motionArrays):
+        """
+            stacked rotations of the anatomical frame of a segment ( extracted once)
+        """
+        if segmentLabel not in motionArrays:
+            motionArrays[segmentLabel] = self.m_model.getSegment(segmentLabel).anatomicalFrame.getMotionArrays()[0]
+        return motionArrays[segmentLabel]
+
     def compute(self, pointLabelSuffix = None ):
         """
             Run`InverseDynamicFilter`
@@ -1237,6 +1240,7 @@ class InverseDynamicFilter(object):
 
         self.m_procedure.compute(self.m_model,self.m_aqui,self.m_gravity,self.m_scaleToMeter)
 
+        motionArrays = dict() # stacked rotations of the anatomical frames, by segment label
 
         for it in  self.m_model.m_jointCollection:
 
@@ -1259,93 +1263,58 @@ class InverseDynamicFilter(object):
                 else:
                     proximalSegLabel = it.m_proximalLabel
                 if self.m_model.getSegment(it.m_distalLabel).m_proximalWrench is not None:
-                    if self.m_projection != enums.MomentProjection.JCS and  self.m_projection != enums.MomentProjection.JCS_Dual:
-
-                        if self.m_projection == enums.MomentProjection.Distal:
-                            mot = self.m_model.getSegment(it.m_distalLabel).anatomicalFrame.motion
-                        elif self.m_projection == enums.MomentProjection.Proximal:
-                            mot = self.m_model.getSegment(proximalSegLabel).anatomicalFrame.motion
 
+                    F = (1.0 / self.m_model.mp["Bodymass"]) * self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetForce().GetValues()
+                    M = (1.0 / self.m_model.mp["Bodymass"]) * self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetMoment().GetValues()
 
-                        forceValues = np.zeros((nFrames,3))
-                        momentValues = np.zeros((nFrames,3))
-                        for i in range(0,nFrames ):
-                            if self.m_projection == enums.MomentProjection.Global:
-                                forceValues[i,:] = (1.0 / self.m_model.mp["Bodymass"]) * self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetForce().GetValues()[i,:]
-                                momentValues[i,:] = (1.0 / self.m_model.mp["Bodymass"]) * self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetMoment().GetValues()[i,:]
-                            else:
-                                forceValues[i,:] = (1.0 / self.m_model.mp["Bodymass"]) * np.dot(mot[i].getRotation().T,
-                                                                                        self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetForce().GetValues()[i,:].T)
-                                momentValues[i,:] = (1.0 / self.m_model.mp["Bodymass"]) * np.dot(mot[i].getRotation().T,
-                                                                                        self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetMoment().GetValues()[i,:].T)
+                    if self.m_projection == enums.MomentProjection.Global:
+                        forceValues = F
+                        momentValues = M
 
+                    elif self.m_projection != enums.MomentProjection.JCS and  self.m_projection != enums.MomentProjection.JCS_Dual:
 
-                    else:
+                        if self.m_projection == enums.MomentProjection.Distal:
+                            R = self._getRotations(it.m_distalLabel,motionArrays)
+                        elif self.m_projection == enums.MomentProjection.Proximal:
+                            R = self._getRotations(proximalSegLabel,motionArrays)
 
-                        F = (1.0 / self.m_model.mp["Bodymass"]) * self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetForce().GetValues()
-                        M = (1.0 / self.m_model.mp["Bodymass"]) * self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetMoment().GetValues()
+                        # R^T.F for each frame
+                        forceValues = np.einsum("nji,nj->ni",R,F)
+                        momentValues = np.einsum("nji,nj->ni",R,M)
 
-                        proxSeg = self.m_model.getSegment(proximalSegLabel)
-                        distSeg = self.m_model.getSegment(it.m_distalLabel)
+                    else:
 
                         # WARNING : I keep X-Y-Z sequence in output
-                        forceValues = np.zeros((nFrames,3))
-                        momentValues = np.zeros((nFrames,3))
-
-                        for i in range(0,nFrames ):
-
-                            if it.m_sequence == "XYZ":
-                                e1 = proxSeg.anatomicalFrame.motion[i].m_axisX
-                                e3 = distSeg.anatomicalFrame.motion[i].m_axisZ
-                                order=[0,1,2]
+                        order = ["XYZ".index(axis) for axis in it.m_sequence]
 
-                            elif it.m_sequence == "XZY":
-                                e1 = proxSeg.anatomicalFrame.motion[i].m_axisX
-                                e3 = distSeg.anatomicalFrame.motion[i].m_axisY
-                                order=[0,2,1]
+                        e1 = self._getRotations(proximalSegLabel,motionArrays)[:,:,order[0]]
+                        e3 = self._getRotations(it.m_distalLabel,motionArrays)[:,:,order[2]]
 
-                            elif it.m_sequence == "YXZ":
-                                e1 = proxSeg.anatomicalFrame.motion[i].m_axisY
-                                e3 = distSeg.anatomicalFrame.motion[i].m_axisZ
-                                order=[1,0,2]
+                        e2= np.cross(e3,e1)
+                        e2=np.divide(e2,np.linalg.norm(e2,axis=1).reshape(-1,1))
 
-                            elif it.m_sequence == "YZX":
-                                e1 = proxSeg.anatomicalFrame.motion[i].m_axisY
-                                e3 = distSeg.anatomicalFrame.motion[i].m_axisX
-                                order=[1,2,0]
-
-                            elif it.m_sequence == "ZXY":
-                                e1 = proxSeg.anatomicalFrame.motion[i].m_axisZ
-                                e3 = distSeg.anatomicalFrame.motion[i].m_axisY
-                                order=[2,0,1]
-
-                            elif it.m_sequence == "ZYX":
-                                e1 = proxSeg.anatomicalFrame.motion[i].m_axisZ
-                                e3 = distSeg.anatomicalFrame.motion[i].m_axisX
-                                order=[2,1,0]
-
-                            e2= np.cross(e3,e1)
-                            e2=np.divide(e2,np.linalg.norm(e2))
-
-                            if self.m_projection == enums.MomentProjection.JCS_Dual:
+                        forceValues = np.zeros((nFrames,3))
+                        momentValues = np.zeros((nFrames,3))
 
-                                forceValues[i,order[0]] = np.divide(np.dot(np.cross(e2,e3),F[i]), np.dot(np.cross(e1,e2),e3))
-                                forceValues[i,order[1]] = np.divide(np.dot(np.cross(e3,e1),F[i]), np.dot(np.cross(e1,e2),e3))
-                                forceValues[i,order[2]] = np.divide(np.dot(np.cross(e1,e2),F[i]), np.dot(np.cross(e1,e2),e3))
+                        if self.m_projection == enums.MomentProjection.JCS_Dual:
+                            e2e3 = np.cross(e2,e3)
+                            e3e1 = np.cross(e3,e1)
+                            e1e2 = np.cross(e1,e2)
+                            mixedProduct = np.einsum("ij,ij->i",e1e2,e3)
 
-                                momentValues[i,order[0]] = np.divide(np.dot(np.cross(e2,e3),M[i]), np.dot(np.cross(e1,e2),e3))
-                                momentValues[i,order[1]] = np.dot(M[i],e2) #np.divide(np.dot(np.cross(e3,e1),M[i]), np.dot(np.cross(e1,e2),e3))
-                                momentValues[i,order[2]] = np.divide(np.dot(np.cross(e1,e2),M[i]), np.dot(np.cross(e1,e2),e3))
+                            forceValues[:,order[0]] = np.divide(np.einsum("ij,ij->i",e2e3,F), mixedProduct)
+                            forceValues[:,order[1]] = np.divide(np.einsum("ij,ij->i",e3e1,F), mixedProduct)
+                            forceValues[:,order[2]] = np.divide(np.einsum("ij,ij->i",e1e2,F), mixedProduct)
 
-                            if self.m_projection == enums.MomentProjection.JCS:
+                            momentValues[:,order[0]] = np.divide(np.einsum("ij,ij->i",e2e3,M), mixedProduct)
+                            momentValues[:,order[1]] = np.einsum("ij,ij->i",M,e2)
+                            momentValues[:,order[2]] = np.divide(np.einsum("ij,ij->i",e1e2,M), mixedProduct)
 
-                                forceValues[i,order[0]] = np.dot(F[i],e1)
-                                forceValues[i,order[1]] = np.dot(F[i],e2)
-                                forceValues[i,order[2]] = np.dot(F[i],e3)
+                        if self.m_projection == enums.MomentProjection.JCS:
 
-                                momentValues[i,order[0]] = np.dot(M[i],e1)
-                                momentValues[i,order[1]] = np.dot(M[i],e2)
-                                momentValues[i,order[2]] = np.dot(M[i],e3)
+                            for index,axis in zip(order,[e1,e2,e3]):
+                                forceValues[:,index] = np.einsum("ij,ij->i",F,axis)
+                                momentValues[:,index] = np.einsum("ij,ij->i",M,axis)
 
 
                     descriptorForceInfos = self.m_model.getClinicalDescriptor(enums.DataType.Force,jointLabel,projection = self.m_projection)
@@ -1403,6 +1372,8 @@ class InverseDynamicFilter(object):
 class JointPowerFilter(object):
     """
         Compute joint power
+
+        .. note:: the positive and negative joint works of each gait cycle ( J/kg) are stored in the member `m_jointWork`
     """
 
     def __init__(self, iMod, btkAcq, scaleToMeter =0.001):
@@ -1416,6 +1387,40 @@ class JointPowerFilter(object):
         self.m_aqui = btkAcq
         self.m_model = iMod
         self.m_scale = scaleToMeter
+        self.m_jointWork = dict()
+
+    def _getAngularVelocity(self,segmentLabel,angularVelocities):
+        """
+            angular velocity of a segment ( computed once)
+        """
+        if segmentLabel not in angularVelocities:
+            angularVelocities[segmentLabel] = self.m_model.getSegment(segmentLabel).getAngularVelocity(self.m_aqui.GetPointFrequency())
+        return angularVelocities[segmentLabel]
+
+    def _cycleWorks(self,power,context):
+        """
+            positive and negative work of each gait cycle ( between two successive foot strikes)
+
+            :Parameters:
+               - `power` (numpy.array(n,)) - joint power (W/kg)
+               - `context` (str) - event context
+
+            :Return:
+                - `works` (list) - dictionnary by cycle with keys *Start*, *End* ( frames), *Positive* and *Negative* (J/kg)
+        """
+        ff = self.m_aqui.GetFirstFrame()
+        dt = 1.0/self.m_aqui.GetPointFrequency()
+
+        works = list()
+        strikes = btkTools.getEventFrames(self.m_aqui,"Foot Strike",context) - ff
+        for start,end in zip(strikes[:-1],strikes[1:]):
+            if start >= 0 and end < power.shape[0]:
+                cyclePower = power[start:end+1]
+                works.append({"Start": start+ff,
+                              "End": end+ff,
+                              "Positive": np.trapz(np.clip(cyclePower,0.0,None),dx=dt),
+                              "Negative": np.trapz(np.clip(cyclePower,None,0.0),dx=dt)})
+        return works
 
     def compute(self, pointLabelSuffix=None):
         """
@@ -1427,6 +1432,9 @@ class JointPowerFilter(object):
                - `pointLabelSuffix` (str) - suffix ending the power label
         """
 
+        nFrames = self.m_aqui.GetPointFrameNumber()
+
+        joints = list()
         for it in  self.m_model.m_jointCollection:
             if "ForeFoot" not in it.m_label:
                 logging.debug("power of %s"  %(it.m_label))
@@ -1434,24 +1442,34 @@ class JointPowerFilter(object):
                 logging.debug("distal label :%s" %(it.m_distalLabel))
 
                 if self.m_model.getSegment(it.m_distalLabel).m_proximalWrench is not None:
-                    jointLabel = it.m_label
+                    joints.append(it)
 
-                    nFrames = self.m_aqui.GetPointFrameNumber()
+        if joints == []:
+            return
 
-                    prox_omegai = self.m_model.getSegment(it.m_proximalLabel).getAngularVelocity(self.m_aqui.GetPointFrequency())
-                    dist_omegai = self.m_model.getSegment(it.m_distalLabel).getAngularVelocity(self.m_aqui.GetPointFrequency())
+        # all joints in one pass
+        angularVelocities = dict()
+        moments = np.array([self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetMoment().GetValues() for it in joints])
+        relativeOmegas = np.array([self._getAngularVelocity(it.m_proximalLabel,angularVelocities) - self._getAngularVelocity(it.m_distalLabel,angularVelocities)
+                                   for it in joints])
 
-                    relativeOmega = prox_omegai - dist_omegai
+        powers = -1.0*(1.0 / self.m_model.mp["Bodymass"]) * self.m_scale * np.einsum("jni,jni->jn",moments,relativeOmegas)
 
-                    power = np.zeros((nFrames,3))
-                    for i in range(0, nFrames):
-                        power[i,2] = -1.0*(1.0 / self.m_model.mp["Bodymass"]) * self.m_scale * np.dot(self.m_model.getSegment(it.m_distalLabel).m_proximalWrench.GetMoment().GetValues()[i,:] ,relativeOmega[i,:])#
+        contexts = {enums.SegmentSide.Left : "Left", enums.SegmentSide.Right : "Right"}
 
+        for index,it in enumerate(joints):
+            jointLabel = it.m_label
 
-                    fulljointLabel  = jointLabel + "Power_" + pointLabelSuffix if pointLabelSuffix is not None else jointLabel+"Power"
-                    btkTools.smartAppendPoint(self.m_aqui,
-                                     fulljointLabel,
-                                     power,PointType=btk.btkPoint.Power, desc="")
+            power = np.zeros((nFrames,3))
+            power[:,2] = powers[index]
+
+            fulljointLabel  = jointLabel + "Power_" + pointLabelSuffix if pointLabelSuffix is not None else jointLabel+"Power"
+            btkTools.smartAppendPoint(self.m_aqui,
+                             fulljointLabel,
+                             power,PointType=btk.btkPoint.Power, desc="")
+
+            side = self.m_model.getSegment(it.m_distalLabel).side
+            self.m_jointWork[fulljointLabel] = self._cycleWorks(powers[index],contexts[side]) if side in contexts else list()
 
 
 class GeneralCoordinateSystemProcedure(object):
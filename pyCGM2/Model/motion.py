@@ -36,3 +36,33 @@ def segmentalLeastSquare(A, B):
 
 
     return R, L, RMSE, Am, Bm
+
+
+def batchSegmentalLeastSquare(A, B):
+    """
+        Compute the transformations between a reference marker cluster and its positions
+        over several frames using batched SVD.
+
+        :Parameters:
+            - `A` (numpy.array(m,3)) - reference coordinates [x,y,z] of at least three markers
+            - `B` (numpy.array(n,m,3)) - coordinates [x,y,z] of the same markers for n frames
+
+        :Return:
+            - `R` (numpy.array(n,3,3)) - Rotation matrices between A and B
+            - `L` (numpy.array(n,3)) - Translation vectors between A and B
+
+    """
+
+    Am = np.mean(A, axis=0)
+    Bm = np.mean(B, axis=1)
+    M = np.einsum("nmi,mj->nij", B - Bm[:,np.newaxis,:], A - Am)
+    # singular value decomposition
+    U, S, Vt = np.linalg.svd(M)
+    # rotation matrices
+    D = np.ones((B.shape[0],3))
+    D[:,2] = np.linalg.det(np.einsum("nij,njk->nik", U, Vt))
+    R = np.einsum("nij,nj,njk->nik", U, D, Vt)
+    # translation vectors
+    L = Bm - np.einsum("nij,j->ni", R, Am)
+
+    return R, L
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory stand-in of the ViconNexus client.
+
+The recorder implements the part of the ViconNexus API used by pyCGM2 for exporting
+model outputs, trajectories and events. Every call is recorded, outputs are stored
+as numpy arrays. It allows to check and benchmark Nexus exports without Nexus.
+
+usage ::
+
+    NEXUS = nexusRecorder.ViconNexusRecorder(frameCount = acq.GetLastFrame())
+    model.viconExport(NEXUS,acq,"subject",None,False)
+    data,exists = NEXUS.getModelOutputArrays("subject","LHipAngles")
+
+"""
+import numpy as np
+
+
+class ViconNexusRecorder(object):
+    """
+        recording in-memory ViconNexus client
+    """
+
+    def __init__(self, frameCount=0, subjectNames=None, trialRange=None):
+        """
+            :Parameters:
+               - `frameCount` (int) - number of frames of the trial
+               - `subjectNames` (list) - names of the subjects
+               - `trialRange` (tuple) - first and last frames of the trial. (1,frameCount) by default
+        """
+        self.m_frameCount = frameCount
+        self.m_subjectNames = list(subjectNames) if subjectNames is not None else list()
+        self.m_trialRange = trialRange if trialRange is not None else (1,frameCount)
+
+        self.m_calls = list()
+        self.m_outputs = dict()
+        self.m_trajectories = dict()
+        self.m_events = list()
+
+    def _record(self,name,*args):
+        self.m_calls.append((name,args))
+
+    def _create(self,subject,label,group,components,types):
+        if subject not in self.m_outputs:
+            self.m_outputs[subject] = dict()
+        if label in self.m_outputs[subject]:
+            raise Exception("[pyCGM2] model output (%s) already exists" %(label))
+        self.m_outputs[subject][label] = {"Group": group,
+                                          "Components": list(components),
+                                          "Types": list(types),
+                                          "Data": np.zeros((len(components),self.m_frameCount)),
+                                          "Exists": np.zeros(self.m_frameCount,dtype=bool)}
+
+    def _check(self,subject,label):
+        if label not in self.m_outputs.get(subject,dict()):
+            raise Exception("[pyCGM2] model output (%s) not created for subject (%s)" %(label,subject))
+
+    # ---- recorder ----
+    def getCallNumber(self,name=None):
+        """
+            return the number of recorded calls ( of one method if `name` is given)
+        """
+        if name is None:
+            return len(self.m_calls)
+        return len([it for it in self.m_calls if it[0] == name])
+
+    def getModelOutputArrays(self,subject,label):
+        """
+            return the data ( numpy.array(components,frames)) and the exists flags ( numpy.array(frames,)) of a model output
+        """
+        self._check(subject,label)
+        output = self.m_outputs[subject][label]
+        return np.copy(output["Data"]),np.copy(output["Exists"])
+
+    def reset(self):
+        self.m_calls = list()
+        self.m_outputs = dict()
+        self.m_trajectories = dict()
+        self.m_events = list()
+
+    # ---- ViconNexus API ----
+    def GetFrameCount(self):
+        self._record("GetFrameCount")
+        return self.m_frameCount
+
+    def GetTrialRange(self):
+        self._record("GetTrialRange")
+        return self.m_trialRange
+
+    def GetSubjectNames(self):
+        self._record("GetSubjectNames")
+        return list(self.m_subjectNames)
+
+    def GetModelOutputNames(self,subject):
+        self._record("GetModelOutputNames",subject)
+        return list(self.m_outputs.get(subject,dict()).keys())
+
+    def CreateModeledMarker(self,subject,label):
+        self._record("CreateModeledMarker",subject,label)
+        self._create(subject,label,"Modeled Markers",["X","Y","Z"],["Length","Length","Length"])
+
+    def CreateModelOutput(self,subject,label,group,components,types):
+        self._record("CreateModelOutput",subject,label,group,components,types)
+        self._create(subject,label,group,components,types)
+
+    def SetModelOutput(self,subject,label,data,exists):
+        self._record("SetModelOutput",subject,label)
+        self._check(subject,label)
+        output = self.m_outputs[subject][label]
+
+        data = np.array(data,dtype=float)
+        exists = np.array(exists,dtype=bool)
+        if data.shape != output["Data"].shape or exists.shape != output["Exists"].shape:
+            raise Exception("[pyCGM2] model output (%s) : dimensions mismatch" %(label))
+
+        output["Data"] = data
+        output["Exists"] = exists
+
+    def GetModelOutput(self,subject,label):
+        self._record("GetModelOutput",subject,label)
+        self._check(subject,label)
+        output = self.m_outputs[subject][label]
+        return output["Data"].tolist(), output["Exists"].tolist()
+
+    def SetTrajectory(self,subject,label,x,y,z,exists):
+        self._record("SetTrajectory",subject,label)
+        self.m_trajectories[(subject,label)] = (np.array([x,y,z],dtype=float).T,np.array(exists,dtype=bool))
+
+    def GetTrajectory(self,subject,label):
+        self._record("GetTrajectory",subject,label)
+        if (subject,label) not in self.m_trajectories:
+            return ([], [], [], [])
+        values,exists = self.m_trajectories[(subject,label)]
+        return values[:,0].tolist(),values[:,1].tolist(),values[:,2].tolist(),exists.tolist()
+
+    def GetMarkerNames(self,subject):
+        self._record("GetMarkerNames",subject)
+        return [it[1] for it in self.m_trajectories.keys() if it[0] == subject]
+
+    def CreateAnEvent(self,subject,context,label,frame,offset):
+        self._record("CreateAnEvent",subject,context,label,frame,offset)
+        self.m_events.append((subject,context,label,frame,offset))
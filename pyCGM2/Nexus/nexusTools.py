@@ -4,31 +4,18 @@ import numpy as np
 import logging
 
 from pyCGM2 import btk
+from pyCGM2.Model import frame
 
 
 
-def _setPointData(framecount,pfn,ff,lf,values):
+def _frameRange(framecount,pfn,ff,lf):
+    """
+        index range of the acquisition frames in the Nexus frames
+    """
     if framecount > pfn:
-        beg = ff-1
-        end = lf
+        return ff-1, lf
     else:
-        beg = 0
-        end = lf-ff+1
-
-    data =[list(np.zeros((framecount))), list(np.zeros((framecount))),list(np.zeros((framecount)))]
-    exists = [False]*framecount
-
-    j=0
-    for i in range(beg,end):
-        #print i
-        exists[i] = True
-        data[0][i] = values[j,0]
-        data[1][i] = values[j,1]
-        data[2][i] = values[j,2]
-        j+=1
-
-    
-    return data,exists
+        return 0, lf-ff+1
 
 
 
@@ -84,182 +71,156 @@ def setTrajectoryFromArray(NEXUS,vskName,label,array,firstFrame = 0):
     NEXUS.SetTrajectory( vskName, label, data[0],data[1],data[2], exists )
 
 
-def appendModelledMarkerFromAcq(NEXUS,vskName,label, acq):
-
-    lst = NEXUS.GetModelOutputNames(vskName)
-    if label in lst:
-        NEXUS.GetModelOutput(vskName, label)
-        logging.debug( "marker (%s) already exist" %(label))
-    else:
-        NEXUS.CreateModeledMarker(vskName, label)
-
-    values = acq.GetPoint(label).GetValues()
-
-    #ff,lf = NEXUS.GetTrialRange()
-    ff = acq.GetFirstFrame()
-    lf = acq.GetLastFrame()
-    framecount = NEXUS.GetFrameCount() # instead of GetFrameCount ( nexus7 API differed from nexus 2.6 API)
-    pfn = acq.GetPointFrameNumber()
-
-
-    data,exists = _setPointData(framecount,pfn,ff,lf,values)
-
-    NEXUS.SetModelOutput( vskName, label, data, exists )
+class ModelOutputExporter(object):
+    """
+        Batched export of model outputs to Nexus
 
+        Existing model output names and the frame count are queried once. Outputs are
+        stacked as numpy arrays, then pushed to Nexus with `export`.
 
+        usage ::
 
+            exporter = nexusTools.ModelOutputExporter(NEXUS,vskName,acq)
+            exporter.appendModelledMarker("LHJC")
+            exporter.appendAngle("LHipAngles")
+            exporter.appendBones("PELVIS", model.getSegment("Pelvis"))
+            exporter.export()
 
-def appendAngleFromAcq(NEXUS,vskName,label, acq):
+    """
 
-    lst = NEXUS.GetModelOutputNames(vskName)
-    if label in lst:
-        NEXUS.GetModelOutput(vskName, label)
-        logging.debug( "angle (%s) already exist" %(label))
-    else:
-        NEXUS.CreateModelOutput( vskName, label, "Angles", ["X","Y","Z"], ["Angle","Angle","Angle"])
+    def __init__(self,NEXUS,vskName,acq):
+        """
+            :Parameters:
+               - `NEXUS` () - Nexus environment
+               - `vskName` (str) - name of the subject created in Nexus
+               - `acq` (btkAcquisition) - acquisition with model outputs
+        """
+        self.m_nexus = NEXUS
+        self.m_vskName = vskName
+        self.m_acq = acq
 
-    values = acq.GetPoint(label).GetValues()
+        self.m_outputNames = set(NEXUS.GetModelOutputNames(vskName))
+        self.m_framecount = NEXUS.GetFrameCount() # instead of GetFrameCount ( nexus7 API differed from nexus 2.6 API)
 
-    #ff,lf = NEXUS.GetTrialRange()
-    ff = acq.GetFirstFrame()
-    lf = acq.GetLastFrame()
+        self.m_beg,self.m_end = _frameRange(self.m_framecount,acq.GetPointFrameNumber(),
+                                            acq.GetFirstFrame(),acq.GetLastFrame())
+        exists = np.zeros(self.m_framecount,dtype=bool)
+        exists[self.m_beg:self.m_end] = True
+        self.m_exists = exists.tolist()
 
-    framecount = NEXUS.GetFrameCount()
-    pfn = acq.GetPointFrameNumber()
-    data,exists = _setPointData(framecount,pfn,ff,lf,values)
+        self.m_outputs = list()
 
-    NEXUS.SetModelOutput( vskName, label, data, exists )
+    def _append(self,label,creation,values):
+        data = np.zeros((values.shape[1],self.m_framecount))
+        data[:,self.m_beg:self.m_end] = values[0:self.m_end-self.m_beg,:].T
+        self.m_outputs.append((label,creation,data))
 
+    def _appendPoint(self,label,creation):
+        self._append(label,creation,self.m_acq.GetPoint(label).GetValues())
 
+    def appendModelledMarker(self,label):
+        self._appendPoint(label,None)
 
-def appendForceFromAcq(NEXUS,vskName,label, acq,normalizedData=True):
+    def appendAngle(self,label):
+        self._appendPoint(label,("Angles", ["X","Y","Z"], ["Angle","Angle","Angle"]))
 
-    lst = NEXUS.GetModelOutputNames(vskName)
-    if label in lst:
-        NEXUS.GetModelOutput(vskName, label)
-        logging.debug( "force (%s) already exist" %(label))
-    else:
+    def appendForce(self,label,normalizedData=True):
         if normalizedData:
-            NEXUS.CreateModelOutput( vskName, label, "Forces", ["X","Y","Z"], ["Force","Force","Force"])
+            self._appendPoint(label,("Forces", ["X","Y","Z"], ["Force","Force","Force"]))
         else:
-            NEXUS.CreateModelOutput( vskName, label, "Forces", ["X","Y","Z"], ["ForceNormalized","ForceNormalized","ForceNormalized"])
-
-    values = acq.GetPoint(label).GetValues()
-
-    #ff,lf = NEXUS.GetTrialRange()
-    ff = acq.GetFirstFrame()
-    lf = acq.GetLastFrame()
-    framecount = NEXUS.GetFrameCount()
-    pfn = acq.GetPointFrameNumber()
-    data,exists = _setPointData(framecount,pfn,ff,lf,values)
-
-    NEXUS.SetModelOutput( vskName, label, data, exists )
-
-
-
-def appendMomentFromAcq(NEXUS,vskName,label, acq,normalizedData=False):
+            self._appendPoint(label,("Forces", ["X","Y","Z"], ["ForceNormalized","ForceNormalized","ForceNormalized"]))
 
-    lst = NEXUS.GetModelOutputNames(vskName)
-    if label in lst:
-        NEXUS.GetModelOutput(vskName, label)
-        logging.debug( "moment (%s) already exist" %(label))
-    else:
+    def appendMoment(self,label,normalizedData=False):
         if normalizedData:
-            NEXUS.CreateModelOutput( vskName, label, "Moments", ["X","Y","Z"], ["TorqueNormalized","TorqueNormalized","TorqueNormalized"])#
+            self._appendPoint(label,("Moments", ["X","Y","Z"], ["TorqueNormalized","TorqueNormalized","TorqueNormalized"]))
         else:
-            NEXUS.CreateModelOutput( vskName, label, "Moments", ["X","Y","Z"], ["Torque","Torque","Torque"])
-
-
-    values = acq.GetPoint(label).GetValues()
-
-    #ff,lf = NEXUS.GetTrialRange()
-    ff = acq.GetFirstFrame()
-    lf = acq.GetLastFrame()
-    framecount = NEXUS.GetFrameCount()
-    pfn = acq.GetPointFrameNumber()
-    data,exists = _setPointData(framecount,pfn,ff,lf,values)
-
-    NEXUS.SetModelOutput( vskName, label, data, exists )
-
-def appendPowerFromAcq(NEXUS,vskName,label, acq,normalizedData=True):
+            self._appendPoint(label,("Moments", ["X","Y","Z"], ["Torque","Torque","Torque"]))
 
-    lst = NEXUS.GetModelOutputNames(vskName)
-    if label in lst:
-        NEXUS.GetModelOutput(vskName, label)
-        logging.debug( "power (%s) already exist" %(label))
-    else:
+    def appendPower(self,label,normalizedData=True):
         if normalizedData:
-            NEXUS.CreateModelOutput( vskName, label, "Powers", ["X","Y","Z"], ["Power","Power","Power"])
+            self._appendPoint(label,("Powers", ["X","Y","Z"], ["Power","Power","Power"]))
+        else:
+            self._appendPoint(label,("Powers", ["X","Y","Z"], ["PowerNormalized","PowerNormalized","PowerNormalized"]))
+
+    def appendBones(self,label,segment,OriginValues=None,manualScale=None):
+        """
+            append the Plug-in Gait bone of a segment ( angle-axis, origin and scale)
+
+            :Parameters:
+               - `label` (str) - label of the bone
+               - `segment` (pyCGM2.Model.model.Segment) - segment
+               - `OriginValues` (numpy.array(n,3)) - origin of the bone. Origin of the anatomical frame by default
+               - `manualScale` (float) - scale of the bone. Length of the segment by default
+        """
+        n = self.m_end-self.m_beg
+        R,t = segment.anatomicalFrame.getMotionArrays()
+
+        values = np.zeros((n,9))
+        values[:,0:3] = frame.angleAxisFromMatrices(R[0:n])
+        if OriginValues is None:
+            values[:,3:6] = t[0:n]
         else:
-            NEXUS.CreateModelOutput( vskName, label, "Powers", ["X","Y","Z"], ["PowerNormalized","PowerNormalized","PowerNormalized"])
+            values[:,3:6] = OriginValues[0:n,:]
+        values[:,6:9] = segment.m_bsp["length"] if manualScale is None else manualScale
 
+        self._append(label,('Plug-in Gait Bones', ['RX', 'RY', 'RZ', 'TX', 'TY', 'TZ', 'SX', 'SY', 'SZ'], ['Angle', 'Angle', 'Angle', 'Length', 'Length', 'Length', 'Length', 'Length', 'Length']),
+                     values)
 
-    values = acq.GetPoint(label).GetValues()
+    def export(self):
+        """
+            create the missing model outputs and push all appended outputs to Nexus
 
-    #ff,lf = NEXUS.GetTrialRange()
-    ff = acq.GetFirstFrame()
-    lf = acq.GetLastFrame()
-    framecount = NEXUS.GetFrameCount()
-    pfn = acq.GetPointFrameNumber()
-    data,exists = _setPointData(framecount,pfn,ff,lf,values)
+            :Return:
+                - `number` (int) - number of exported outputs
+        """
+        NEXUS = self.m_nexus
+        vskName = self.m_vskName
 
-    NEXUS.SetModelOutput( vskName, label, data, exists )
+        for label,creation,data in self.m_outputs:
+            if label in self.m_outputNames:
+                logging.debug( "model output (%s) already exist" %(label))
+            elif creation is None:
+                NEXUS.CreateModeledMarker(vskName, label)
+            else:
+                NEXUS.CreateModelOutput(vskName, label, creation[0], creation[1], creation[2])
+            self.m_outputNames.add(label)
 
-def appendBones(NEXUS,vskName,acq,label,segment,OriginValues=None,manualScale=None):
+            NEXUS.SetModelOutput( vskName, label, data.tolist(), self.m_exists )
 
-    lst = NEXUS.GetModelOutputNames(vskName)
-    if label in lst:
-        NEXUS.GetModelOutput(vskName, label)
-    else:
-        NEXUS.CreateModelOutput( vskName, label, 'Plug-in Gait Bones', ['RX', 'RY', 'RZ', 'TX', 'TY', 'TZ', 'SX', 'SY', 'SZ'], ['Angle', 'Angle', 'Angle', 'Length', 'Length', 'Length', 'Length', 'Length', 'Length'])
+        number = len(self.m_outputs)
+        self.m_outputs = list()
+        return number
 
-    #ff,lf = NEXUS.GetTrialRange()
-    ff = acq.GetFirstFrame()
-    lf = acq.GetLastFrame()
-    pfn = acq.GetPointFrameNumber()
-    framecount = NEXUS.GetFrameCount()
 
-    if framecount > pfn:
-        beg = ff-1
-        end = lf
-    else:
-        beg = 0
-        end = lf-ff+1
-
-
-    data =[list(np.zeros((framecount))), list(np.zeros((framecount))),list(np.zeros((framecount))),
-           list(np.zeros((framecount))), list(np.zeros((framecount))),list(np.zeros((framecount))),
-           list(np.zeros((framecount))), list(np.zeros((framecount))),list(np.zeros((framecount)))]
-    exists = [False]*framecount
+def appendModelledMarkerFromAcq(NEXUS,vskName,label, acq):
+    exporter = ModelOutputExporter(NEXUS,vskName,acq)
+    exporter.appendModelledMarker(label)
+    exporter.export()
 
-    j=0
-    for i in range(beg,end):
-        if OriginValues is None:
-            T= segment.anatomicalFrame.motion[j].getTranslation()
-        else:
-            T = OriginValues[j,:]
+def appendAngleFromAcq(NEXUS,vskName,label, acq):
+    exporter = ModelOutputExporter(NEXUS,vskName,acq)
+    exporter.appendAngle(label)
+    exporter.export()
 
-        R= segment.anatomicalFrame.motion[j].getAngleAxis()
+def appendForceFromAcq(NEXUS,vskName,label, acq,normalizedData=True):
+    exporter = ModelOutputExporter(NEXUS,vskName,acq)
+    exporter.appendForce(label,normalizedData=normalizedData)
+    exporter.export()
 
-        if manualScale is None:
-            S = segment.m_bsp["length"]
-        else:
-            S = manualScale
-
-        exists[i] = True
-        data[0][i] = R[0]
-        data[1][i] = R[1]
-        data[2][i] = R[2]
-        data[3][i] = T[0]
-        data[4][i] = T[1]
-        data[5][i] = T[2]
-        data[6][i] = S
-        data[7][i] = S
-        data[8][i] = S
+def appendMomentFromAcq(NEXUS,vskName,label, acq,normalizedData=False):
+    exporter = ModelOutputExporter(NEXUS,vskName,acq)
+    exporter.appendMoment(label,normalizedData=normalizedData)
+    exporter.export()
 
-        j+=1
+def appendPowerFromAcq(NEXUS,vskName,label, acq,normalizedData=True):
+    exporter = ModelOutputExporter(NEXUS,vskName,acq)
+    exporter.appendPower(label,normalizedData=normalizedData)
+    exporter.export()
 
-    NEXUS.SetModelOutput( vskName, label, data, exists )
+def appendBones(NEXUS,vskName,acq,label,segment,OriginValues=None,manualScale=None):
+    exporter = ModelOutputExporter(NEXUS,vskName,acq)
+    exporter.appendBones(label,segment,OriginValues=OriginValues,manualScale=manualScale)
+    exporter.export()
 
 
 def createGeneralEvents(NEXUS,subject,acq,labels):
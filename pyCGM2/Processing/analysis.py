@@ -1,13 +1,11 @@
 # -*- coding: utf-8 -*-
 #import ipdb
 import numpy as np
-import pandas as pd
 import logging
 
 
 # pyCGM2
 import pyCGM2.Processing.cycle as CGM2cycle
-from pyCGM2.Tools import exportTools
 
 # openMA ( TODO -  generate single c3d)
 from pyCGM2 import ma
@@ -57,6 +55,7 @@ class Analysis():
         self.emgStats=AnalysisStructure()
         self.gps= None
         self.gvs = None
+        self.gdi = None
         self.coactivations=dict()
         self.subjectInfo=None
         self.experimentalInfo=None
@@ -87,6 +86,11 @@ class Analysis():
     def setGvs(self,gvsStats):
         self.gvs = gvsStats
 
+    def setGdi(self,GdiStatsOverall,GdiStatsContext):
+        self.gdi = dict()
+        self.gdi["Overall"] = GdiStatsOverall
+        self.gdi["Context"] = GdiStatsContext
+
     def setSubjectInfo(self,subjectDict):
         self.subjectInfo = subjectDict
 
@@ -2,7 +2,6 @@
 import numpy as np
 import pandas as pd
 import logging
-import matplotlib.pyplot as plt
 from collections import OrderedDict
 
 from pyCGM2.Tools import exportTools
@@ -145,6 +144,7 @@ class BenedettiProcedure(object):
 
     # TEST -----------------
     def __detectTest(self,analysisInstance,pointLabel,context):
+        import matplotlib.pyplot as plt
 
 #        normalizedCycleValues = analysisInstance.kinematicStats.data [pointLabel+self.pointSuffix,context]
 #        loadingResponseValues = analysisInstance.kinematicStats.pst['doubleStance1', context]['values']
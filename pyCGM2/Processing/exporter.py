@@ -443,6 +443,35 @@ class XlsAnalysisExportFilter(object):
             df_descriptiveGvs.to_excel(xlsxWriter,'descriptive GVS ')
             df_allGvs.to_excel(xlsxWriter,'GVS cycles ')
 
+        # GDI ( analysis saved before GDI implementation dont have the attribute)
+        if getattr(self.analysis,"gdi",None) is not None:
+
+            df_descriptiveGdiByContext = exportTools.buid_df_descriptiveCycle1_1_onlyContext(self.analysis.gdi["Context"], "Gdi")
+            df_descriptiveGdiOverall = exportTools.buid_df_descriptiveCycle1_1_overall(self.analysis.gdi["Overall"],"Gdi")
+            df_descriptiveGdi =  pd.concat([df_descriptiveGdiOverall,df_descriptiveGdiByContext])
+
+            df_allGdiByContext = exportTools.buid_df_cycles1_1_onlyContext(self.analysis.gdi["Context"], "Gdi")
+
+            # add infos
+            for itdf in [df_descriptiveGdi,df_allGdiByContext]:
+                if modelInfo is not None:
+                    for key,value in modelInfo.items():
+                        exportTools.isColumnNameExist( itdf, key)
+                        itdf[key] = value
+
+                if subjInfo is not None:
+                    for key,value in subjInfo.items():
+                        exportTools.isColumnNameExist( itdf, key)
+                        itdf[key] = value
+                if condExpInfo is not None:
+                    for key,value in condExpInfo.items():
+                        exportTools.isColumnNameExist( itdf, key)
+                        itdf[key] = value
+
+
+            df_descriptiveGdi.to_excel(xlsxWriter,'descriptive GDI ')
+            df_allGdiByContext.to_excel(xlsxWriter,'GDI cycles ')
+
 
         # Kinematics ouput
         #---------------------------
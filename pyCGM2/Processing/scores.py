@@ -1,7 +1,37 @@
 # -*- coding: utf-8 -*-
+import os
+import logging
+import hashlib
 import numpy as np
 
-from pyCGM2.Math import numeric
+import pyCGM2
+
+
+def _stackedRms(values,valuesNorm):
+    """ rms of each cycle against a normative curve
+
+    :Parameters:
+        - `values` (list or numpy.array(nCycles,101,3)) - normalized cycles
+        - `valuesNorm` (numpy.array(101 or 51,3)) - normative mean
+
+    :Return:
+        - `rms` (numpy.array(nCycles,3))
+
+    """
+    stack = np.asarray(values,dtype=float)
+    if stack.shape[0] == 0:
+        return np.zeros((0,3))
+
+    if valuesNorm.shape[0] == 51:
+        stack = stack[:,0:101:2,:]
+
+    return np.sqrt(np.mean((stack-valuesNorm[np.newaxis,:,:])**2,axis=1))
+
+def _descriptiveStats(values):
+    return {'mean':np.array([np.mean(values)]),
+            'std':np.array([np.std(values)]),
+            'median': np.array([np.median(values)]),
+            'values': values}
 
 
 class ScoreFilter(object):
@@ -12,17 +42,24 @@ class ScoreFilter(object):
 
         self.m_score = scoreProcedure
 
-        # construct normative data
-        normativeProcedure.constructNormativeData()
-        self.m_normativeData =  normativeProcedure.data
+        # construct normative data ( not required by the GDI procedure)
+        if normativeProcedure is not None:
+            normativeProcedure.constructNormativeData()
+            self.m_normativeData =  normativeProcedure.data
+        else:
+            self.m_normativeData = None
 
         self.m_analysis=analysis
 
 
     def compute(self):
-        descriptiveGvsStats,descriptiveGpsStats_context,descriptiveGpsStats = self.m_score.compute(self.m_analysis,self.m_normativeData)
-        self.m_analysis.setGps(descriptiveGpsStats,descriptiveGpsStats_context)
-        self.m_analysis.setGvs(descriptiveGvsStats)
+        if isinstance(self.m_score,GDI):
+            descriptiveGdiStats_context,descriptiveGdiStats = self.m_score.compute(self.m_analysis,self.m_normativeData)
+            self.m_analysis.setGdi(descriptiveGdiStats,descriptiveGdiStats_context)
+        else:
+            descriptiveGvsStats,descriptiveGpsStats_context,descriptiveGpsStats = self.m_score.compute(self.m_analysis,self.m_normativeData)
+            self.m_analysis.setGps(descriptiveGpsStats,descriptiveGpsStats_context)
+            self.m_analysis.setGvs(descriptiveGvsStats)
 
 
 class CGM1_GPS(object):
@@ -53,84 +90,29 @@ class CGM1_GPS(object):
 
     def compute(self,analysis,normativeData):
 
+        # --- GVS ---
+        # rms of each cycle against the normative mean, computed on stacked cycles ( nCycles,101,3)
         gvs = dict()
-
-        nLeftCycles,nRightCycles = analysis.getKinematicCycleNumbers()
-
-        # --- MAP ---
-        # left cycles
         for label,context in self.matchingNormativeDataLabel.keys():
-            matchingNormativeDataLabel = self.matchingNormativeDataLabel[label,context]
-            if context == "Left":
-                left_rms_local = np.zeros((nLeftCycles,3))
-                for i in range(0,nLeftCycles):
-                    values = analysis.kinematicStats.data[label, context]["values"][i]
-                    valuesNorm = normativeData[matchingNormativeDataLabel]["mean"]
-
-                    if valuesNorm.shape[0] == 51:
-                        rms = numeric.rms(values[0:101:2]-valuesNorm,axis=0)
-                    else:
-                        rms = numeric.rms(values-valuesNorm,axis=0)
-
-                    left_rms_local[i,:] = rms
-
-                gvs[label,context]=left_rms_local
-
-
-        # right cycles
-        for label,context in self.matchingNormativeDataLabel.keys():
-            matchingNormativeDataLabel = self.matchingNormativeDataLabel[label,context]
-            if context == "Right":
-                right_rms_local = np.zeros((nRightCycles,3))
-                for i in range(0,nRightCycles):
-                    values = analysis.kinematicStats.data[label, context]["values"][i]
-                    valuesNorm = normativeData[matchingNormativeDataLabel]["mean"]
-
-                    if valuesNorm.shape[0] == 51:
-                        rms = numeric.rms(values[0:101:2]-valuesNorm,axis=0)
-                    else:
-                        rms = numeric.rms(values-valuesNorm,axis=0)
-
-                    right_rms_local[i,:] = rms
-
-                gvs[label,context]=right_rms_local
-
-
+            valuesNorm = normativeData[self.matchingNormativeDataLabel[label,context]]["mean"]
+            gvs[label,context] = _stackedRms(analysis.kinematicStats.data[label, context]["values"],valuesNorm)
 
         # --- GPS ---
-
         # number of axis. 15 according articles ( left )
         n_axis =0
         for axis in self.axes:
             n_axis = n_axis + len(self.axes[axis])
 
-        # computation of rms for left cycles
-        left_rms_global = np.zeros((nLeftCycles,n_axis))
-        for i in range(0,nLeftCycles):
-            cumAxis =0
-            for label,context in  gvs.keys():
-                if context == "Left":
-                    axisIndex = self.axes[self.matchingNormativeDataLabel[label,context]] # use of the tip here
-                    for axis in axisIndex:
-                        left_rms_global[i,cumAxis] = gvs[label,context][i,axis]
-                        cumAxis+=1
-
-        # computation of rms for right cycles
-        right_rms_global = np.zeros((nRightCycles,n_axis))
-        for i in range(0,nRightCycles):
-            cumAxis =0
-            for label,context in  gvs.keys():
-                if context == "Right":
-                    axisIndex = self.axes[self.matchingNormativeDataLabel[label,context]]
-                    for axis in axisIndex:
-                        right_rms_global[i,cumAxis] = gvs[label,context][i,axis]
-                        cumAxis+=1
-
+        # gps of a cycle from the gvs values of the axis selected for each joint
+        gpsValues = dict()
+        for context in ["Left","Right"]:
+            selectedGvs = [gvs[label,itContext][:,self.axes[self.matchingNormativeDataLabel[label,itContext]]]
+                            for label,itContext in self.matchingNormativeDataLabel.keys() if itContext == context]
+            gpsValues[context] = np.concatenate(selectedGvs,axis=1).sum(axis=1)/n_axis
 
         # output dictionnary
         outDict_gvs = dict()
         outDict_gps_context = dict()
-        outDict_gps = dict()
 
         for label,context in self.matchingNormativeDataLabel.keys():
             outDict_gvs[label,context]={'mean':np.mean(gvs[label, context],axis=0),
@@ -138,28 +120,134 @@ class CGM1_GPS(object):
                                           'median': np.median(gvs[label, context],axis=0),
                                           'values':gvs[label,context]}
         for context in ["Left","Right"]:
-            gpsValues = left_rms_global if context == "Left" else right_rms_global
-            # construction of the global dictionnary outputs
-            outDict_gps_context[context]={'mean':np.array([np.mean(gpsValues.mean(axis=1))]),
-                                      'std':np.array([np.std(gpsValues.mean(axis=1))]),
-                                       'median': np.array([np.median(gpsValues.mean(axis=1))]),
-                                       'values': gpsValues.mean(axis=1)}
-
+            outDict_gps_context[context] = _descriptiveStats(gpsValues[context])
 
         overall_gps_values = np.concatenate((outDict_gps_context["Right"]["values"],outDict_gps_context["Left"]["values"]))
-
-
-        outDict_gps={'mean':np.array([np.mean(overall_gps_values)]),
-                          'std':np.array([np.std(overall_gps_values)]),
-                           'median': np.array([np.median(overall_gps_values)]),
-                           'values': overall_gps_values}
+        outDict_gps = _descriptiveStats(overall_gps_values)
 
         return outDict_gvs, outDict_gps_context,outDict_gps
 
 
 class GDI(object):
-    def __init__(self):
+    """
+        Gait Deviation Index ( Schwartz and Rozumalski, 2008)
+
+        A cycle is described by a feature vector of 459 values ( 9 kinematic curves at 2% of the gait cycle).
+        The feature vectors of a reference set of typically-developing cycles are reduced by SVD.
+        The GDI of a cycle is derived from the log of its distance to the mean reference cycle in the reduced space.
+
+        :Parameters:
+            - `referenceFeatures` (numpy.array(nCycles,459) or str) - reference feature vectors or filename of a npy file.
+              by default, the file gdi\\gdiReference.npy of the normative data folder is used.
+            - `cacheFilename` (str) - filename of the npz file storing the SVD reduction. by default, stored next to the reference file
+            - `pointSuffix` (str) - suffix added to the kinematic labels
+            - `nFeatures` (int) - number of retained features ( default 15)
+
+        .. note:: a reference feature matrix can be built from an analysis of typically-developing subjects with the method `features`
+
+    """
+
+    # label ( without side letter) and axis index of the 9 kinematic curves. tip is to use label from normative dataset
+    KINEMATICS = [("PelvisAngles",0),("PelvisAngles",1),("PelvisAngles",2),
+                  ("HipAngles",0),("HipAngles",1),("HipAngles",2),
+                  ("KneeAngles",0),
+                  ("AnkleAngles",0),
+                  ("FootProgressAngles",2)]
+
+    def __init__(self,referenceFeatures=None,cacheFilename=None,pointSuffix=None,nFeatures=15):
         self.name = "Gait Deviation index"
 
-    def compute(self):
-        pass
+        self.m_pointSuffix = str("_"+pointSuffix)  if (pointSuffix is not None) else ""
+        self.m_nFeatures = nFeatures
+
+        if referenceFeatures is None:
+            referenceFeatures = pyCGM2.NORMATIVE_DATABASE_PATH+"gdi\\gdiReference.npy"
+
+        if isinstance(referenceFeatures,basestring):
+            if not os.path.isfile(referenceFeatures):
+                raise Exception("[pyCGM2] GDI reference feature file (%s) not found"%(referenceFeatures))
+            if cacheFilename is None:
+                cacheFilename = os.path.splitext(referenceFeatures)[0]+"-svd.npz"
+            referenceFeatures = np.load(referenceFeatures)
+
+        self.m_referenceFeatures = np.asarray(referenceFeatures,dtype=float)
+        self.m_cacheFilename = cacheFilename
+
+        self.m_reduction = None
+
+    def features(self,analysis,context):
+        """
+            **Description :** return the feature vectors of all cycles of a context
+
+            :Parameters:
+                 - `analysis` (pyCGM2.Processing.analysis.Analysis) - analysis instance
+                 - `context` (str) - Left or Right
+
+            :Return:
+                - `features` (numpy.array(nCycles,459))
+        """
+        letter = context[0]
+        curves = list()
+        for label,axis in GDI.KINEMATICS:
+            stack = np.asarray(analysis.kinematicStats.data[letter+label+self.m_pointSuffix, context]["values"],dtype=float)
+            if stack.shape[0] == 0:
+                return np.zeros((0,51*len(GDI.KINEMATICS)))
+            curves.append(stack[:,0:101:2,axis])
+
+        return np.concatenate(curves,axis=1)
+
+    def _reduce(self):
+        """ SVD reduction of the reference set. the reduction is cached on disk and invalidated by the reference content
+        """
+        checksum = hashlib.md5(np.ascontiguousarray(self.m_referenceFeatures).tostring()).hexdigest()+"-"+str(self.m_nFeatures)
+
+        if self.m_cacheFilename is not None and os.path.isfile(self.m_cacheFilename):
+            with np.load(self.m_cacheFilename) as cache:
+                if str(cache["checksum"]) == checksum:
+                    self.m_reduction = dict((key,cache[key]) for key in ["basis","referenceMean","rawMean","rawStd"])
+                    return
+
+        u,s,vt = np.linalg.svd(self.m_referenceFeatures,full_matrices=False)
+        basis = vt[0:self.m_nFeatures,:].T
+
+        referenceCoefficients = np.dot(self.m_referenceFeatures,basis)
+        referenceMean = referenceCoefficients.mean(axis=0)
+        raw = np.log(np.linalg.norm(referenceCoefficients-referenceMean,axis=1))
+
+        self.m_reduction = {"basis":basis,
+                            "referenceMean":referenceMean,
+                            "rawMean":np.array(raw.mean()),
+                            "rawStd":np.array(raw.std(ddof=1))}
+
+        if self.m_cacheFilename is not None:
+            try:
+                np.savez(self.m_cacheFilename,checksum=np.array(checksum),**self.m_reduction)
+            except (IOError,OSError):
+                logging.warning("[pyCGM2] GDI cache (%s) can t be written"%(self.m_cacheFilename))
+
+    def score(self,features):
+        """
+            **Description :** return the GDI of a batch of feature vectors
+
+            :Parameters:
+                 - `features` (numpy.array(nCycles,459)) - feature vectors
+
+        """
+        if self.m_reduction is None:
+            self._reduce()
+
+        coefficients = np.dot(features,self.m_reduction["basis"])
+        raw = np.log(np.linalg.norm(coefficients-self.m_reduction["referenceMean"],axis=1))
+
+        return 100.0 - 10.0*(raw-self.m_reduction["rawMean"])/self.m_reduction["rawStd"]
+
+    def compute(self,analysis,normativeData):
+
+        outDict_gdi_context = dict()
+        for context in ["Left","Right"]:
+            outDict_gdi_context[context] = _descriptiveStats(self.score(self.features(analysis,context)))
+
+        overall_gdi_values = np.concatenate((outDict_gdi_context["Right"]["values"],outDict_gdi_context["Left"]["values"]))
+        outDict_gdi = _descriptiveStats(overall_gdi_values)
+
+        return outDict_gdi_context,outDict_gdi
@@ -280,7 +280,10 @@ class KinematicsPlotComparisonViewer(plotViewers.AbstractPlotViewer):
             raise Exception ("[pyCGM2] need definition of the concrete plot function")
 
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
         self.__setLegend(0)
 
@@ -592,7 +595,10 @@ class KineticsPlotComparisonViewer(plotViewers.AbstractPlotViewer):
         if self.m_concretePlotFunction is None:
             raise Exception ("[pyCGM2] need definition of the concrete plot function")
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
         self.__setLegend(0)
 
@@ -110,7 +110,10 @@ class TemporalEmgPlotViewer(plotViewers.AbstractPlotViewer):
 
     def plotPanel(self):
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         # normative dataset not implemented
@@ -198,7 +201,10 @@ class CoactivationEmgPlotViewer(plotViewers.AbstractPlotViewer):
 
     def plotPanel(self):
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         # normative dataset not implemented
@@ -316,7 +322,10 @@ class EnvEmgGaitPlotPanelViewer(plotViewers.AbstractPlotViewer):
 
     def plotPanel(self):
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         # normative dataset not implemented
@@ -453,7 +462,10 @@ class MultipleAnalysis_EnvEmgGaitPlotPanelViewer(plotViewers.AbstractPlotViewer)
     def plotPanel(self):
 
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
         self.__setLegend(0)
 
@@ -1,9 +1,100 @@
 # -*- coding: utf-8 -*-
+import os
 import logging
 import numpy as np
-import pandas as pd
 import pyCGM2
 
+# in-process registry of the normative datasets already loaded.
+# key : (source filename, modality) , value : (source mtime, data dictionnary)
+_NORMATIVE_REGISTRY = dict()
+
+
+def _cacheFilename(filename,modality):
+    """ return the filename of the npz cache stored next to the source file
+    """
+    return os.path.splitext(filename)[0]+"-"+str(modality)+".npz"
+
+def _dictToArrays(data):
+    """ convert a normative dictionnary ( label -> field -> value) into flat arrays
+    """
+    labels = sorted(data.keys())
+    fields = sorted(data[labels[0]].keys()) if labels !=[] else []
+
+    arrays = dict()
+    arrays["labels"] = np.array(labels)
+    arrays["fields"] = np.array(fields)
+    for field in fields:
+        arrays["field_"+field] = np.array([data[label][field] for label in labels])
+    return arrays
+
+def _arraysToDict(arrays):
+    """ convert flat arrays back into a normative dictionnary
+    """
+    data = dict()
+    labels = arrays["labels"].tolist()
+    fields = arrays["fields"].tolist()
+    for i,label in enumerate(labels):
+        data[label]=dict()
+        for field in fields:
+            value = arrays["field_"+field][i]
+            data[label][field] = np.array(value) if np.ndim(value) !=0 else value.item()
+    return data
+
+def _copyDict(data):
+    return dict((label, dict((field,np.copy(value) if isinstance(value,np.ndarray) else value)
+                             for field,value in data[label].items()))
+                for label in data.keys())
+
+def clearNormativeRegistry():
+    """
+        **Description :** empty the in-process registry of normative datasets ( npz files are not removed)
+    """
+    _NORMATIVE_REGISTRY.clear()
+
+def loadNormativeData(filename,modality,parser):
+    """
+        **Description :** return the normative dictionnary of a source file for a given modality.
+
+        The source file is parsed once with the function `parser` then stored as a npz cache next to the source.
+        The npz cache is invalidated as soon as the source file is modified. Loaded datasets are memoized in-process.
+
+        :Parameters:
+             - `filename` (str) - full filename of the source file (xlsx)
+             - `modality` (str) - modality of the dataset ( ex : Free, CentreOne)
+             - `parser` (function) - function without argument returning the normative dictionnary from the source
+
+        :Return:
+            - `data` (dict) - copy of the normative dictionnary
+
+    """
+    key = (filename,modality)
+    sourceTime = os.path.getmtime(filename) if os.path.isfile(filename) else None
+
+    if key in _NORMATIVE_REGISTRY and _NORMATIVE_REGISTRY[key][0] == sourceTime:
+        return _copyDict(_NORMATIVE_REGISTRY[key][1])
+
+    cacheFilename = _cacheFilename(filename,modality)
+    data = None
+    if os.path.isfile(cacheFilename) and (sourceTime is None or os.path.getmtime(cacheFilename) >= sourceTime):
+        try:
+            with np.load(cacheFilename) as arrays:
+                data = _arraysToDict(arrays)
+            logging.debug("[pyCGM2] normative data loaded from cache (%s)"%(cacheFilename))
+        except Exception:
+            logging.warning("[pyCGM2] normative cache (%s) unreadable. Source file parsed again"%(cacheFilename))
+            data = None
+
+    if data is None:
+        data = parser()
+        try:
+            np.savez(cacheFilename,**_dictToArrays(data))
+        except (IOError,OSError):
+            logging.warning("[pyCGM2] normative cache (%s) can t be written"%(cacheFilename))
+
+    _NORMATIVE_REGISTRY[key] = (sourceTime,data)
+
+    return _copyDict(data)
+
 
 class NormalSTP(object):
 
@@ -14,12 +105,11 @@ class NormalSTP(object):
         self.m_filename = pyCGM2.NORMATIVE_DATABASE_PATH+"stp\\normal_stp.xlsx"
         self.data = dict()
 
-    def constructNormativeData(self):
-
-        """
-            **Description :**  Read initial xls file and construct the member dictionnary (data)
+    def __parse(self):
+        """ Read initial xls file and construct the member dictionnary (data)
         """
-
+        import pandas as pd
+        self.data = dict()
         values =pd.read_excel(self.m_filename,sheetname = "Nantes")
 
         for index, row in values.iterrows():
@@ -27,6 +117,15 @@ class NormalSTP(object):
             self.data[row["Label"]]["Mean"] = row["Mean"]
             self.data[row["Label"]]["Std"] = row["Std"]
 
+        return self.data
+
+    def constructNormativeData(self):
+
+        """
+            **Description :**  construct the member dictionnary (data) from the cached xls file
+        """
+        self.data = loadNormativeData(self.m_filename,"Nantes",self.__parse)
+
 
 
 
@@ -111,12 +210,11 @@ class Pinzone2014(object):
             self.data[JointLabel]["sd"] = np.array([data_X,data_Y,data_Z]).T
 
 
-    def constructNormativeData(self):
-
-        """
-            **Description :**  Read initial xls file and construct the member dictionnary (data)
+    def __parse(self):
+        """ Read initial xls file and construct the member dictionnary (data)
         """
-
+        import pandas as pd
+        self.data = dict()
         angles =pd.read_excel(self.m_filename,sheetname = "Angles")
         moments =pd.read_excel(self.m_filename,sheetname = "Moments")
         powers =pd.read_excel(self.m_filename,sheetname = "Powers")
@@ -135,6 +233,15 @@ class Pinzone2014(object):
         self.__setDict(powers,"Knee.Power",[None, None,"Knee Power"], "Powers")
         self.__setDict(powers,"Ankle.Power",[None, None,"Ankle Power"], "Powers")
 
+        return self.data
+
+    def constructNormativeData(self):
+
+        """
+            **Description :**  construct the member dictionnary (data) from the cached xls file
+        """
+        self.data = loadNormativeData(self.m_filename,self.m_centre,self.__parse)
+
 
 class Schwartz2008(object):
 
@@ -229,11 +336,11 @@ class Schwartz2008(object):
             self.data[JointLabel]["sd"] = np.array([data_X,data_Y,data_Z]).T
 
 
-    def constructNormativeData(self):
-        """
-            **Description :**  Read initial xls file and construct the member dictionnary (data)
+    def __parse(self):
+        """ Read initial xls file and construct the member dictionnary (data)
         """
-
+        import pandas as pd
+        self.data = dict()
         angles =pd.read_excel(self.m_filename,sheetname = "Joint Rotations")
         moments =pd.read_excel(self.m_filename,sheetname = "Joint Moments")
         powers =pd.read_excel(self.m_filename,sheetname = "Joint Power")
@@ -252,3 +359,11 @@ class Schwartz2008(object):
         self.__setDict(powers,"Hip.Power",[ None, None,"Hip" ], "Powers")
         self.__setDict(powers,"Knee.Power",[None, None,"Knee"], "Powers")
         self.__setDict(powers,"Ankle.Power",[None, None,"Ankle"], "Powers")
+
+        return self.data
+
+    def constructNormativeData(self):
+        """
+            **Description :**  construct the member dictionnary (data) from the cached xls file
+        """
+        self.data = loadNormativeData(self.m_filename,self.m_speedModality,self.__parse)
@@ -76,3 +76,130 @@ class PlottingFilter(object):
 
     def setTitle(self,title):
         self.m_title=title
+
+
+def _renderAnalyses(viewerSettings,jobs):
+    """ render a chunk of (analysis, pdf filename) jobs off-screen. each viewer layout is built once and reused for all analyses
+
+    :Parameters:
+        - `viewerSettings` (list) - list of (viewer class, viewer keyword arguments, concrete plot function, normative dataset)
+        - `jobs` (list) - list of ( analysis instance, pdf filename)
+
+    .. note:: rendering runs with the Agg backend. The backend of the caller is restored afterwards
+
+    """
+    backend = plt.get_backend()
+    if backend.lower() == "agg":
+        return _renderPdfs(viewerSettings,jobs)
+
+    plt.switch_backend("Agg")
+    try:
+        return _renderPdfs(viewerSettings,jobs)
+    finally:
+        plt.switch_backend(backend)
+
+def _renderPdfs(viewerSettings,jobs):
+    viewers = list()
+    for viewerClass,kwargs,concretePlotFunction,normativeDataset in viewerSettings:
+        viewer = viewerClass(jobs[0][0],**kwargs)
+        if concretePlotFunction is not None:
+            viewer.setConcretePlotFunction(concretePlotFunction)
+        if normativeDataset is not None:
+            viewer.setNormativeDataset(normativeDataset)
+        viewers.append(viewer)
+
+    filenames = list()
+    for analysisInstance,filename in jobs:
+        pp = PdfPages(str(filename))
+        for viewer in viewers:
+            viewer.setInput(analysisInstance)
+            fig = viewer.plotPanel()
+            pp.savefig(fig)
+        pp.close()
+        filenames.append(filename)
+
+    for viewer in viewers:
+        if viewer.fig is not None:
+            plt.close(viewer.fig)
+
+    return filenames
+
+def _renderAnalysesStar(args):
+    return _renderAnalyses(*args)
+
+
+class BatchPlottingFilter(object):
+    """
+        **Description :** headless renderer of a collection of analyses.
+
+        Each analysis produces a multi-page pdf ( one page per viewer). Panel layouts are built once per process
+        and re-used for the successive analyses. Analyses can be distributed over a process pool.
+
+        **usage**
+
+        .. code:: python
+
+            bpf = plotFilters.BatchPlottingFilter()
+            bpf.addViewer(plotViewers.NormalizedKinematicsPlotViewer,
+                          concretePlotFunction = plot.gaitDescriptivePlot,
+                          normativeDataset = normativeDatasets.Schwartz2008("Free"))
+            bpf.addViewer(plotViewers.NormalizedKineticsPlotViewer,
+                          concretePlotFunction = plot.gaitDescriptivePlot)
+            bpf.render(analyses, ["patient1.pdf","patient2.pdf"], nProcesses=4)
+
+    """
+
+    def __init__(self):
+        self.m_viewerSettings = list()
+
+    def addViewer(self,viewerClass, concretePlotFunction=None, normativeDataset=None, **kwargs):
+        '''
+            **Description :** add a page to the report
+
+            :Parameters:
+             - `viewerClass` (class) - concrete viewer class of the pyCGM2.Report.plotViewers module
+             - `concretePlotFunction` (function) - plot function of the pyCGM2.Report.plot module
+             - `normativeDataset` (a class of the pyCGM2.Report.normativeDataset module) - normative gait dataset
+             - `kwargs` - keyword arguments of the viewer constructor ( ex : pointLabelSuffix, bodyPart)
+
+        '''
+        self.m_viewerSettings.append((viewerClass,kwargs,concretePlotFunction,normativeDataset))
+
+    def render(self,analyses,filenames,nProcesses=1):
+        '''
+            **Description :** render all analyses
+
+            :Parameters:
+             - `analyses` (list of pyCGM2.Processing.analysis.Analysis) - analysis instances
+             - `filenames` (list of str) - full filename of the pdf of each analysis
+             - `nProcesses` (int) - number of worker processes
+
+            :Return:
+             - `filenames` (list of str) - rendered pdf
+
+        '''
+        if len(analyses) != len(filenames):
+            raise Exception("[pyCGM2] number of analyses and pdf filenames differs")
+
+        if self.m_viewerSettings == [] or analyses == []:
+            return list()
+
+        jobs = zip(analyses,filenames)
+
+        if nProcesses ==1:
+            return _renderAnalyses(self.m_viewerSettings,jobs)
+
+        import multiprocessing
+
+        # one chunk per process. layouts are built once per chunk
+        nProcesses = min(nProcesses,len(jobs))
+        chunks = [jobs[i::nProcesses] for i in range(0,nProcesses)]
+
+        pool = multiprocessing.Pool(processes = nProcesses)
+        try:
+            pool.map(_renderAnalysesStar,[(self.m_viewerSettings,chunk) for chunk in chunks])
+        finally:
+            pool.close()
+            pool.join()
+
+        return list(filenames)
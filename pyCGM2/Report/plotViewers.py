@@ -18,6 +18,28 @@ class AbstractPlotViewer(object):
     """
     def __init__(self,input):
         self.m_input =input
+        self.fig = None
+
+    def setInput(self,input):
+        """
+            **Description :** swap the input ( analysis or trial) of the viewer.
+            The panel layout built by a previous call of plotPanel is re-used by the next call.
+
+        """
+        self.m_input = input
+        if hasattr(self,"m_analysis"): self.m_analysis = input
+        if hasattr(self,"m_trial"): self.m_trial = input
+
+    def _clearData(self):
+        """ remove the data artists of the panel. titles, labels and axis limits are kept
+        """
+        for ax in self.fig.axes:
+            for artist in list(ax.lines)+list(ax.collections)+list(ax.patches)+list(ax.texts):
+                artist.remove()
+            if ax.legend_ is not None:
+                ax.legend_.remove()
+            ax.containers = []
+            ax.relim()
 
     def setNormativeData(self):
         pass
@@ -124,7 +146,10 @@ class SpatioTemporalPlotViewer(AbstractPlotViewer):
 
 
     def plotPanel(self):
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         if self.m_normativeData is not None:
@@ -138,6 +163,8 @@ class SpatioTemporalPlotViewer(AbstractPlotViewer):
                 self.fig.axes[i].axvline(x=(plusStd), color= "green", linestyle = "dashed")
                 i+=1
 
+        return self.fig
+
 
 
 class GpsMapPlotViewer(AbstractPlotViewer):
@@ -236,9 +263,14 @@ class GpsMapPlotViewer(AbstractPlotViewer):
 
 
     def plotPanel(self):
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
+        return self.fig
+
 class NormalizedKinematicsPlotViewer(AbstractPlotViewer):
     """
 
@@ -539,7 +571,10 @@ class NormalizedKinematicsPlotViewer(AbstractPlotViewer):
         if self.m_concretePlotFunction is None:
             raise Exception ("[pyCGM2] need definition of the concrete plot function")
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         if self.m_normativeData is not None:
@@ -843,7 +878,10 @@ class TemporalKinematicsPlotViewer(AbstractPlotViewer):
 
     def plotPanel(self):
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         # normative dataset not implemented
@@ -1048,7 +1086,10 @@ class NormalizedKineticsPlotViewer(AbstractPlotViewer):
         if self.m_concretePlotFunction is None:
             raise Exception ("[pyCGM2] need definition of the concrete plot function")
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         if self.m_normativeData is not None:
@@ -1280,7 +1321,10 @@ class TemporalKineticsPlotViewer(AbstractPlotViewer):
 
     def plotPanel(self):
 
-        self.__setLayer()
+        if self.fig is None:
+            self.__setLayer()
+        else:
+            self._clearData()
         self.__setData()
 
         # normative dataset not implemented
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Low dimensional Kalman smoother filling gaps of marker trajectories
+
+Python implementation of the gap filling algorithm of Gloersen and Federolf
+(http://dx.doi.org/10.1016/j.jbiomech.2016.04.016). Trajectories are smoothed
+in the low dimensional subspace given by the principal components of the
+complete frames.
+
+Marker trajectories are handled as a (n,3*m) array, i.e. the XYZ columns of the
+m markers side by side, with *nan* where a marker is not visible.
+"""
+import numpy as np
+import logging
+from scipy import linalg
+
+from pyCGM2.Tools import btkTools
+
+
+def getSubspace(rawdata,tol=0.0025):
+    """
+        Low dimensional subspace of marker trajectories
+
+        :Parameters:
+            - `rawdata` (numpy.array(n,3*m)) - marker trajectories, *nan* in gaps
+            - `tol` (double) - part of the variance discarded by the subspace
+
+        :Return:
+            - `mean` (numpy.array(3*m,)) - mean of the complete frames
+            - `basis` (numpy.array(d,3*m)) - principal components
+            - `Q` (numpy.array(d,d)) - process noise covariance
+    """
+    X = rawdata[~np.isnan(rawdata).any(axis=1)]
+    if X.shape[0] < 2:
+        raise Exception("[pyCGM2] gap filling impossible : less than 2 frames with all markers visible")
+
+    mean = np.mean(X,axis=0)
+    U, S, V = np.linalg.svd(X - mean, full_matrices=False)
+
+    # number of components explaining 1-tol of the singular values
+    d = np.nonzero(np.cumsum(S)/np.sum(S)>(1-tol))[0][0]+1
+    basis = V[0:d,:]
+
+    Q = np.dot(basis*np.std(np.diff(X,axis=0),axis=0),basis.T)
+
+    return mean, basis, Q
+
+
+def _kalmanSmoother(rawdata,mean,basis,Q,sigR,seed):
+    n = rawdata.shape[0]
+    d = basis.shape[0]
+    observed = ~np.isnan(rawdata)
+
+    # state i+1 is the state of frame i, state 0 the initial one
+    state = np.zeros((n+1,d))
+    state_pred = np.zeros((n+1,d))
+    cov = np.zeros((n+1,d,d))
+    cov_pred = np.zeros((n+1,d,d))
+
+    state[0] = np.random.RandomState(seed).normal(0.0,1.0,d)
+    cov[0] = 1e12*np.eye(d)
+
+    # forward pass
+    for i in range(1,n+1):
+        obs = observed[i-1]
+        state_pred[i] = state[i-1]
+        cov_pred[i] = cov[i-1] + Q
+
+        if not obs.any():
+            state[i] = state_pred[i]
+            cov[i] = cov_pred[i]
+            continue
+
+        Ht = basis.T[obs]
+        PHt = np.dot(cov_pred[i],Ht.T)
+        S = np.dot(Ht,PHt)
+        S[np.diag_indices_from(S)] += sigR
+
+        # K = P Ht' S^-1, S symmetric positive definite
+        K = linalg.cho_solve(linalg.cho_factor(S,lower=True,check_finite=False),PHt.T,check_finite=False).T
+
+        innovation = rawdata[i-1,obs] - (np.dot(Ht,state_pred[i]) + mean[obs])
+        state[i] = state_pred[i] + np.dot(K,innovation)
+        cov[i] = cov_pred[i] - np.dot(K,PHt.T)
+
+    # backward pass (Rauch-Tung-Striebel)
+    for i in range(n-1,0,-1):
+        gain = np.linalg.solve(cov_pred[i+1],state[i+1] - state_pred[i+1])
+        state[i] = state[i] + np.dot(cov[i],gain)
+
+    return np.dot(state[1:],basis) + mean
+
+
+def getGapRuns(rawdata):
+    """
+        Frame runs with at least one missing coordinate
+
+        :Parameters:
+            - `rawdata` (numpy.array(n,3*m)) - marker trajectories, *nan* in gaps
+
+        :Return:
+            - `runs` (numpy.array(k,2)) - first and last+1 frame indexes of each run
+    """
+    missing = np.isnan(rawdata).any(axis=1).astype(int)
+    switches = np.diff(np.concatenate(([0],missing,[0])))
+    return np.array([np.where(switches==1)[0],np.where(switches==-1)[0]]).T
+
+
+def smooth(rawdata,tol=0.0025,sigR=1e-3,keepOriginal=True,seed=0,window=None):
+    """
+        Fill gaps of marker trajectories with a low dimensional Kalman smoother
+
+        :Parameters:
+            - `rawdata` (numpy.array(n,3*m)) - marker trajectories, *nan* in gaps
+            - `tol` (double) - part of the variance discarded by the subspace
+            - `sigR` (double) - measurement noise
+            - `keepOriginal` (bool) - keep the measured values
+            - `seed` (int) - seed of the random initial state
+            - `window` (int) - if given, only smooth the gaps and `window` frames around. Other frames are kept.
+
+        :Return:
+            - `y` (numpy.array(n,3*m)) - filled trajectories
+
+        .. note:: with a `window`, the subspace is computed once from all complete frames of the trial
+    """
+    rawdata = np.asarray(rawdata,dtype=float)
+    mean, basis, Q = getSubspace(rawdata,tol=tol)
+    logging.debug("[pyCGM2] gap filling - subspace dimension : %i" %(basis.shape[0]))
+
+    if window is None:
+        y = _kalmanSmoother(rawdata,mean,basis,Q,sigR,seed)
+    else:
+        y = np.copy(rawdata)
+        n = rawdata.shape[0]
+        runs = getGapRuns(rawdata)
+        if runs.shape[0] != 0:
+            # merge overlapping windows
+            starts = np.maximum(runs[:,0]-window,0)
+            ends = np.minimum(runs[:,1]+window,n)
+            newSegment = np.concatenate(([True],starts[1:] > ends[:-1]))
+            segmentStarts = starts[newSegment]
+            segmentEnds = np.maximum.reduceat(ends,np.where(newSegment)[0])
+            for start,end in zip(segmentStarts,segmentEnds):
+                y[start:end] = _kalmanSmoother(rawdata[start:end],mean,basis,Q,sigR,seed)
+
+    if keepOriginal:
+        observed = ~np.isnan(rawdata)
+        y[observed] = rawdata[observed]
+
+    return y
+
+
+def getMarkerArray(acq,markerLabels):
+    """
+        Marker trajectories of an acquisition as a (n,3*m) array, *nan* where residuals are negative
+
+        :Parameters:
+            - `acq` (btkAcquisition) - a btk acquisition inctance
+            - `markerLabels` (list) - marker labels
+    """
+    rawdata = np.zeros((acq.GetPointFrameNumber(),3*len(markerLabels)))
+    for i,label in enumerate(markerLabels):
+        point = acq.GetPoint(label)
+        values = np.array(point.GetValues(),dtype=float)
+        values[point.GetResiduals().reshape(-1)<0] = np.nan
+        rawdata[:,3*i:3*i+3] = values
+    return rawdata
+
+
+def fillAcquisitionGaps(acq,markerLabels,tol=0.0025,sigR=1e-3,window=None):
+    """
+        Fill marker gaps of an acquisition with the low dimensional Kalman smoother.
+
+        Filled frames get a null residual. Markers never visible are ignored.
+
+        :Parameters:
+            - `acq` (btkAcquisition) - a btk acquisition inctance
+            - `markerLabels` (list) - marker labels
+            - `tol` (double) - part of the variance discarded by the subspace
+            - `sigR` (double) - measurement noise
+            - `window` (int) - if given, only smooth the gaps and `window` frames around
+
+        :Return:
+            - `filledLabels` (list) - labels of the markers with filled gaps
+    """
+    markerLabels = [label for label in markerLabels if btkTools.isPointExist(acq,label)]
+    rawdata = getMarkerArray(acq,markerLabels)
+
+    visible = ~np.isnan(rawdata[:,0::3])
+    markerLabels = [label for i,label in enumerate(markerLabels) if visible[:,i].any()]
+    columns = np.repeat(visible.any(axis=0),3)
+    rawdata = rawdata[:,columns]
+    visible = visible[:,visible.any(axis=0)]
+
+    if visible.all():
+        return list()
+
+    y = smooth(rawdata,tol=tol,sigR=sigR,keepOriginal=True,window=window)
+
+    filledLabels = list()
+    for i,label in enumerate(markerLabels):
+        if visible[:,i].all():
+            continue
+        point = acq.GetPoint(label)
+        residuals = np.array(point.GetResiduals(),dtype=float)
+        residuals[~visible[:,i]] = 0.0
+        point.SetValues(y[:,3*i:3*i+3])
+        point.SetResiduals(residuals)
+        filledLabels.append(label)
+
+    logging.debug("[pyCGM2] gap filling - filled markers : %s" %(",".join(filledLabels)))
+    return filledLabels
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 from scipy import signal, integrate
-import matplotlib.pyplot as plt
 from pyCGM2 import btk
 
 
@@ -100,6 +99,34 @@ def arrayLowPassFiltering(valuesArray, freq, order=2, fc =6):
 
     return out
 
+def arrayDecimation(valuesArray, factor, order=4, numberOfSamples=None):
+    """
+        anti-aliased decimation of an numpy array ( ex : analog to point rate)
+
+        .. note:: a zero-phase low-pass filter with a cut-off at 80% of the Nyquist frequency of the decimated signal is applied before sampling
+
+        :Parameters:
+            - `valuesArray` (numpy.array(n,m)) - array
+            - `factor` (int) - decimation factor ( ex: number of analog samples per frame)
+            - `order` (int) - order of the low-pass filter
+            - `numberOfSamples` (int) - number of samples of the decimated array ( default : all)
+    """
+    factor = int(factor)
+    if numberOfSamples is None:
+        numberOfSamples = int(np.ceil(valuesArray.shape[0]/float(factor)))
+
+    if factor == 1:
+        return np.array(valuesArray[0:numberOfSamples],dtype=float)
+
+    b, a = signal.butter(order, 0.8/factor , btype='lowpass')
+
+    if valuesArray.shape[0] <= 3*max(len(a),len(b)):
+        filtered = valuesArray
+    else:
+        filtered = signal.filtfilt(b, a, valuesArray,axis=0)
+
+    return np.array(filtered[0:numberOfSamples*factor:factor],dtype=float)
+
 def psd(x, fs=1.0, window='hanning', nperseg=None, noverlap=None, nfft=None,
         detrend='constant', show=True, ax=None, scales='linear', xlim=None,
         units='V'):
@@ -44,6 +44,7 @@ def isPointExist(acq,label):
             - `label` (str) - point label
     """
     #TODO : replace by btkIterate
+    flagPoint = False
     i = acq.GetPoints().Begin()
     while i != acq.GetPoints().End():
         if i.value().GetLabel()==label:
@@ -51,7 +52,6 @@ def isPointExist(acq,label):
             break
         else:
             i.incr()
-            flagPoint= False
 
     if flagPoint:
         return True
@@ -162,24 +162,34 @@ def isGap(acq, markerList):
          if any(residualValues== -1.0):
              raise Exception("[pyCGM2] gap founded for markers %s " % m )
 
+def getValidFrameMask(acq,markerLabels):
+    """
+        frames where all markers are reconstructed ( residual >= 0)
+
+        :Parameters:
+            - `acq` (btkAcquisition) - btk acquisition instance
+            - `markerLabels` (list) - marker labels
+
+        :Return:
+            - `mask` (numpy.array(n,) of bool) - valid frames
+    """
+    mask = np.ones(acq.GetPointFrameNumber(),dtype=bool)
+    for marker in markerLabels:
+        mask &= acq.GetPoint(marker).GetResiduals().reshape(-1) >= 0
+
+    return mask
+
 def findValidFrames(acq,markerLabels):
 
-    flag = list()
-    for i in range(0,acq.GetPointFrameNumber()):
-        pointFlag=list()
-        for marker in markerLabels:
-            if acq.GetPoint(marker).GetResidual(i) >= 0 :
-                pointFlag.append(1)
-            else:
-                pointFlag.append(0)
+    mask = getValidFrameMask(acq,markerLabels)
 
-        if all(pointFlag)==1:
-            flag.append(1)
-        else:
-            flag.append(0)
+    indexes = np.flatnonzero(mask)
+    if indexes.size == 0:
+        raise ValueError("[pyCGM2] no valid frame for markers %s" %(str(markerLabels)))
 
-    firstValidFrame = flag.index(1)
-    lastValidFrame = len(flag) - flag[::-1].index(1) - 1
+    flag = mask.astype(int).tolist()
+    firstValidFrame = int(indexes[0])
+    lastValidFrame = int(indexes[-1])
 
     return flag,firstValidFrame,lastValidFrame
 
@@ -270,10 +280,28 @@ def findProgression(acq,marker):
     if not isPointExist(acq,marker):
         raise Exception( "[pyCGM2] : marker doesn't exist")
 
-    # find valid frames and get the first one
-    flag,vff,vlf = findValidFrames(acq,[marker])
+    return findProgressionFromValues(acq.GetPoint(marker).GetValues(),
+                                     getValidFrameMask(acq,[marker]))
+
+def findProgressionFromValues(values,validFrames):
+    """
+        progression axis and direction from the trajectory of a marker
+
+        :Parameters:
+            - `values` (numpy.array(n,3)) - marker trajectory
+            - `validFrames` (numpy.array(n,) of bool) - frames where the marker is reconstructed
 
-    values = acq.GetPoint(marker).GetValues()[vff:vlf,:]
+        :Return:
+            - `progressionAxis` (str) - X or Y
+            - `forwardProgression` (bool) - progression along the positive direction of the axis
+            - `globalFrame` (str) - global frame ( ex : XYZ)
+    """
+    indexes = np.flatnonzero(validFrames)
+    if indexes.size == 0:
+        raise ValueError("[pyCGM2] no valid frame for progression")
+    vff,vlf = indexes[0],indexes[-1]
+
+    values = values[vff:vlf,:]
 
     MaxValues =[values[-1,0]-values[0,0], values[-1,1]-values[0,1]]
     absMaxValues =[np.abs(values[-1,0]-values[0,0]), np.abs(values[-1,1]-values[0,1])]
@@ -437,6 +465,26 @@ def checkMarkers( acq, markerList):
 
 # --- events -----
 
+def appendEvents(acq,labels,contexts,frames,ids,description=""):
+    """
+        append events in one resize of the event collection
+
+        :Parameters:
+            - `acq` (btkAcquisition) - btk acquisition instance
+            - `labels` (list) - event labels
+            - `contexts` (list) - event contexts
+            - `frames` (numpy.array(m,)) - event frames
+            - `ids` (list) - event ids
+            - `description` (str) - description of the events
+    """
+    pf = acq.GetPointFrequency()
+    times = (np.asarray(frames,dtype=float)-1)/pf
+
+    n0 = acq.GetEventNumber()
+    acq.SetEventNumber(n0+len(labels))
+    for i in range(0,len(labels)):
+        acq.SetEvent(n0+i,btk.btkEvent(labels[i], times[i], contexts[i], btk.btkEvent.Manual, '', description, int(ids[i])))
+
 
 def clearEvents(acq,labels):
 
@@ -618,6 +666,21 @@ def getNumberOfForcePlate(btkAcq):
     return pfc.GetItemNumber()
 
 
+def getEventFrames(btkAcq,label,context):
+    """
+        sorted frames of the events of a given label and context
+
+        :Parameters:
+            - `btkAcq` (btkAcquisition) - btk acquisition instance
+            - `label` (str) - event label ( ex : Foot Strike)
+            - `context` (str) - event context ( ex : Left)
+
+        :Return:
+            - `frames` (numpy.array(n,) of int) - event frames
+    """
+    frames = [ev.GetFrame() for ev in btk.Iterate(btkAcq.GetEvents()) if ev.GetLabel()==label and ev.GetContext()==context]
+    return np.sort(np.array(frames,dtype=int))
+
 def getStartEndEvents(btkAcq,context,startLabel="start", endLabel="end"):
     events= btkAcq.GetEvents()
 